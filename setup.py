@@ -10,6 +10,7 @@ import fnmatch
 import os
 from setuptools import setup, find_packages, Extension
 from setuptools.command.test import test as TestCommand
+from setuptools.command.build_ext import build_ext
 import numpy
 from Cython.Build import cythonize
 from src.biotite import __version__
@@ -66,6 +67,32 @@ def get_extensions():
     return ext_modules
 
 
+# Extensions that are parallelized via OpenMP ('cython.parallel')
+# If the compiler does not support OpenMP,
+# these extensions are compiled without parallelization
+OPENMP_EXTENSIONS = ["biotite.structure.sasa"]
+
+
+class BuildExtCommand(build_ext):
+    def build_extensions(self):
+        compiler_type = self.compiler.compiler_type
+        if compiler_type == "msvc":
+            compile_args = ["/openmp"]
+            link_args = []
+        elif compiler_type == "unix" and sys.platform != "darwin":
+            compile_args = ["-fopenmp"]
+            link_args = ["-fopenmp"]
+        else:
+            # The default Clang on MacOS does not support OpenMP
+            compile_args = []
+            link_args = []
+        for ext in self.extensions:
+            if ext.name in OPENMP_EXTENSIONS:
+                ext.extra_compile_args += compile_args
+                ext.extra_link_args += link_args
+        super().build_extensions()
+
+
 class PyTestCommand(TestCommand):
     user_options = [('pytest-args=', 'a', "Arguments to pass to pytest")]
 
@@ -127,7 +154,7 @@ setup(
                         "msgpack >= 0.5.6"],
     python_requires = ">=3.6",
     
-    cmdclass = {"test": PyTestCommand},
+    cmdclass = {"test": PyTestCommand, "build_ext": BuildExtCommand},
     tests_require = ["pytest"],
     
     command_options = {
@@ -53,6 +53,9 @@ categories can be added via :func:`add_annotation()` or
 :func:`set_annotation()`.
 The annotation arrays can be accessed either via the method
 :func:`get_annotation()` or directly (e.g. ``array.res_id``).
+String annotations with only few distinct values, like ``res_name`` or
+``chain_id``, can be stored memory-efficiently as
+:class:`CategoricalArray`, by setting them via :func:`set_annotation()`.
 
 The following annotation categories are optionally used by some
 functions:
@@ -100,6 +103,7 @@ __author__ = "Patrick Kunzmann"
 from .atoms import *
 from .bonds import *
 from .box import *
+from .categorical import *
 from .celllist import *
 from .compare import *
 from .density import *
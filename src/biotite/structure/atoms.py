@@ -16,6 +16,7 @@ import numbers
 import abc
 import numpy as np
 from .bonds import BondList
+from .categorical import CategoricalArray
 from ..copyable import Copyable
 
 
@@ -73,7 +74,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         """
         return 
         
-    def add_annotation(self, category, dtype):
+    def add_annotation(self, category, dtype, categorical=False):
         """
         Add an annotation category, if not already existing.
         
@@ -87,14 +88,20 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         dtype : type or str
             A type instance or a valid *NumPy* *dtype* string.
             Defines the type of the annotation
+        categorical : bool, optional
+            If true, the annotation is stored as
+            :class:`CategoricalArray`.
+            This requires a string *dtype*.
         
         See Also
         --------
         set_annotation
         """
         if category not in self._annot:
-            self._annot[str(category)] = np.zeros(self._array_length,
-                                                  dtype=dtype)
+            annot = np.zeros(self._array_length, dtype=dtype)
+            if categorical:
+                annot = CategoricalArray(annot)
+            self._annot[str(category)] = annot
             
     def del_annotation(self, category):
         """
@@ -137,16 +144,21 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         ----------
         category : str
             The annotation category to be set.
-        array : ndarray or None
+        array : ndarray or CategoricalArray or None
             The new value of the annotation category. The size of the
             array must be the same as the array length.
+            A :class:`CategoricalArray` is stored as is, i.e. the
+            annotation retains its categorical representation.
         """
         if len(array) != self._array_length:
             raise IndexError(
                 f"Expected array length {self._array_length}, "
                 f"but got {len(array)}"
             )
-        self._annot[category] = np.asarray(array)
+        if isinstance(array, CategoricalArray):
+            self._annot[category] = array
+        else:
+            self._annot[category] = np.asarray(array)
         
     def get_annotation_categories(self):
         """
@@ -253,6 +265,12 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         from the dictionary.
         Exposes coordinates.
         """
+        if attr == "_annot":
+            # The annotations are not initialized yet,
+            # e.g. during unpickling
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
         if attr == "coord":
             return self._coord
         if attr == "bonds":
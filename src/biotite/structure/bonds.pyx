@@ -102,6 +102,14 @@ class BondList(Copyable):
     sanitized: Redundant bonds are removed, and each bond entry is
     sorted so that the lower one of the two atom indices is in the first
     column.
+
+    For fast lookup of the bonds of an atom, a :class:`BondList`
+    lazily creates an adjacency index in *compressed sparse row* (CSR)
+    format, the first time it is required.
+    The index is discarded as soon as the :class:`BondList` is modified.
+    Hence, repeated calls of :func:`get_bonds()` only take
+    *O(bonds per atom)* time, as long as no bonds are added or removed
+    in between.
     
     Examples
     --------
@@ -128,6 +136,9 @@ class BondList(Copyable):
 
     def __init__(self, uint32 atom_count, np.ndarray bonds=None):
         self._atom_count = atom_count
+        # The CSR adjacency index is created lazily in
+        # '_get_adjacency()'
+        self._adjacency = None
         
         if bonds is not None and len(bonds) > 0:
             if (bonds[:,:2] >= atom_count).any():
@@ -210,6 +221,7 @@ class BondList(Copyable):
         self._bonds[:,0] += offset
         self._bonds[:,1] += offset
         self._atom_count += offset
+        self._adjacency = None
     
     def as_array(self):
         """
@@ -309,35 +321,64 @@ class BondList(Copyable):
         >>> print(bonds)
         [0 3 4]
         """
-        cdef int i=0, j=0
-
         cdef uint32 index = _to_positive_index(atom_index, self._atom_count)
+        if index >= self._atom_count:
+            raise IndexError(
+                f"Index {atom_index} is out of range "
+                f"for atom count of {self._atom_count}"
+            )
 
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        # Pessimistic array allocation:
-        # assume size is equal to the atom with most bonds
-        cdef np.ndarray bonds = np.zeros(self._max_bonds_per_atom,
-                                         dtype=np.uint32)
-        cdef uint32[:] bonds_v = bonds
-        cdef np.ndarray bond_types = np.zeros(self._max_bonds_per_atom,
-                                              dtype=np.uint8)
-        cdef uint8[:] bond_types_v = bond_types
-        for i in range(all_bonds_v.shape[0]):
-            # If a bond is found for the desired atom index
-            # at the first or second position of the bond,
-            # then append the index of the respective other position
-            if all_bonds_v[i,0] == index:
-                bonds_v[j] = all_bonds_v[i,1]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-            elif all_bonds_v[i,1] == index:
-                bonds_v[j] = all_bonds_v[i,0]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-        # Trim to correct size
-        bonds = bonds[:j]
-        bond_types = bond_types[:j]
-        return bonds, bond_types
+        offsets, bonds, bond_types = self._get_adjacency()
+        cdef int64 start = offsets[index]
+        cdef int64 stop = offsets[index+1]
+        # Copy the slices, so that the cached index cannot be modified
+        # by the caller
+        return bonds[start:stop].copy(), bond_types[start:stop].copy()
+    
+    def get_all_bonds(self):
+        """
+        get_all_bonds()
+
+        Obtain the bonds of all atoms at once in
+        *compressed sparse row* (CSR) format.
+
+        The indices of the atoms bonded to the atom ``i`` are
+        ``bonds[offsets[i] : offsets[i+1]]``, the corresponding bond
+        types are ``bond_types[offsets[i] : offsets[i+1]]``.
+        Each bond appears twice in the returned arrays, once for each
+        of the two atoms involved.
+
+        Returns
+        -------
+        offsets : np.ndarray, shape=(m+1,), dtype=np.int64
+            The start index of the bonded atoms of each atom in `bonds`
+            and `bond_types`, where *m* is the atom count.
+            The last element is the total length of `bonds`.
+        bonds : np.ndarray, shape=(2n,), dtype=np.uint32
+            The indices of bonded atoms, grouped by the atom they are
+            bonded to.
+        bond_types : np.ndarray, shape=(2n,), dtype=np.uint8
+            Array of integers, interpreted as :class:`BondType`
+            instances.
+        
+        See also
+        --------
+        get_bonds
+
+        Examples
+        --------
+
+        >>> bond_list = BondList(5, np.array([(1,0),(1,3),(1,4)]))
+        >>> offsets, bonds, types = bond_list.get_all_bonds()
+        >>> print(offsets)
+        [0 1 4 4 5 6]
+        >>> print(bonds)
+        [1 0 3 4 1 1]
+        >>> print(bonds[offsets[1] : offsets[2]])
+        [0 3 4]
+        """
+        offsets, bonds, bond_types = self._get_adjacency()
+        return offsets.copy(), bonds.copy(), bond_types.copy()
     
     def add_bond(self, int32 atom_index1, int32 atom_index2,
                  bond_type=BondType.ANY):
@@ -363,6 +404,7 @@ class BondList(Copyable):
                 f"for atom count of {self._atom_count}"
             )
         _sort(&index1, &index2)
+        self._adjacency = None
         
         cdef int i
         cdef uint32[:,:] all_bonds_v = self._bonds
@@ -411,6 +453,7 @@ class BondList(Copyable):
             # the reverse check is omitted
             if (all_bonds_v[i,0] == index1 and all_bonds_v[i,1] == index2):
                 self._bonds = np.delete(self._bonds, i, axis=0)
+                self._adjacency = None
         # The maximum bonds per atom is not recalculated,
         # as the value can only be decreased on bond removal
         # Since this value is only used for pessimistic array allocation
@@ -449,6 +492,7 @@ class BondList(Copyable):
         
         # Remove the bonds
         self._bonds = self._bonds[mask.astype(np.bool, copy=False)]
+        self._adjacency = None
         # The maximum bonds per atom is not recalculated
         # (see 'remove_bond()')
 
@@ -516,6 +560,9 @@ class BondList(Copyable):
         return merged_bond_list
 
     def __getitem__(self, index):
+        if isinstance(index, numbers.Integral):
+            return self.get_bonds(index)
+        
         copy = self.copy()
         cdef uint32[:,:] all_bonds_v = copy._bonds
         # Boolean mask representation of the index
@@ -530,44 +577,40 @@ class BondList(Copyable):
         cdef uint32* index1_ptr
         cdef uint32* index2_ptr
         
-        if isinstance(index, numbers.Integral):
-            return copy.get_bonds(index)
-        
-        else:
-            mask = _to_bool_mask(index, length=copy._atom_count)
-            # Each time an atom is missing in the mask,
-            # the offset is increased by one
-            offsets = np.cumsum(~mask.astype(bool, copy=False),
-                                dtype=np.uint32)
-            removal_filter = np.ones(all_bonds_v.shape[0], dtype=np.uint8)
-            mask_v = mask
-            offsets_v = offsets
-            removal_filter_v = removal_filter
-            # If an atom in a bond is not masked,
-            # the bond is removed from the list
-            # If an atom is masked,
-            # its index value is decreased by the respective offset
-            # The offset is neccessary, removing atoms in an AtomArray
-            # decreases the index of the following atoms
-            for i in range(all_bonds_v.shape[0]):
-                # Usage of pointer to increase performance
-                # as redundant indexing is avoided
-                index1_ptr = &all_bonds_v[i,0]
-                index2_ptr = &all_bonds_v[i,1]
-                if mask_v[index1_ptr[0]] and mask_v[index2_ptr[0]]:
-                    # Both atoms invloved in bond are masked
-                    # -> decrease atom index by offset
-                    index1_ptr[0] -= offsets_v[index1_ptr[0]]
-                    index2_ptr[0] -= offsets_v[index2_ptr[0]]
-                else:
-                    # At least one atom invloved in bond is not masked
-                    # -> remove bond
-                    removal_filter_v[i] = False
-            # Apply the bond removal filter
-            copy._bonds = copy._bonds[removal_filter.astype(bool, copy=False)]
-            copy._atom_count = len(np.nonzero(mask)[0])
-            copy._max_bonds_per_atom = copy._get_max_bonds_per_atom()
-            return copy
+        mask = _to_bool_mask(index, length=copy._atom_count)
+        # Each time an atom is missing in the mask,
+        # the offset is increased by one
+        offsets = np.cumsum(~mask.astype(bool, copy=False),
+                            dtype=np.uint32)
+        removal_filter = np.ones(all_bonds_v.shape[0], dtype=np.uint8)
+        mask_v = mask
+        offsets_v = offsets
+        removal_filter_v = removal_filter
+        # If an atom in a bond is not masked,
+        # the bond is removed from the list
+        # If an atom is masked,
+        # its index value is decreased by the respective offset
+        # The offset is neccessary, removing atoms in an AtomArray
+        # decreases the index of the following atoms
+        for i in range(all_bonds_v.shape[0]):
+            # Usage of pointer to increase performance
+            # as redundant indexing is avoided
+            index1_ptr = &all_bonds_v[i,0]
+            index2_ptr = &all_bonds_v[i,1]
+            if mask_v[index1_ptr[0]] and mask_v[index2_ptr[0]]:
+                # Both atoms invloved in bond are masked
+                # -> decrease atom index by offset
+                index1_ptr[0] -= offsets_v[index1_ptr[0]]
+                index2_ptr[0] -= offsets_v[index2_ptr[0]]
+            else:
+                # At least one atom invloved in bond is not masked
+                # -> remove bond
+                removal_filter_v[i] = False
+        # Apply the bond removal filter
+        copy._bonds = copy._bonds[removal_filter.astype(bool, copy=False)]
+        copy._atom_count = len(np.nonzero(mask)[0])
+        copy._max_bonds_per_atom = copy._get_max_bonds_per_atom()
+        return copy
     
     def __iter__(self):
         raise TypeError("'BondList' object is not iterable")
@@ -585,22 +628,22 @@ class BondList(Copyable):
         if not isinstance(item, tuple) and len(tuple) != 2:
             raise TypeError("Expected a tuple of atom indices")
         
-        cdef int i=0
+        cdef int64 i=0
 
-        cdef uint32 match_index1, match_index2
-        # Sort indices for faster search in loop
         cdef uint32 atom_index1 = min(item)
         cdef uint32 atom_index2 = max(item)
+        if atom_index2 >= self._atom_count:
+            return False
 
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        for i in range(all_bonds_v.shape[0]):
-            match_index1 = all_bonds_v[i,0]
-            match_index2 = all_bonds_v[i,1]
-            if atom_index1 == match_index1 and atom_index2 == match_index2:
+        # Only the bonds of one atom need to be searched
+        offsets, bonds, _ = self._get_adjacency()
+        cdef int64[:] offsets_v = offsets
+        cdef uint32[:] bonds_v = bonds
+        for i in range(offsets_v[atom_index1], offsets_v[atom_index1+1]):
+            if bonds_v[i] == atom_index2:
                 return True
         
         return False
-        
 
     def _get_max_bonds_per_atom(self):
         cdef int i
@@ -615,6 +658,18 @@ class BondList(Copyable):
             index_count_v[all_bonds_v[i,1]] += 1
         return np.max(index_count_v)
     
+    def _get_adjacency(self):
+        """
+        Get the adjacency index in CSR format.
+
+        The index is created, if it was not created yet or if it was
+        invalidated by a modification of the bonds.
+        The returned arrays must not be modified.
+        """
+        if self._adjacency is None:
+            self._adjacency = _create_adjacency(self._bonds, self._atom_count)
+        return self._adjacency
+    
     def _remove_redundant_bonds(self):
         cdef int j
         cdef uint32[:,:] all_bonds_v = self._bonds
@@ -669,6 +724,39 @@ class BondList(Copyable):
         self._bonds = self._bonds[redundancy_filter.astype(np.bool,copy=False)]
 
 
+def _create_adjacency(np.ndarray bonds, uint32 atom_count):
+    """
+    Create the CSR representation of the bonds in a bond array.
+
+    The bonded atoms of each atom appear in the same order as the
+    respective bonds in the bond array.
+    """
+    cdef np.ndarray atom_indices, partner_indices, types, order, counts
+    # Each bond is entered for both atoms involved:
+    # Interleave the entries, so that a stable sort retains the order
+    # of bonds in the bond array
+    atom_indices = bonds[:, :2].ravel()
+    partner_indices = bonds[:, 1::-1].ravel()
+    types = np.repeat(bonds[:, 2], 2)
+    # A bond of an atom to itself is entered only once
+    if (bonds[:, 0] == bonds[:, 1]).any():
+        self_bond = np.repeat(bonds[:, 0] == bonds[:, 1], 2)
+        self_bond[::2] = False
+        atom_indices = atom_indices[~self_bond]
+        partner_indices = partner_indices[~self_bond]
+        types = types[~self_bond]
+    
+    order = np.argsort(atom_indices, kind="stable")
+    counts = np.bincount(atom_indices, minlength=atom_count)
+    offsets = np.zeros(atom_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return (
+        offsets,
+        partner_indices[order].astype(np.uint32, copy=False),
+        types[order].astype(np.uint8)
+    )
+
+
 cdef uint32 _to_positive_index(int32 index, uint32 array_length) except -1:
     """
     Convert a potentially negative index intop a positive index.
@@ -870,7 +958,7 @@ def connect_via_distances(atoms, dict distance_range=None):
     cdef np.ndarray coord_in_res
     cdef np.ndarray distances
     cdef float dist
-    cdef np.ndarray elements = atoms.element
+    cdef np.ndarray elements = np.asarray(atoms.element)
     cdef np.ndarray elements_in_res
     cdef int index_in_res1, index_in_res2
     cdef int atom_index1, atom_index2
@@ -982,9 +1070,9 @@ def connect_via_residue_names(atoms):
     cdef list bonds = []
     cdef int i
     cdef int curr_start_i, next_start_i
-    cdef np.ndarray atom_names = atoms.atom_name
+    cdef np.ndarray atom_names = np.asarray(atoms.atom_name)
     cdef np.ndarray atom_names_in_res
-    cdef np.ndarray res_names = atoms.res_name
+    cdef np.ndarray res_names = np.asarray(atoms.res_name)
     cdef str atom_name1, atom_name2
     cdef np.ndarray atom_indices1, atom_indices2
     cdef int atom_index1, atom_index2
@@ -1048,10 +1136,10 @@ def _connect_inter_residue(atoms, residue_starts):
     
     cdef list bonds = []
     cdef int i
-    cdef np.ndarray atom_names = atoms.atom_name
-    cdef np.ndarray res_names = atoms.res_name
-    cdef np.ndarray res_ids = atoms.res_id
-    cdef np.ndarray chain_ids = atoms.chain_id
+    cdef np.ndarray atom_names = np.asarray(atoms.atom_name)
+    cdef np.ndarray res_names = np.asarray(atoms.res_name)
+    cdef np.ndarray res_ids = np.asarray(atoms.res_id)
+    cdef np.ndarray chain_ids = np.asarray(atoms.chain_id)
     cdef int curr_start_i, next_start_i, after_next_start_i
     cdef str curr_connect_atom_name, next_connect_atom_name
     cdef np.ndarray curr_connect_indices, next_connect_indices
@@ -1169,32 +1257,45 @@ def find_connected(bond_list, uint32 root, bint as_mask=False):
             f"representing {bond_list.get_atom_count()} atoms"
         )
     
-    cdef uint8[:] all_connected_mask = np.zeros(
+    cdef np.ndarray all_connected_mask = np.zeros(
         bond_list.get_atom_count(), dtype=np.uint8
     )
-    # Find connections in a recursive way
-    _find_connected(bond_list, root, all_connected_mask)
+    offsets, bonds, _ = bond_list._get_adjacency()
+    _find_connected(offsets, bonds, root, all_connected_mask)
     if as_mask:
-        return all_connected_mask
+        return all_connected_mask.astype(bool, copy=False)
     else:
-        return np.where(np.asarray(all_connected_mask))[0]
+        return np.where(all_connected_mask)[0]
 
 
-cdef _find_connected(bond_list,
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef _find_connected(int64[:] offsets,
+                     uint32[:] bonds,
                      uint32 root,
                      uint8[:] all_connected_mask):
-    if all_connected_mask[root]:
-        # Connections for this atom habe already been calculated
-        # -> exit condition
-        return
+    # Depth-first search with an explicit stack instead of recursion,
+    # to handle also large molecules
+    # Each atom is put onto the stack at most once
+    # -> the stack cannot be larger than the number of atoms
+    cdef uint32[:] stack = np.zeros(
+        all_connected_mask.shape[0], dtype=np.uint32
+    )
+    cdef int64 stack_size = 0
+    cdef int64 i
+    cdef uint32 atom_index, bonded_index
+
     all_connected_mask[root] = True
-    
-    bonds, _ = bond_list.get_bonds(root)
-    cdef uint32[:] connected = bonds
-    cdef int32 i
-    cdef uint32 atom_index
-    for i in range(connected.shape[0]):
-        atom_index = connected[i]
-        _find_connected(bond_list, atom_index, all_connected_mask)
-
-    
\ No newline at end of file
+    stack[stack_size] = root
+    stack_size += 1
+    while stack_size > 0:
+        stack_size -= 1
+        atom_index = stack[stack_size]
+        for i in range(offsets[atom_index], offsets[atom_index+1]):
+            bonded_index = bonds[i]
+            if not all_connected_mask[bonded_index]:
+                # Connections for this atom have not been calculated
+                # yet
+                all_connected_mask[bonded_index] = True
+                stack[stack_size] = bonded_index
+                stack_size += 1
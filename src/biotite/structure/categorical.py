@@ -0,0 +1,398 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides a dictionary-encoded string array type, that can be
+used for annotation arrays with only few distinct values.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["CategoricalArray"]
+
+import numpy as np
+
+
+# Maps NumPy functions to their implementations for 'CategoricalArray'
+_HANDLED_FUNCTIONS = {}
+
+
+class CategoricalArray:
+    """
+    A one-dimensional array of strings, that is stored as integer codes
+    referring to a vocabulary of distinct strings.
+
+    This representation requires considerably less memory than a
+    fixed-width *NumPy* string array, if the array contains only few
+    distinct strings, as it is usually the case for e.g. residue names
+    or chain IDs.
+    Furthermore, comparisons with strings (``==``, ``!=``,
+    :func:`numpy.isin()`, :func:`numpy.in1d()`) are performed on the
+    integer codes.
+
+    A :class:`CategoricalArray` can be used as annotation array of an
+    :class:`AtomArray` or :class:`AtomArrayStack`, e.g. via
+    :func:`AtomArray.set_annotation()`.
+    Indexing, concatenation and copying of the atom array (stack)
+    retain the categorical representation.
+    All other *NumPy* functions operate on the decoded string array.
+
+    Parameters
+    ----------
+    values : ndarray, dtype=str or CategoricalArray
+        The strings to be encoded.
+        Like for a *NumPy* string array, the width of the strings is
+        limited by the width of the input *dtype*.
+
+    Attributes
+    ----------
+    codes : ndarray, dtype=unsigned int
+        The index of the string in `vocabulary` for each element.
+    vocabulary : ndarray, dtype=str
+        The distinct strings that may occur in this array.
+    dtype : dtype
+        The *dtype* of the decoded string array.
+    shape : tuple of int
+        The shape of the array.
+
+    Notes
+    -----
+    In contrast to *NumPy* arrays, indexing a :class:`CategoricalArray`
+    with a slice creates a copy instead of a view.
+
+    Examples
+    --------
+
+    >>> res_names = CategoricalArray(np.array(["ALA", "GLY", "ALA", "HIS"]))
+    >>> print(res_names.vocabulary)
+    ['ALA' 'GLY' 'HIS']
+    >>> print(res_names.codes)
+    [0 1 0 2]
+    >>> print(res_names == "ALA")
+    [ True False  True False]
+    >>> res_names[1] = "TRP"
+    >>> print(res_names)
+    ['ALA' 'TRP' 'ALA' 'HIS']
+    """
+
+    def __init__(self, values):
+        if isinstance(values, CategoricalArray):
+            self._codes = values._codes.copy()
+            self._vocabulary = values._vocabulary
+            self._index = values._index
+            return
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise IndexError("Expected a one-dimensional array")
+        if len(values) == 0 and values.dtype.kind != "U":
+            values = values.astype("U1")
+        if values.dtype.kind != "U":
+            raise TypeError(
+                f"Expected an array of strings, not '{values.dtype}'"
+            )
+        vocabulary, codes = np.unique(values, return_inverse=True)
+        self._vocabulary = vocabulary
+        self._codes = codes.reshape(values.shape) \
+                      .astype(_code_dtype(len(vocabulary)))
+        # Maps each string in the vocabulary to its code,
+        # created lazily
+        self._index = None
+
+    @staticmethod
+    def _from_codes(codes, vocabulary, index=None):
+        """
+        Create a :class:`CategoricalArray` from the given codes and
+        vocabulary without checks.
+        """
+        array = CategoricalArray.__new__(CategoricalArray)
+        array._codes = codes
+        array._vocabulary = vocabulary
+        array._index = index
+        return array
+
+    @property
+    def codes(self):
+        return self._codes
+
+    @property
+    def vocabulary(self):
+        return self._vocabulary
+
+    @property
+    def dtype(self):
+        return self._vocabulary.dtype
+
+    @property
+    def shape(self):
+        return self._codes.shape
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self._codes.size
+
+    @property
+    def nbytes(self):
+        return self._codes.nbytes + self._vocabulary.nbytes
+
+    def astype(self, dtype, copy=True):
+        """
+        Decode the array into a *NumPy* array of the given *dtype*.
+
+        Parameters
+        ----------
+        dtype : dtype
+            The *dtype* of the decoded array.
+        copy : bool, optional
+            Ignored, the decoded array is always a new array.
+
+        Returns
+        -------
+        array : ndarray
+            The decoded array.
+        """
+        return self._vocabulary.astype(dtype)[self._codes]
+
+    def copy(self):
+        """
+        Create a copy of this array.
+
+        The vocabulary is shared with the copy.
+
+        Returns
+        -------
+        copy : CategoricalArray
+            The copy.
+        """
+        return CategoricalArray._from_codes(
+            self._codes.copy(), self._vocabulary, self._index
+        )
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        array = self._vocabulary[self._codes]
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func in _HANDLED_FUNCTIONS:
+            return _HANDLED_FUNCTIONS[func](*args, **kwargs)
+        # Fall back to the decoded string array
+        return func(*_decode(args), **_decode(kwargs))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __getitem__(self, index):
+        codes = self._codes[index]
+        if isinstance(codes, np.ndarray):
+            if codes.ndim == 0:
+                return self._vocabulary[codes]
+            # Copy codes, as values that are assigned to a view would
+            # not be covered by the vocabulary of the original array
+            if np.may_share_memory(codes, self._codes):
+                codes = codes.copy()
+            return CategoricalArray._from_codes(
+                codes, self._vocabulary, self._index
+            )
+        else:
+            return self._vocabulary[codes]
+
+    def __setitem__(self, index, value):
+        # Strings that are too long are truncated,
+        # as for a NumPy string array
+        codes = self._encode(
+            np.asarray(value).astype(self._vocabulary.dtype)
+        )
+        self._codes[index] = codes
+
+    def __eq__(self, item):
+        if isinstance(item, (str, np.str_)):
+            code = self._get_index().get(item)
+            if code is None:
+                return np.zeros(self.shape, dtype=bool)
+            return self._codes == code
+        elif isinstance(item, CategoricalArray):
+            if item._vocabulary is self._vocabulary:
+                return self._codes == item._codes
+            # Compare each pair of strings in both vocabularies only once
+            equality_table = (
+                self._vocabulary[:, np.newaxis]
+                == item._vocabulary[np.newaxis, :]
+            )
+            return equality_table[self._codes, item._codes]
+        else:
+            return np.asarray(self) == item
+
+    def __ne__(self, item):
+        return ~(self == item)
+
+    # Mutable arrays are not hashable
+    __hash__ = None
+
+    def __str__(self):
+        return str(np.asarray(self))
+
+    def __repr__(self):
+        return f"CategoricalArray({repr(np.asarray(self))})"
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {
+                string: code for code, string in enumerate(self._vocabulary)
+            }
+        return self._index
+
+    def _encode(self, values):
+        """
+        Get the codes for the given strings.
+        Strings that are not in the vocabulary yet are added to it.
+        """
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        index = self._get_index()
+        new_values = [
+            value for value in unique_values if value not in index
+        ]
+        if len(new_values) > 0:
+            # Do not modify the vocabulary in-place,
+            # as it may be shared with other arrays
+            self._vocabulary = np.append(self._vocabulary, new_values)
+            self._index = None
+            index = self._get_index()
+            code_dtype = _code_dtype(len(self._vocabulary))
+            if code_dtype != self._codes.dtype:
+                self._codes = self._codes.astype(code_dtype)
+        unique_codes = np.array(
+            [index[value] for value in unique_values], dtype=self._codes.dtype
+        )
+        return unique_codes[inverse].reshape(values.shape)
+
+
+def _code_dtype(vocabulary_size):
+    """
+    Get the smallest unsigned integer type that can represent each
+    code of a vocabulary with the given size.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if vocabulary_size <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def _decode(obj):
+    """
+    Recursively replace each :class:`CategoricalArray` in the given
+    object by its decoded *NumPy* array.
+    """
+    if isinstance(obj, CategoricalArray):
+        return np.asarray(obj)
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(_decode(item) for item in obj)
+    elif isinstance(obj, dict):
+        return {key: _decode(item) for key, item in obj.items()}
+    else:
+        return obj
+
+
+def _implements(*functions):
+    """
+    Register the decorated function as implementation of the given
+    *NumPy* functions for :class:`CategoricalArray`.
+    """
+    def decorator(implementation):
+        for function in functions:
+            _HANDLED_FUNCTIONS[function] = implementation
+        return implementation
+    return decorator
+
+
+@_implements(np.copy)
+def _copy(a, *args, **kwargs):
+    return a.copy()
+
+
+def _codes_function(func):
+    """
+    Create an implementation that applies the given *NumPy* function on
+    the codes of a :class:`CategoricalArray` given as first argument.
+    """
+    def implementation(a, *args, **kwargs):
+        if not isinstance(a, CategoricalArray) \
+           or any(isinstance(arg, CategoricalArray) for arg in args):
+                return func(*_decode((a,) + args), **_decode(kwargs))
+        return CategoricalArray._from_codes(
+            func(a._codes, *args, **kwargs), a._vocabulary, a._index
+        )
+    return implementation
+
+for _function in (np.delete, np.tile, np.repeat, np.take):
+    _implements(_function)(_codes_function(_function))
+
+
+@_implements(np.concatenate)
+def _concatenate(arrays, axis=0, **kwargs):
+    arrays = list(arrays)
+    if not all(isinstance(array, CategoricalArray) for array in arrays) \
+       or axis != 0 or len(kwargs) > 0:
+            return np.concatenate(_decode(arrays), axis, **kwargs)
+
+    vocabulary = arrays[0]._vocabulary
+    if all(array._vocabulary is vocabulary for array in arrays):
+        # Fast path for a shared vocabulary
+        return CategoricalArray._from_codes(
+            np.concatenate([array._codes for array in arrays]),
+            vocabulary, arrays[0]._index
+        )
+    # Merge the vocabularies
+    vocabulary, inverse = np.unique(
+        np.concatenate([array._vocabulary for array in arrays]),
+        return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    code_dtype = _code_dtype(len(vocabulary))
+    codes = []
+    offset = 0
+    for array in arrays:
+        # Map the codes of each array to the merged vocabulary
+        codes.append(inverse[offset + array._codes.astype(np.int64)])
+        offset += len(array._vocabulary)
+    return CategoricalArray._from_codes(
+        np.concatenate(codes).astype(code_dtype), vocabulary
+    )
+
+
+@_implements(np.array_equal)
+def _array_equal(a1, a2, *args, **kwargs):
+    if not isinstance(a1, CategoricalArray) \
+       or not isinstance(a2, CategoricalArray):
+            return np.array_equal(*_decode((a1, a2) + args), **kwargs)
+    if a1.shape != a2.shape:
+        return False
+    return bool((a1 == a2).all())
+
+
+# 'np.in1d()' is deprecated in newer NumPy versions
+@_implements(*[
+    function for function in (np.isin, getattr(np, "in1d", None))
+    if function is not None
+])
+def _isin(element, test_elements, *args, **kwargs):
+    if not isinstance(element, CategoricalArray):
+        return np.isin(
+            element, _decode(test_elements), *args, **_decode(kwargs)
+        )
+    # Only each string in the vocabulary needs to be tested
+    vocabulary_mask = np.isin(
+        element._vocabulary, _decode(test_elements), *args, **kwargs
+    )
+    return vocabulary_mask[element._codes]
@@ -23,11 +23,12 @@ from .box import repeat_box_coord, move_inside_box
 ctypedef np.uint64_t ptr
 ctypedef np.float32_t float32
 ctypedef np.uint8_t uint8
+ctypedef np.int32_t int32
 
 
 cdef class CellList:
     """
-    __init__(atom_array, cell_size, periodic=False, box=None, selection=None)
+    __init__(atom_array, cell_size, periodic=False, box=None, selection=None, skin=0)
     
     This class enables the efficient search of atoms in vicinity of a
     defined location.
@@ -41,6 +42,12 @@ cdef class CellList:
     after the :class:`CellList` has been created.
     Therefore a :class:`CellList` saves calculation time in those
     cases, where vicinity is checked for multiple locations.
+
+    For trajectories, the coordinates of the atoms can be updated via
+    :func:`update()`, which reuses the allocated cells.
+    Optionally, a *Verlet skin* can be given:
+    In this case the atoms are only reassigned to cells, if any atom
+    has moved more than half of the skin since the last assignment.
     
     Parameters
     ----------
@@ -64,6 +71,12 @@ cdef class CellList:
         If provided, only the atoms masked by this array are stored in
         the cell list. However, the indices stored in the cell list
         will still refer to the original unfiltered `atom_array`.
+    skin : float, optional
+        The Verlet skin used by :func:`update()`.
+        A larger skin means that the cell assignment of the atoms is
+        updated less often, but more atoms need to be checked in
+        each search.
+        By default, the atoms are reassigned in each update.
             
     Examples
     --------
@@ -81,6 +94,8 @@ cdef class CellList:
     cdef ptr[:,:,:] _cells
     # The amount elements in each C-array in '_cells'
     cdef int[:,:,:] _cell_length
+    # The allocated size of each C-array in '_cells'
+    cdef int[:,:,:] _cell_capacity
     # The maximum value of '_cell_length' over all cells,
     # required for worst case assumption on size of output arrays
     cdef int _max_cell_length
@@ -99,19 +114,15 @@ cdef class CellList:
     cdef int _orig_length
     cdef float32[:] _orig_min_coord
     cdef float32[:] _orig_max_coord
+    # The Verlet skin and the coordinates (no periodic copies)
+    # at the time of the last cell assignment
+    cdef float _skin
+    cdef np.ndarray _binned_coord
     
     
-    @cython.initializedcheck(False)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def __cinit__(self, atom_array not None, float cell_size,
-                  bint periodic=False, box=None, np.ndarray selection=None):
-        cdef float32 x, y, z
-        cdef int i, j, k
-        cdef int atom_array_i
-        cdef int* cell_ptr = NULL
-        cdef int length
-
+                  bint periodic=False, box=None, np.ndarray selection=None,
+                  float skin=0):
         if isinstance(atom_array, AtomArrayStack):
             raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
         coord = to_coord(atom_array)
@@ -143,34 +154,17 @@ cdef class CellList:
                 )
             if np.isnan(self._box).any():
                 raise ValueError("Box contains NaN values")
-            coord = move_inside_box(coord, self._box)
-            coord, indices = repeat_box_coord(coord, self._box)
         
         if self._has_initialized_cells():
             raise Exception("Duplicate call of constructor")
         self._cells = None
         if cell_size <= 0:
             raise ValueError("Cell size must be greater than 0")
+        if skin < 0:
+            raise ValueError("Skin must be a positive value")
         self._periodic = periodic
-        self._coord = coord.astype(np.float32, copy=False)
         self._cellsize = cell_size
-        # calculate how many cells are required for each dimension
-        min_coord = np.min(coord, axis=0).astype(np.float32)
-        max_coord = np.max(coord, axis=0).astype(np.float32)
-        self._min_coord = min_coord
-        self._max_coord = max_coord
-        cell_count = (((max_coord - min_coord) / cell_size) +1).astype(int)
-        if self._periodic:
-            self._orig_min_coord = np.min(coord[:self._orig_length], axis=0) \
-                                   .astype(np.float32)
-            self._orig_max_coord = np.max(coord[:self._orig_length], axis=0) \
-                                   .astype(np.float32)
-        
-        # ndarray of pointers to C-arrays
-        # containing indices to atom array
-        self._cells = np.zeros(cell_count, dtype=np.uint64)
-        # Stores the length of the C-arrays
-        self._cell_length = np.zeros(cell_count, dtype=np.int32)
+        self._skin = skin
         
         # Prepare selection
         if selection is not None:
@@ -184,30 +178,172 @@ cdef class CellList:
         else:
             self._has_selection = False
         
+        self._assign_cells(self._prepare_coord(coord))
+    
+
+    def update(self, atom_array not None, box=None):
+        """
+        update(atom_array, box=None)
+
+        Update the atom coordinates in this cell list.
+
+        The atoms in the cell list are reassigned to the cells, reusing
+        the already allocated memory.
+        This is more efficient than creating a new :class:`CellList`,
+        e.g. for each model of a trajectory.
+        If a Verlet `skin` was given to the constructor, the cell
+        assignment is only updated, if at least one atom has moved
+        more than half of the skin since the last assignment.
+
+        Parameters
+        ----------
+        atom_array : AtomArray or ndarray, dtype=float, shape=(n,3)
+            The atoms with updated coordinates.
+            The atoms must be the same as the ones given to the
+            constructor, i.e. the number of atoms must be equal.
+        box : ndarray, dtype=float, shape=(3,3), optional
+            If provided, the periodicity is based on this parameter
+            instead of the :attr:`box` attribute of `atom_array`.
+            If neither is available, the previous box is kept.
+            Only has an effect, if the cell list is periodic.
+
+        Examples
+        --------
+
+        >>> cell_list = CellList(atom_array_stack[0], cell_size=5, skin=2)
+        >>> for model in atom_array_stack:
+        ...     cell_list.update(model)
+        ...     near_atoms = cell_list.get_atoms(np.array([1,2,3]), radius=7.0)
+        """
+        if isinstance(atom_array, AtomArrayStack):
+            raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
+        coord = to_coord(atom_array)
+        if coord.shape != (self._orig_length, 3):
+            raise IndexError(
+                f"The cell list has {self._orig_length} atoms, "
+                f"but the coordinates have shape {coord.shape}"
+            )
+        if np.isnan(coord).any():
+            raise ValueError("Coordinates contain NaN values")
+        
+        cdef bint box_changed = False
+        if self._periodic:
+            if box is None:
+                box = getattr(atom_array, "box", None)
+            if box is not None:
+                if box.shape != (3,3):
+                    raise ValueError("Box has invalid shape")
+                if np.isnan(box).any():
+                    raise ValueError("Box contains NaN values")
+                box_changed = not np.array_equal(box, self._box)
+                self._box = box
+        
+        coord = self._prepare_coord(coord)
+        if self._skin > 0 and not box_changed:
+            max_sq_disp = np.max(np.sum(
+                (coord[:self._orig_length] - self._binned_coord)**2, axis=-1
+            ))
+            if max_sq_disp <= (self._skin / 2)**2:
+                # The atoms are still in reach of their assigned cells,
+                # as searches take half of the skin into account
+                # -> Only update the coordinates
+                self._coord = coord
+                return
+        self._assign_cells(coord)
+    
+
+    def _prepare_coord(self, np.ndarray coord):
+        """
+        Convert the coordinates into the internally used format,
+        including the periodic copies, if the cell list is periodic.
+        """
+        if self._periodic:
+            coord = move_inside_box(coord, self._box)
+            coord, _ = repeat_box_coord(coord, self._box)
+        return coord.astype(np.float32, copy=False)
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def _assign_cells(self, np.ndarray coord):
+        """
+        Put the atoms into the cells, based on the given coordinates.
+
+        If the required amount of cells is the same as in the previous
+        call, the cells are reused.
+        """
+        cdef int i, j, k
+        cdef int atom_array_i
+        cdef int* cell_ptr = NULL
+        cdef int length
+        cdef int capacity
+        
+        self._coord = coord
+        self._binned_coord = coord[:self._orig_length].copy()
+        # calculate how many cells are required for each dimension
+        min_coord = np.min(coord, axis=0).astype(np.float32)
+        max_coord = np.max(coord, axis=0).astype(np.float32)
+        self._min_coord = min_coord
+        self._max_coord = max_coord
+        cell_count = (((max_coord - min_coord) / self._cellsize) +1) \
+                     .astype(int)
+        if self._periodic:
+            self._orig_min_coord = np.min(coord[:self._orig_length], axis=0) \
+                                   .astype(np.float32)
+            self._orig_max_coord = np.max(coord[:self._orig_length], axis=0) \
+                                   .astype(np.float32)
+        
+        if self._has_initialized_cells() \
+           and cell_count[0] == self._cells.shape[0] \
+           and cell_count[1] == self._cells.shape[1] \
+           and cell_count[2] == self._cells.shape[2]:
+                # Reuse existing cells, only the content is overwritten
+                self._cell_length[:,:,:] = 0
+        else:
+            if self._has_initialized_cells():
+                deallocate_ptrs(self._cells)
+            # ndarray of pointers to C-arrays
+            # containing indices to atom array
+            self._cells = np.zeros(cell_count, dtype=np.uint64)
+            # Stores the length of the C-arrays
+            self._cell_length = np.zeros(cell_count, dtype=np.int32)
+            self._cell_capacity = np.zeros(cell_count, dtype=np.int32)
+        self._max_cell_length = 0
+        
         # Fill cells
         for atom_array_i in range(self._coord.shape[0]):
             # Only put selected atoms into cell list
             if not self._has_selection \
                or self._selection[atom_array_i % self._orig_length]:
-                    x = self._coord[atom_array_i, 0]
-                    y = self._coord[atom_array_i, 1]
-                    z = self._coord[atom_array_i, 2]
                     # Get cell indices for coordinates
-                    self._get_cell_index(x, y, z, &i, &j, &k)
-                    # Increment cell length and reallocate
+                    self._get_cell_index(
+                        self._coord[atom_array_i, 0],
+                        self._coord[atom_array_i, 1],
+                        self._coord[atom_array_i, 2],
+                        &i, &j, &k
+                    )
+                    # Increment cell length and reallocate,
+                    # if the C-array is too small
                     length = self._cell_length[i,j,k] + 1
                     cell_ptr = <int*>self._cells[i,j,k]
-                    cell_ptr = <int*>realloc(cell_ptr, length * sizeof(int))
-                    if not cell_ptr:
-                        raise MemoryError()
+                    capacity = self._cell_capacity[i,j,k]
+                    if length > capacity:
+                        capacity = 2 * capacity if capacity > 0 else 1
+                        cell_ptr = <int*>realloc(
+                            cell_ptr, capacity * sizeof(int)
+                        )
+                        if not cell_ptr:
+                            raise MemoryError()
+                        self._cells[i,j,k] = <ptr> cell_ptr
+                        self._cell_capacity[i,j,k] = capacity
                     # Potentially increase max cell length
                     if length > self._max_cell_length:
                         self._max_cell_length = length
                     # Store atom array index in respective cell
                     cell_ptr[length-1] = atom_array_i
-                    # Store new cell pointer and length
+                    # Store new cell length
                     self._cell_length[i,j,k] = length
-                    self._cells[i,j,k] = <ptr> cell_ptr
             
     
     def __dealloc__(self):
@@ -258,6 +394,14 @@ cdef class CellList:
         errors.
         The matrix can be symmetrized with ``numpy.maximum(a, a.T)``.
 
+        The memory requirement of the adjacency matrix scales
+        quadratically with the number of atoms.
+        For large systems :func:`get_pairs()` should be used instead.
+
+        See Also
+        --------
+        get_pairs
+
         Examples
         --------
         Create adjacency matrix for CA atoms in a structure:
@@ -289,6 +433,216 @@ cdef class CellList:
             return self.get_atoms(coord, threshold_distance, as_mask=True)
         
     
+    def get_pairs(self, float32 threshold_distance, np.ndarray coord=None,
+                  bint return_distances=False):
+        """
+        get_pairs(threshold_distance, coord=None, return_distances=False)
+        
+        Find all pairs of atoms within a threshold distance.
+
+        In contrast to :func:`create_adjacency_matrix()` and
+        :func:`get_atoms()` the result is a sparse list of index pairs.
+        Hence, the memory requirement scales with the number of found
+        pairs instead of the square of the number of atoms.
+        
+        Parameters
+        ----------
+        threshold_distance : float
+            The threshold distance. All atom pairs that have a distance
+            lower than or equal to this value are returned.
+        coord : ndarray, dtype=float, shape=(m,3), optional
+            If given, pairs of these positions and the atoms in this
+            cell list are found.
+            By default, the pairs of atoms within the cell list itself
+            are found.
+        return_distances : bool, optional
+            If true, the distance of each pair is returned additionally.
+        
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(k,2)
+            The found pairs.
+            If `coord` is not given, each row contains the indices of two
+            atoms in the cell list, where the lower index is in the
+            first column.
+            Each pair is contained only once and no atom is paired with
+            itself.
+            If `coord` is given, the first column contains the index of
+            the position in `coord` and the second column the index
+            of the atom in the cell list.
+            The pairs are sorted by the first and then by the second
+            column.
+        distances : ndarray, dtype=float32, shape=(k,)
+            The distance for each pair in `pairs`.
+            Only returned with `return_distances` set to true.
+        
+        See Also
+        --------
+        create_adjacency_matrix
+        get_atoms
+
+        Notes
+        -----
+        If a `selection` was given to the constructor of the
+        :class:`CellList`, only pairs of selected atoms are returned.
+
+        In case of a :class:`CellList` with `periodic` set to `True`,
+        the distance to the nearest periodic copy of an atom is used.
+
+        Examples
+        --------
+        Find all pairs of atoms with a distance of at most 1.5 Å in a
+        structure and compare it to the adjacency matrix:
+
+        >>> cell_list = CellList(atom_array, 1.5)
+        >>> pairs = cell_list.get_pairs(1.5)
+        >>> matrix = cell_list.create_adjacency_matrix(1.5)
+        >>> print(np.all(matrix[pairs[:,0], pairs[:,1]]))
+        True
+        >>> print(len(pairs) == (np.count_nonzero(matrix) - len(matrix)) // 2)
+        True
+        """
+        cdef bint is_self_query = coord is None
+        cdef np.ndarray query_indices
+
+        if threshold_distance < 0:
+            raise ValueError("Threshold must be a positive value")
+        
+        if is_self_query:
+            # Use the atom positions themselves as query positions
+            # (no periodic copies)
+            coord = np.asarray(self._coord[:self._orig_length])
+            if self._has_selection:
+                query_indices = np.where(
+                    np.asarray(self._selection, dtype=bool)
+                )[0].astype(np.int32)
+                coord = coord[query_indices]
+            else:
+                query_indices = None
+        else:
+            if coord.ndim != 2 or coord.shape[1] != 3:
+                raise ValueError("Coordinates must have shape (m,3)")
+            if self._periodic:
+                coord = move_inside_box(coord, self._box)
+        coord = coord.astype(np.float32, copy=False)
+        
+        pairs, sq_dist = self._find_pairs(
+            coord,
+            threshold_distance * threshold_distance,
+            int((threshold_distance + self._skin / 2) / self._cellsize) + 1
+        )
+        
+        if is_self_query and query_indices is not None:
+            # Map query indices back to indices of the atom array
+            pairs[:, 0] = query_indices[pairs[:, 0]]
+        if self._periodic:
+            # Map indices of repeated coordinates to original
+            # coordinates
+            pairs[:, 1] %= self._orig_length
+        if is_self_query:
+            # Each pair is found from both sides
+            # -> keep only one direction, which also removes the pairs
+            # of an atom with itself
+            mask = pairs[:, 0] < pairs[:, 1]
+            pairs = pairs[mask]
+            sq_dist = sq_dist[mask]
+        # Sort pairs and remove duplicates:
+        # In case of periodicity the same pair may be found multiple
+        # times, due to multiple periodic copies of an atom,
+        # in this case the nearest copy is retained
+        order = np.lexsort((sq_dist, pairs[:, 1], pairs[:, 0]))
+        pairs = pairs[order]
+        sq_dist = sq_dist[order]
+        if self._periodic and len(pairs) > 0:
+            unique_mask = np.ones(len(pairs), dtype=bool)
+            unique_mask[1:] = (pairs[1:] != pairs[:-1]).any(axis=-1)
+            pairs = pairs[unique_mask]
+            sq_dist = sq_dist[unique_mask]
+        
+        if return_distances:
+            return pairs, np.sqrt(sq_dist)
+        else:
+            return pairs
+    
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def _find_pairs(self, float32[:,:] coord, float32 sq_radius,
+                    int cell_r):
+        """
+        Find all pairs of a position in `coord` and an atom in the cell
+        list (including periodic copies), whose squared distance is at
+        most `sq_radius`.
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(k,2)
+            The pairs of position index and atom index.
+            The atom indices are not mapped to the original atoms, i.e.
+            they may point to periodic copies.
+        sq_dist : ndarray, dtype=float32, shape=(k,)
+            The squared distances of the pairs.
+        """
+        cdef int length
+        cdef int* list_ptr
+        cdef float32 x, y, z
+        cdef float32 sq_dist
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j, adj_k
+        cdef int pos_i, cell_i, atom_i
+        cdef int pair_i = 0
+
+        cdef ptr[:,:,:] cells = self._cells
+        cdef int[:,:,:] cell_length = self._cell_length
+        
+        # The output arrays grow dynamically,
+        # as the number of pairs is not known in advance
+        cdef int capacity = max(coord.shape[0], 1)
+        pairs = np.zeros((capacity, 2), dtype=np.int32)
+        sq_distances = np.zeros(capacity, dtype=np.float32)
+        cdef int32[:,:] pairs_v = pairs
+        cdef float32[:] sq_distances_v = sq_distances
+
+        for pos_i in range(coord.shape[0]):
+            x = coord[pos_i, 0]
+            y = coord[pos_i, 1]
+            z = coord[pos_i, 2]
+            self._get_cell_index(x, y, z, &i, &j, &k)
+            for adj_i in range(max(i-cell_r, 0),
+                               min(i+cell_r+1, cells.shape[0])):
+                for adj_j in range(max(j-cell_r, 0),
+                                   min(j+cell_r+1, cells.shape[1])):
+                    for adj_k in range(max(k-cell_r, 0),
+                                       min(k+cell_r+1, cells.shape[2])):
+                        list_ptr = <int*>cells[adj_i, adj_j, adj_k]
+                        length = cell_length[adj_i, adj_j, adj_k]
+                        for cell_i in range(length):
+                            atom_i = list_ptr[cell_i]
+                            sq_dist = squared_distance(
+                                x, y, z,
+                                self._coord[atom_i, 0],
+                                self._coord[atom_i, 1],
+                                self._coord[atom_i, 2]
+                            )
+                            if sq_dist <= sq_radius:
+                                if pair_i >= capacity:
+                                    # Double the size of the arrays
+                                    capacity *= 2
+                                    pairs = np.resize(pairs, (capacity, 2))
+                                    sq_distances = np.resize(
+                                        sq_distances, capacity
+                                    )
+                                    pairs_v = pairs
+                                    sq_distances_v = sq_distances
+                                pairs_v[pair_i, 0] = pos_i
+                                pairs_v[pair_i, 1] = atom_i
+                                sq_distances_v[pair_i] = sq_dist
+                                pair_i += 1
+        
+        return pairs[:pair_i], sq_distances[:pair_i]
+    
+
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -414,10 +768,12 @@ cdef class CellList:
         # Convert input parameters into a uniform format
         coord, radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, radius, np.float32)
+        # Atoms may have moved up to half of the skin
+        # since they were assigned to their cells
         if is_multi_radius:
             sq_radii = radius * radius
             cell_radii = np.floor_divide(
-                radius, self._cellsize
+                radius + self._skin / 2, self._cellsize
             ).astype(np.int32) + 1
         else:
             # All radii are equal
@@ -425,7 +781,8 @@ cdef class CellList:
                 len(coord), radius[0]*radius[0], dtype=np.float32
             )
             cell_radii = np.full(
-                len(coord), int(radius[0]/self._cellsize)+1, dtype=np.int32
+                len(coord), int((radius[0] + self._skin / 2)/self._cellsize)+1,
+                dtype=np.int32
             )
 
         # Get indices for adjacent atoms, based on a cell radius
@@ -538,6 +895,11 @@ cdef class CellList:
         threshold radius, the returned `indices` array contains the
         corresponding index multiple times.
         Please use ``numpy.unique()``, if this is undesireable.
+
+        If the :class:`CellList` has a Verlet skin, the cell radius is
+        increased by the amount of cells covered by half of the skin.
+        Hence, all atoms that are currently within the cell radius are
+        still found.
         """
         # This function is a thin wrapper around the private method
         # with the same name, with addition of handling periodicty
@@ -549,6 +911,11 @@ cdef class CellList:
         # Convert input parameters into a uniform format
         coord, cell_radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, cell_radius, np.int32)
+        if self._skin > 0:
+            # Atoms may have moved up to half of the skin
+            # since they were assigned to their cells
+            cell_radius = cell_radius \
+                          + int(np.ceil(self._skin / 2 / self._cellsize))
         # Get adjacent atom indices
         array_indices = self._get_atoms_in_cells(
             coord, cell_radius, is_multi_radius
@@ -9,9 +9,11 @@ atom level.
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
-__all__ = ["get_chain_starts", "get_chains", "get_chain_count", "chain_iter"]
+__all__ = ["get_chain_starts", "apply_chain_wise", "get_chains",
+           "get_chain_count", "chain_iter"]
 
 import numpy as np
+from .segments import apply_segment_wise
 
 
 def get_chain_starts(array, add_exclusive_stop=False):
@@ -57,6 +59,54 @@ def get_chain_starts(array, add_exclusive_stop=False):
         return np.concatenate(([0], chain_starts))
 
 
+def apply_chain_wise(array, data, function, axis=None):
+    """
+    Apply a function to intervals of data, where each interval
+    corresponds to one chain.
+    
+    The function takes an atom array (stack) and an data array
+    (`ndarray`) of the same length. The function iterates through the
+    chain IDs of the atom array (stack) and identifies intervals of
+    the same ID. Then the data is
+    partitioned into the same intervals, and each interval (also an
+    :class:`ndarray`) is put as parameter into `function`. Each return
+    value is stored as element in the resulting :class:`ndarray`,
+    therefore each element corresponds to one chain. 
+    
+    Parameters
+    ----------
+    array : AtomArray or AtomArrayStack
+        The atom array (stack) to determine the chains from.
+    data : ndarray
+        The data, whose intervals are the parameter for `function`. Must
+        have same length as `array`.
+    function : function
+        The `function` must have either the form *f(data)* or
+        *f(data, axis)* in case `axis` is given. Every `function` call
+        must return a value with the same shape and data type.
+    axis : int, optional
+        This value is given to the `axis` parameter of `function`.
+        
+    Returns
+    -------
+    processed_data : ndarray
+        Chain-wise evaluation of `data` by `function`. The size of the
+        first dimension of this array is equal to the amount of
+        chains.
+    
+    See also
+    --------
+    apply_residue_wise
+    
+    Notes
+    -----
+    The same vectorized *NumPy* reductions as in
+    :func:`apply_residue_wise()` are supported.
+    """
+    starts = get_chain_starts(array, add_exclusive_stop=True)
+    return apply_segment_wise(starts, data, function, axis)
+
+
 def get_chains(array):
     """
     Get the chain IDs of an atom array (stack).
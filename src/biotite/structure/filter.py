@@ -237,14 +237,20 @@ def filter_first_altloc(atoms, altloc_ids):
     
     # And filter all atoms for each residue with the first altloc ID
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    for start, stop in zip(residue_starts[:-1], residue_starts[1:]):
-        letter_altloc_ids = [l for l in altloc_ids[start:stop] if l.isalpha()]
-        if len(letter_altloc_ids) > 0:
-            first_id = letter_altloc_ids[0]
-            altloc_filter[start:stop] |= (altloc_ids[start:stop] == first_id)
-        else:
-            # No altloc ID in this residue -> Nothing to do
-            pass
+    res_indices, letter_mask, letter_codes = _get_altloc_codes(
+        residue_starts, altloc_ids
+    )
+    # The first atom with a letter altloc ID in each residue
+    # that has such an atom
+    letter_indices = np.where(letter_mask)[0]
+    altloc_res, first_indices = np.unique(
+        res_indices[letter_indices], return_index=True
+    )
+    selected_codes = np.full(len(residue_starts) - 1, -1, dtype=int)
+    selected_codes[altloc_res] \
+        = letter_codes[letter_indices[first_indices]]
+    altloc_filter |= letter_mask \
+                   & (letter_codes == selected_codes[res_indices])
     
     return altloc_filter
 
@@ -315,25 +321,62 @@ def filter_highest_occupancy_altloc(atoms, altloc_ids, occupancies):
     # And filter all atoms for each residue with the highest sum of
     # occupancies
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    for start, stop in zip(residue_starts[:-1], residue_starts[1:]):
-        occupancies_in_res = occupancies[start:stop]
-        altloc_ids_in_res = altloc_ids[start:stop]
-        
-        letter_altloc_ids = [l for l in altloc_ids_in_res if l.isalpha()]
-        
-        if len(letter_altloc_ids) > 0:
-            highest = -1.0
-            highest_id = None
-            for id in set(letter_altloc_ids):
-                occupancy_sum = np.sum(
-                    occupancies_in_res[altloc_ids_in_res == id]
-                )
-                if occupancy_sum > highest:
-                    highest = occupancy_sum
-                    highest_id = id
-            altloc_filter[start:stop] |= (altloc_ids[start:stop] == highest_id)
-        else:
-            # No altloc ID in this residue -> Nothing to do
-            pass
+    res_indices, letter_mask, letter_codes = _get_altloc_codes(
+        residue_starts, altloc_ids
+    )
+    n_codes = max(np.max(letter_codes, initial=-1) + 1, 1)
+    # Sum the occupancies for each combination of residue
+    # and altloc ID
+    keys, key_indices = np.unique(
+        res_indices[letter_mask] * n_codes + letter_codes[letter_mask],
+        return_inverse=True
+    )
+    occupancy_sums = np.bincount(
+        key_indices, weights=occupancies[letter_mask], minlength=len(keys)
+    )
+    key_res = keys // n_codes
+    key_codes = keys % n_codes
+    # Sort by residue and descending occupancy sum,
+    # on equal occupancy sums the altloc ID that comes first
+    # alphabetically is preferred
+    order = np.lexsort((key_codes, -occupancy_sums, key_res))
+    altloc_res, highest_indices = np.unique(
+        key_res[order], return_index=True
+    )
+    highest_keys = order[highest_indices]
+    # Only occupancy sums above -1 are considered
+    is_valid = occupancy_sums[highest_keys] > -1.0
+    selected_codes = np.full(len(residue_starts) - 1, -1, dtype=int)
+    selected_codes[altloc_res[is_valid]] = key_codes[highest_keys[is_valid]]
+    altloc_filter |= letter_mask \
+                   & (letter_codes == selected_codes[res_indices])
     
-    return altloc_filter
\ No newline at end of file
+    return altloc_filter
+
+
+def _get_altloc_codes(residue_starts, altloc_ids):
+    """
+    Get the residue index for each atom and convert the altloc IDs
+    into integer codes.
+
+    Returns
+    -------
+    res_indices : ndarray, dtype=int, shape=(n,)
+        The index of the residue each atom belongs to.
+    letter_mask : ndarray, dtype=bool, shape=(n,)
+        True for each atom, whose altloc ID is a letter.
+    letter_codes : ndarray, dtype=int, shape=(n,)
+        An integer code for each altloc ID, where the codes follow the
+        alphabetical order of the IDs.
+        The code is -1 for atoms whose altloc ID is not a letter.
+    """
+    res_indices = np.repeat(
+        np.arange(len(residue_starts) - 1), np.diff(residue_starts)
+    )
+    altloc_ids = np.asarray(altloc_ids).astype(str, copy=False)
+    letter_mask = np.char.isalpha(altloc_ids)
+    letter_codes = np.full(len(altloc_ids), -1, dtype=int)
+    letter_codes[letter_mask] = np.unique(
+        altloc_ids[letter_mask], return_inverse=True
+    )[1]
+    return res_indices, letter_mask, letter_codes
@@ -18,8 +18,8 @@ from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .util import vector_dot, norm_vector
 from .filter import filter_backbone
 from .chains import chain_iter
-from .box import (coord_to_fraction, fraction_to_coord,
-                  move_inside_box, is_orthogonal)
+from .box import is_orthogonal
+from .pbc import _minimum_image_displacement
 from .error import BadStructureError
 
 
@@ -66,72 +66,35 @@ def displacement(atoms1, atoms2, box=None):
     
     # Use minimum-image convention if box is given
     if box is not None:
-        # Transform difference vector
-        # from coordinates into fractions of box vectors
-        # for faster calculation laster on
-        fractions = coord_to_fraction(diff, box)
-        # Move vectors into box
-        fractions = fractions % 1
-        # Check for each model if the box vectors are orthogonal
-        orthogonality = is_orthogonal(box)
-        disp = np.zeros(fractions.shape, dtype=np.float64)
-        if fractions.ndim == 1:
+        box = np.asarray(box, dtype=np.float64)
+        if box.ndim == 2:
+            box = box[np.newaxis, :, :]
+        elif box.ndim != 3:
+            raise ValueError(f"{box.ndim} are to many box dimensions")
+        out_shape = diff.shape
+        if diff.ndim == 1:
             # Single atom
-            # Transform into two dimensions
-            # to match signature of '_displacement_xxx()'
-            fractions = fractions[np.newaxis, :]
-            disp = disp[np.newaxis, :]
-            if orthogonality:
-                _displacement_orthogonal_box(
-                    fractions, box, disp
-                )
-            else:
-                _displacement_triclinic_box(
-                    fractions.astype(np.float64, copy=False),
-                    box.astype(np.float64, copy=False),
-                    disp
-                )
-            # Transform back
-            disp = disp[0]
-        if fractions.ndim == 2:
-            # Single model
-            if orthogonality:
-                _displacement_orthogonal_box(
-                    fractions, box, disp
-                )
+            diff = diff[np.newaxis, np.newaxis, :]
+        elif diff.ndim == 2:
+            if len(box) == 1:
+                # Single model
+                diff = diff[np.newaxis, :, :]
             else:
-                _displacement_triclinic_box(
-                    fractions.astype(np.float64, copy=False),
-                    box.astype(np.float64, copy=False),
-                    disp
-                )
-        elif fractions.ndim == 3:
-            # Multiple models
-            # (Model count) x (Atom count)
-            for i in range(len(fractions)):
-                if box.ndim == 2:
-                    box_for_model = box
-                    orthogonality_for_model = orthogonality
-                elif box.ndim == 3:
-                    box_for_model = box[i]
-                    orthogonality_for_model = orthogonality[i]
-                else:
-                    raise ValueError(f"{box.ndim} are to many box dimensions")
-                if orthogonality_for_model:
-                    _displacement_orthogonal_box(
-                        fractions[i], box_for_model, disp[i]
-                    )
-                else:
-                    _displacement_triclinic_box(
-                        fractions[i].astype(np.float64, copy=False),
-                        box_for_model.astype(np.float64, copy=False),
-                        disp[i]
-                    )
-        else:
+                # The same displacements for each box
+                diff = np.broadcast_to(diff, (len(box),) + diff.shape)
+                out_shape = diff.shape
+        elif diff.ndim != 3:
             raise ValueError(
                 f"{diff.shape} is an invalid shape for atom coordinates"
             )
-        return disp
+        disp = np.zeros(diff.shape, dtype=np.float64)
+        _minimum_image_displacement(
+            diff.astype(np.float64, copy=False),
+            box,
+            is_orthogonal(box).astype(np.uint8),
+            disp
+        )
+        return disp.reshape(out_shape)
     
     else:
         return diff
@@ -184,11 +147,9 @@ def index_displacement(*args, **kwargs):
     --------
     In case `periodic` is set to true and if the box is not orthorhombic
     (at least one angle deviates from 90 degrees),
-    the calculation requires approximately 8 times as long as in the
-    orthorhombic case.
-    Furthermore, it is not guaranteed, that the lowest-distance periodic
-    copy is found for non-orthorhombic boxes; this is especially true
-    for heavily skewed boxes.
+    the calculation takes longer than in the orthorhombic case,
+    as multiple periodic copies need to be tested to find the
+    lowest-distance periodic copy.
 
     See also
     --------
@@ -275,11 +236,9 @@ def index_distance(*args, **kwargs):
     --------
     In case `periodic` is set to true and if the box is not orthorhombic
     (at least one angle deviates from 90 degrees),
-    the calculation requires approximately 8 times as long as in the
-    orthorhombic case.
-    Furthermore, it is not guaranteed, that the lowest-distance periodic
-    copy is found for non-orthorhombic boxes; this is especially true
-    for heavily skewed boxes.
+    the calculation takes longer than in the orthorhombic case,
+    as multiple periodic copies need to be tested to find the
+    lowest-distance periodic copy.
 
     See also
     --------
@@ -364,11 +323,9 @@ def index_angle(*args, **kwargs):
     --------
     In case `periodic` is set to true and if the box is not orthorhombic
     (at least one angle deviates from 90 degrees),
-    the calculation requires approximately 8 times as long as in the
-    orthorhombic case.
-    Furthermore, it is not guaranteed, that the lowest-distance periodic
-    copy is found for non-orthorhombic boxes; this is especially true
-    for heavily skewed boxes.
+    the calculation takes longer than in the orthorhombic case,
+    as multiple periodic copies need to be tested to find the
+    lowest-distance periodic copy.
 
     See also
     --------
@@ -465,11 +422,9 @@ def index_dihedral(*args, **kwargs):
     --------
     In case `periodic` is set to true and if the box is not orthorhombic
     (at least one angle deviates from 90 degrees),
-    the calculation requires approximately 8 times as long as in the
-    orthorhombic case.
-    Furthermore, it is not guaranteed, that the lowest-distance periodic
-    copy is found for non-orthorhombic boxes; this is especially true
-    for heavily skewed boxes.
+    the calculation takes longer than in the orthorhombic case,
+    as multiple periodic copies need to be tested to find the
+    lowest-distance periodic copy.
 
     See also
     --------
@@ -649,49 +604,3 @@ def _call_non_index_function(function, expected_amount,
     else:
         box = None
     return function(*coord_list, box)
-
-
-def _displacement_orthogonal_box(fractions, box, disp):
-    """
-    Fill in the PBC-aware displacement vector for non-PBC-aware
-    displacements given as fractions of given box vectors.
-    """
-    # Fraction components are guaranteed to be positive 
-    # Use fraction vector components with lower absolute
-    # -> new_vec[i] = vec[i] - 1 if vec[i] > 0.5 else vec[i]
-    fractions[fractions > 0.5] -= 1
-    disp[:] = fraction_to_coord(fractions, box)
-
-
-def _displacement_triclinic_box(fractions, box, disp):
-    """
-    Fill in the PBC-aware displacement vector for non-PBC-aware
-    displacements given as fractions of given box vectors.
-    """
-    diffs = fraction_to_coord(fractions, box)
-    # Fraction components are guaranteed to be positive 
-    # Test all 3 fraction vector components
-    # with positive and negative sign
-    # (i,j,k in {-1, 0})
-    # Hence, 8 periodic copies are tested
-    periodic_shift = []
-    for i in range(-1, 1):
-        for j in range(-1, 1):
-            for k in range(-1, 1):
-                x = i*box[0,0] + j*box[1,0] + k*box[2,0]
-                y = i*box[0,1] + j*box[1,1] + k*box[2,1]
-                z = i*box[0,2] + j*box[1,2] + k*box[2,2]
-                periodic_shift.append([x,y,z])
-    periodic_shift = np.array(periodic_shift, dtype=disp.dtype)
-    # Create 8 periodically shifted variants for each atom
-    shifted_diffs = diffs[:, np.newaxis, :] + periodic_shift[np.newaxis, :, :]
-    # Find for each atom the periodically shifted variant with lowest
-    # distance
-    # Lowest squared distance -> lowest distance
-    sq_distance = vector_dot(shifted_diffs, shifted_diffs)
-    # for each given non-PBC-aware displacement find the PBC-aware
-    # displacement with the lowest distance
-    disp[:] = shifted_diffs[
-        np.arange(len(shifted_diffs)),
-        np.argmin(sq_distance, axis=1)
-    ]
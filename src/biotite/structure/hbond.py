@@ -16,6 +16,11 @@ from .atoms import AtomArrayStack, stack
 from .celllist import CellList
 
 
+# The maximum number of coordinates per triplet member, that are
+# processed at once in the final distance and angle check
+_MAX_CHUNK_COORD = 1000000
+
+
 def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
           cutoff_dist=2.5, cutoff_angle=120,
           donor_elements=('O', 'N', 'S'), acceptor_elements=('O', 'N', 'S'),
@@ -84,6 +89,11 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
     For example, a nitrogen atom with positive charge could be
     considered as acceptor atom by this method, although this does
     make sense from a chemical perspective.
+
+    If `atoms` has an associated :class:`BondList`, the hydrogen atoms
+    bonded to the donor atoms are taken from it.
+    Otherwise, a hydrogen atom is assigned to a donor atom within
+    1.5 Å in the same residue.
         
     Examples
     --------
@@ -238,39 +248,9 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     donor_mask    &= donor_element_mask
     acceptor_mask &= acceptor_element_mask
     
-    def _get_bonded_hydrogens(array, donor_mask, box, cutoff=1.5):
-        """
-        Helper function to find indices of associated hydrogens in atoms
-        for all donors in atoms[donor_mask].
-        The criterium is that the hydrogen must be in the same residue
-        and the distance must be smaller than the cutoff.
-
-        """
-        coord = array.coord
-        res_id = array.res_id
-        hydrogen_mask = (array.element == "H")
-        
-        donor_hydrogen_mask = np.zeros(len(array), dtype=bool)
-        associated_donor_indices = np.full(len(array), -1, dtype=int)
-
-        donor_indices = np.where(donor_mask)[0]
-        for donor_i in donor_indices:
-            candidate_mask = hydrogen_mask & (res_id == res_id[donor_i])
-            distances = distance(
-                coord[donor_i], coord[candidate_mask], box=box
-            )
-            donor_h_indices = np.where(candidate_mask)[0][distances <= cutoff]
-            for i in donor_h_indices:
-                associated_donor_indices[i] = donor_i
-                donor_hydrogen_mask[i] = True
-        
-        return donor_hydrogen_mask, associated_donor_indices
-            
-
-    # TODO use BondList if available
     first_model_box = box[0] if box is not None else None
     donor_h_mask, associated_donor_indices \
-        = _get_bonded_hydrogens(atoms[0], donor_mask, first_model_box)
+        = _get_bonded_h(atoms[0], donor_mask, first_model_box)
     donor_h_i = np.where(donor_h_mask)[0]
     acceptor_i = np.where(acceptor_mask)[0]
     if len(donor_h_i) == 0 or len(acceptor_i) == 0:
@@ -282,29 +262,48 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     
     # Narrow the amount of possible acceptor to donor-H connections
     # down via the distance cutoff parameter using a cell list
-    # Save in acceptor-to-hydrogen matrix
-    # (true when distance smaller than cutoff)
+    # The candidate pairs of all models are stored as sorted unique
+    # keys 'acceptor_position * len(donor_h_i) + donor_h_position',
+    # referring to positions in 'acceptor_i' and 'donor_h_i'
     coord = atoms.coord
-    possible_bonds = np.zeros(
-        (len(acceptor_i), len(donor_h_i)),
-        dtype=bool
-    )
+    possible_bonds = np.zeros(0, dtype=np.int64)
+    # Keys of the recent models, that are not merged yet
+    new_bonds = []
+    new_bonds_count = 0
     periodic = False if box is None else True
+    cell_list = None
     for model_i in range(atoms.stack_depth()):
         donor_h_coord = coord[model_i, donor_h_mask]
         acceptor_coord = coord[model_i, acceptor_mask]
         box_for_model = box[model_i] if box is not None else None
-        cell_list = CellList(
-            donor_h_coord, cell_size=cutoff_dist,
-            periodic=periodic, box=box_for_model
-        )
-        possible_bonds |= cell_list.get_atoms_in_cells(
-            acceptor_coord, as_mask=True
+        if cell_list is None:
+            cell_list = CellList(
+                donor_h_coord, cell_size=cutoff_dist,
+                periodic=periodic, box=box_for_model
+            )
+        else:
+            # Reuse the cell list from the previous model
+            cell_list.update(donor_h_coord, box=box_for_model)
+        pairs = cell_list.get_pairs(cutoff_dist, acceptor_coord)
+        new_bonds.append(
+            pairs[:, 0].astype(np.int64) * len(donor_h_i) + pairs[:, 1]
         )
-    possible_bonds_i = np.where(possible_bonds)
+        new_bonds_count += len(new_bonds[-1])
+        # Merge the keys of multiple models at once, instead of
+        # merging for each model, but only as long as the unmerged keys
+        # do not exceed the number of unique keys found so far,
+        # so that the memory consumption stays proportional to the
+        # number of candidate pairs
+        if new_bonds_count > max(len(possible_bonds), 2**16):
+            possible_bonds = np.unique(
+                np.concatenate([possible_bonds] + new_bonds)
+            )
+            new_bonds = []
+            new_bonds_count = 0
+    possible_bonds = np.unique(np.concatenate([possible_bonds] + new_bonds))
     # Narrow down
-    acceptor_i = acceptor_i[possible_bonds_i[0]]
-    donor_h_i = donor_h_i[possible_bonds_i[1]]
+    acceptor_i = acceptor_i[possible_bonds // len(donor_h_i)]
+    donor_h_i = donor_h_i[possible_bonds % len(donor_h_i)]
     
     # Build D-H..A triplets
     donor_i = associated_donor_indices[donor_h_i]
@@ -320,12 +319,19 @@ def _hbond(atoms, donor_mask, acceptor_mask,
         dist = distance(donor_h, acceptor, box=box)
         return (theta > cutoff_angle_rad) & (dist <= cutoff_dist)
     
-    hbond_mask = _is_hbond(
-        coord[:, triplets[:,0]],  # donors
-        coord[:, triplets[:,1]],  # donor hydrogens
-        coord[:, triplets[:,2]],  # acceptors
-        box, cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle
-    )
+    # The models are processed in chunks,
+    # to limit the size of the temporary coordinate arrays
+    hbond_mask = np.zeros((atoms.stack_depth(), len(triplets)), dtype=bool)
+    chunk_size = max(1, _MAX_CHUNK_COORD // max(1, len(triplets)))
+    for start in range(0, atoms.stack_depth(), chunk_size):
+        stop = min(start + chunk_size, atoms.stack_depth())
+        hbond_mask[start:stop] = _is_hbond(
+            coord[start:stop, triplets[:,0]],  # donors
+            coord[start:stop, triplets[:,1]],  # donor hydrogens
+            coord[start:stop, triplets[:,2]],  # acceptors
+            box[start:stop] if box is not None else None,
+            cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle
+        )
 
     # Reduce output to contain only triplets counted at least once
     is_counted = hbond_mask.any(axis=0)
@@ -335,6 +341,44 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     return triplets, hbond_mask
 
 
+def _get_bonded_h(array, donor_mask, box, cutoff=1.5):
+    """
+    Helper function to find indices of associated hydrogens in atoms
+    for all donors in atoms[donor_mask].
+    If the atoms have an associated :class:`BondList`, the hydrogen
+    atoms bonded to the donors are used.
+    Otherwise, the criterium is that the hydrogen must be in the same
+    residue and the distance must be smaller than the cutoff.
+    """
+    hydrogen_mask = (array.element == "H")
+    associated_donor_indices = np.full(array.array_length(), -1, dtype=int)
+    
+    if array.bonds is not None:
+        offsets, bonded_i, _ = array.bonds.get_all_bonds()
+        # The atom index for each entry in the CSR arrays
+        atom_i = np.repeat(np.arange(array.array_length()), np.diff(offsets))
+        is_donor_h = hydrogen_mask[atom_i] & donor_mask[bonded_i]
+        associated_donor_indices[atom_i[is_donor_h]] = bonded_i[is_donor_h]
+    
+    elif hydrogen_mask.any() and donor_mask.any():
+        donor_i = np.where(donor_mask)[0]
+        hydrogen_i = np.where(hydrogen_mask)[0]
+        cell_list = CellList(
+            array.coord[hydrogen_i], cell_size=cutoff,
+            periodic=(box is not None), box=box
+        )
+        # Pairs of indices in 'donor_i' and 'hydrogen_i'
+        pairs = cell_list.get_pairs(cutoff, array.coord[donor_i])
+        donor_i = donor_i[pairs[:, 0]]
+        hydrogen_i = hydrogen_i[pairs[:, 1]]
+        same_residue = (array.res_id[donor_i] == array.res_id[hydrogen_i])
+        associated_donor_indices[hydrogen_i[same_residue]] \
+            = donor_i[same_residue]
+    
+    donor_hydrogen_mask = (associated_donor_indices != -1)
+    return donor_hydrogen_mask, associated_donor_indices
+
+
 def hbond_frequency(mask):
     """
     Get the relative frequency of each hydrogen bond in a multi-model
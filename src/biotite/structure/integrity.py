@@ -98,28 +98,39 @@ def check_duplicate_atoms(array):
     
     Returns
     -------
-    duplicate : ndarray, dtype=bool
+    duplicate : ndarray, dtype=int
         Contains the indices of duplicate atoms.
         The first occurence of an atom is not counted as duplicate.
     """
-    duplicates = []
-    annots = [array.get_annotation(category) for category
-              in array.get_annotation_categories()]
-    for i in range(1, array.array_length()):
-        # Start with assumption that all atoms in the array
-        # until index i are duplicates of the atom at index i
-        is_dublicate = np.full(i, True, dtype=bool)
-        for annot in annots:
-            # For each annotation array filter out the atoms until
-            # index i that have an unequal annotation
-            # to the atom at index i 
-            is_dublicate &= (annot[:i] == annot[i])
-        # After checking all annotation arrays,
-        # if there still is any duplicate to the atom at index i,
-        # add i the the list of duplicate atom indices
-        if is_dublicate.any():
-            duplicates.append(i)
-    return np.array(duplicates)
+    length = array.array_length()
+    if length == 0:
+        return np.zeros(0, dtype=int)
+    # Convert each annotation array into integer codes,
+    # where equal annotations have the same code
+    annot_codes = []
+    for category in array.get_annotation_categories():
+        annot = array.get_annotation(category)
+        _, codes = np.unique(annot, return_inverse=True)
+        if annot.dtype.kind == "f":
+            # NaN values are never equal to each other
+            # -> give each one an unique code
+            nan_mask = np.isnan(annot)
+            codes[nan_mask] = len(annot) \
+                            + np.arange(np.count_nonzero(nan_mask))
+        annot_codes.append(codes)
+    if len(annot_codes) == 0:
+        # Without annotations all atoms are equal
+        return np.arange(1, length)
+    annot_codes = np.stack(annot_codes)
+    # Sort atoms by all annotations,
+    # since the sort is stable, the first occurence of an atom comes
+    # first in a group of equal atoms
+    order = np.lexsort(annot_codes[::-1])
+    sorted_codes = annot_codes[:, order]
+    # An atom is a duplicate, if all annotations are equal to the
+    # preceding atom in sorted order
+    is_duplicate = np.all(sorted_codes[:, 1:] == sorted_codes[:, :-1], axis=0)
+    return np.sort(order[1:][is_duplicate])
 
 
 def check_in_box(array):
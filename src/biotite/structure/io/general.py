@@ -9,11 +9,17 @@ general structure files.
 
 __name__ = "biotite.structure.io"
 __author__ = "Patrick Kunzmann"
-__all__ = ["load_structure", "save_structure"]
+__all__ = ["load_structure", "load_structures", "save_structure"]
 
+import os
 import os.path
 import io
+import collections
+import concurrent.futures
+import numpy as np
 from ..atoms import AtomArray, AtomArrayStack
+from ..bonds import BondList
+from ..categorical import CategoricalArray
 
 
 def load_structure(file_path, template=None, **kwargs):
@@ -77,6 +83,15 @@ def load_structure(file_path, template=None, **kwargs):
             return array[0]
         else:
             return array
+    elif suffix == ".bcif":
+        from .pdbx import BinaryCIFFile, get_structure
+        file = BinaryCIFFile.read(file_path)
+        array = get_structure(file, **kwargs)
+        if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
+            # Stack containing only one model -> return as atom array
+            return array[0]
+        else:
+            return array
     elif suffix == ".gro":
         from .gro import GROFile
         file = GROFile.read(file_path)
@@ -128,6 +143,117 @@ def load_structure(file_path, template=None, **kwargs):
         raise ValueError(f"Unknown file format '{suffix}'")
 
 
+def load_structures(file_paths, template=None, workers=None, ordered=True,
+                    **kwargs):
+    """
+    Load multiple structure files in parallel using a pool of worker
+    processes.
+
+    Each file is loaded via :func:`load_structure()` in a worker
+    process.
+    The coordinates, annotation arrays, boxes and bonds of the loaded
+    structures are transferred to the calling process via shared
+    memory, if available (Python >= 3.8), instead of pickling them.
+    Note that this is not zero-copy:
+    In the worker process the arrays are copied into a shared memory
+    block and in the calling process they are copied out of it again,
+    so that the block can be released immediately.
+    
+    Parameters
+    ----------
+    file_paths : iterable object of str
+        The paths to the structure files.
+    template : AtomArray or AtomArrayStack or str, optional
+        Only required when reading trajectory files.
+        See :func:`load_structure()`.
+    workers : int, optional
+        The number of worker processes.
+        By default, the number of processors on the machine is used.
+        If the value is 1, the files are loaded in the calling process.
+    ordered : bool, optional
+        If true, the structures are yielded in the order of
+        `file_paths`.
+        Otherwise, each structure is yielded as soon as it is loaded,
+        together with the index of its file in `file_paths`.
+    kwargs
+        Additional parameters will be passed to
+        :func:`load_structure()`.
+    
+    Yields
+    ------
+    array : AtomArray or AtomArrayStack
+        The structure loaded from the respective file, if `ordered` is
+        true.
+    index, array : tuple(int, AtomArray or AtomArrayStack)
+        The index of the file in `file_paths` and the structure loaded
+        from it, if `ordered` is false.
+    
+    See also
+    --------
+    load_structure
+
+    Notes
+    -----
+    Only a limited number of files is loaded ahead of the consumer,
+    so that the memory consumption stays bounded even for a large
+    number of files.
+    If a file cannot be loaded, the exception raised in the worker
+    process is reraised when the respective structure would be yielded.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    if workers < 1:
+        raise ValueError("At least one worker is required")
+
+    if workers == 1:
+        for i, file_path in enumerate(file_paths):
+            array = load_structure(file_path, template, **kwargs)
+            yield array if ordered else (i, array)
+        return
+
+    # Limit the number of loaded, but not yet yielded structures
+    max_pending = 2 * workers
+    use_shared_memory = _shared_memory is not None
+    file_paths = iter(enumerate(file_paths))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        # Maps each future to the index of its file
+        pending = collections.OrderedDict()
+        try:
+            while True:
+                # Fill up the pending tasks
+                for i, file_path in file_paths:
+                    future = executor.submit(
+                        _load_structure_for_transfer,
+                        file_path, template, use_shared_memory, kwargs
+                    )
+                    pending[future] = i
+                    if len(pending) >= max_pending:
+                        break
+                if len(pending) == 0:
+                    break
+                
+                if ordered:
+                    future, i = pending.popitem(last=False)
+                    yield _receive_structure(future.result())
+                else:
+                    done, _ = concurrent.futures.wait(
+                        pending,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        i = pending.pop(future)
+                        yield i, _receive_structure(future.result())
+        finally:
+            # Release the shared memory of structures that are not
+            # yielded anymore, e.g. due to an early stop of iteration
+            for future in pending:
+                if not future.cancel():
+                    try:
+                        _receive_structure(future.result())
+                    except Exception:
+                        pass
+
+
 def save_structure(file_path, array, **kwargs):
     """
     Save an :class:`AtomArray` or class`AtomArrayStack` to a structure
@@ -164,6 +290,11 @@ def save_structure(file_path, array, **kwargs):
         file = PDBxFile()
         set_structure(file, array, data_block="STRUCTURE", **kwargs)
         file.write(file_path)
+    elif suffix == ".bcif":
+        from .pdbx import BinaryCIFFile, set_structure
+        file = BinaryCIFFile()
+        set_structure(file, array, data_block="STRUCTURE", **kwargs)
+        file.write(file_path)
     elif suffix == ".gro":
         from .gro import GROFile
         file = GROFile()
@@ -202,6 +333,149 @@ def save_structure(file_path, array, **kwargs):
         raise ValueError(f"Unknown file format '{suffix}'")
 
 
+try:
+    from multiprocessing import shared_memory as _shared_memory
+except ImportError:
+    # Shared memory is only supported from Python 3.8 onwards
+    _shared_memory = None
+
+
+def _load_structure_for_transfer(file_path, template, use_shared_memory,
+                                 kwargs):
+    """
+    Load a structure in a worker process of :func:`load_structures()`
+    and prepare it for the transfer to the calling process.
+
+    If `use_shared_memory` is true, the arrays of the structure are
+    moved into a single shared memory block and only the structure
+    without its arrays and the layout of the shared memory block is
+    returned.
+    """
+    array = load_structure(file_path, template, **kwargs)
+    if not use_shared_memory:
+        return array, None, None
+
+    arrays = {"coord": array._coord}
+    if array._box is not None:
+        arrays["box"] = array._box
+    if array._bonds is not None:
+        arrays["bonds"] = array._bonds.as_array()
+    shared_annot = {
+        name: annot for name, annot in array._annot.items()
+        # Object arrays cannot be put into shared memory
+        if annot.dtype != object
+    }
+    for name, annot in shared_annot.items():
+        if isinstance(annot, CategoricalArray):
+            # Transfer the encoded representation,
+            # to retain the categorical annotation
+            arrays["codes:" + name] = annot.codes
+            arrays["vocabulary:" + name] = annot.vocabulary
+        else:
+            arrays["annot:" + name] = annot
+
+    # Assign each array an aligned position in the memory block
+    layout = []
+    offset = 0
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[key] = arr
+        layout.append((key, arr.dtype.str, arr.shape, offset))
+        offset += -(-arr.nbytes // 8) * 8
+    shm = _create_untracked_shared_memory(max(offset, 1))
+    try:
+        for key, dtype, shape, offset in layout:
+            shared_arr = np.ndarray(shape, dtype, shm.buf, offset)
+            shared_arr[...] = arrays[key]
+            del shared_arr
+        name = shm.name
+    finally:
+        shm.close()
+    
+    # Remove the arrays that are transferred via shared memory
+    annot_names = list(array._annot.keys())
+    array._coord = None
+    array._box = None
+    if array._bonds is not None:
+        atom_count = array._bonds.get_atom_count()
+        array._bonds = None
+    else:
+        atom_count = None
+    for annot_name in shared_annot:
+        del array._annot[annot_name]
+    return array, name, (layout, atom_count, annot_names)
+
+
+# The function is looked up by its module name, when it is pickled for
+# the worker processes, but '__name__' is overridden in this module
+_load_structure_for_transfer.__module__ = "biotite.structure.io.general"
+
+
+def _create_untracked_shared_memory(size):
+    """
+    Create a shared memory block, that is not tracked by the resource
+    tracker of the worker process.
+
+    The block is unlinked by the calling process in
+    :func:`_receive_structure()`.
+    Otherwise, the resource tracker of the worker process would
+    consider the block as leaked, when the worker process exits.
+    """
+    try:
+        return _shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError:
+        # The 'track' parameter is only available from Python 3.13 on
+        shm = _shared_memory.SharedMemory(create=True, size=size)
+        if os.name == "posix":
+            # Only POSIX shared memory is registered at the tracker
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _receive_structure(transfer_values):
+    """
+    Reassemble the structure returned by
+    :func:`_load_structure_for_transfer()` in the calling process and
+    release the shared memory.
+    """
+    array, name, layout_info = transfer_values
+    if name is None:
+        return array
+    
+    layout, atom_count, annot_names = layout_info
+    shm = _shared_memory.SharedMemory(name=name)
+    # Maps the names of categorical annotations to their codes and
+    # vocabularies
+    categorical_parts = {}
+    try:
+        for key, dtype, shape, offset in layout:
+            arr = np.ndarray(shape, dtype, shm.buf, offset).copy()
+            if key == "coord":
+                array._coord = arr
+            elif key == "box":
+                array._box = arr
+            elif key == "bonds":
+                array._bonds = BondList(atom_count, arr)
+            else:
+                prefix, annot_name = key.split(":", 1)
+                if prefix == "annot":
+                    array._annot[annot_name] = arr
+                else:
+                    categorical_parts.setdefault(annot_name, {})[prefix] \
+                        = arr
+    finally:
+        shm.close()
+        shm.unlink()
+    for annot_name, parts in categorical_parts.items():
+        array._annot[annot_name] = CategoricalArray._from_codes(
+            parts["codes"], parts["vocabulary"]
+        )
+    # Restore the original order of annotation categories
+    array._annot = {name: array._annot[name] for name in annot_names}
+    return array
+
+
 # Helper function to estimate elements from atom names
 _elements = [elem.upper() for elem in 
 ["H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne", "Na", "Mg",
@@ -359,13 +359,13 @@ def _fill_annotations(int model, array,
                       np.ndarray elements,
                       np.ndarray charges):
     # Get annotation arrays from atom array (stack)
-    cdef np.ndarray chain_id  = array.chain_id
-    cdef np.ndarray res_id    = array.res_id
-    cdef np.ndarray ins_code  = array.ins_code
-    cdef np.ndarray res_name  = array.res_name
-    cdef np.ndarray hetero    = array.hetero
-    cdef np.ndarray atom_name = array.atom_name
-    cdef np.ndarray element   = array.element
+    cdef np.ndarray chain_id  = np.asarray(array.chain_id)
+    cdef np.ndarray res_id    = np.asarray(array.res_id)
+    cdef np.ndarray ins_code  = np.asarray(array.ins_code)
+    cdef np.ndarray res_name  = np.asarray(array.res_name)
+    cdef np.ndarray hetero    = np.asarray(array.hetero)
+    cdef np.ndarray atom_name = np.asarray(array.atom_name)
+    cdef np.ndarray element   = np.asarray(array.element)
     if extra_charge:
         charge = array.charge
 
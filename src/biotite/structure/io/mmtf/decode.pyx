@@ -119,14 +119,24 @@ def _decode_run_length(int32[:] array):
 ctypedef fused PackedType:
     int8
     int16
+    uint8
+    uint16
 def _decode_packed(PackedType[:] array):
     cdef int min_val, max_val
     if PackedType is int8:
         min_val = np.iinfo(np.int8).min
         max_val = np.iinfo(np.int8).max
-    else:
+    elif PackedType is int16:
         min_val = np.iinfo(np.int16).min
         max_val = np.iinfo(np.int16).max
+    else:
+        # Unsigned packing has only an upper limit,
+        # the lower limit is never reached
+        min_val = -1
+        if PackedType is uint8:
+            max_val = np.iinfo(np.uint8).max
+        else:
+            max_val = np.iinfo(np.uint16).max
     cdef int i, j
     cdef int packed_val, unpacked_val
     # Pessimistic size assumption:
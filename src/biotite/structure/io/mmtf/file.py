@@ -29,6 +29,13 @@ class MMTFFile(File, MutableMapping):
     If the dictionary value is an encoded array, the value automatically
     decoded.
     Decoded arrays are always returned as :class:`ndarray` instances.
+
+    An encoded array is decoded, when it is accessed for the first
+    time.
+    The decoded array is cached, so that subsequent accesses of the
+    same field do not need to decode it again.
+    Each access returns a new copy of the cached array, hence
+    modifying the returned :class:`ndarray` does not affect the file.
     
     Examples
     --------
@@ -48,9 +55,11 @@ class MMTFFile(File, MutableMapping):
         self._content = {}
         self._content["mmtfVersion"] = "1.0.0"
         self._content["mmtfProducer"] = "UNKNOWN"
+        # Cache for decoded arrays
+        self._decoded = {}
     
     @classmethod
-    def read(self, file):
+    def read(self, file, fields=None):
         """
         Read a MMTF file.
         
@@ -59,26 +68,45 @@ class MMTFFile(File, MutableMapping):
         file : file-like object or str
             The file to be read.
             Alternatively a file path can be supplied.
+        fields : iterable object of str, optional
+            If given, only these fields are read from the file,
+            all other fields are skipped without unpacking them.
+            This saves time and memory, if only a few fields are
+            required, e.g. the coordinates.
+            By default, all fields are read.
         
         Returns
         -------
         file_object : MMTFFile
             The parsed file.
+        
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_structures, "1l2y.mmtf")
+        >>> mmtf_file = MMTFFile.read(
+        ...     file_name, fields=["xCoordList", "yCoordList", "zCoordList"]
+        ... )
+        >>> print(list(mmtf_file.keys()))
+        ['xCoordList', 'yCoordList', 'zCoordList']
         """
         mmtf_file = MMTFFile()
         # File name
         if isinstance(file, str):
             with open(file, "rb") as f:
-                mmtf_file._content = msgpack.unpackb(
-                    f.read(), use_list=True, raw=False
-                )
+                raw_bytes = f.read()
         # File object
         else:
             if not is_binary(file):
                 raise TypeError("A file opened in 'binary' mode is required")
+            raw_bytes = file.read()
+        if fields is None:
             mmtf_file._content = msgpack.unpackb(
-                file.read(), use_list=True, raw=False
+                raw_bytes, use_list=True, raw=False
             )
+        else:
+            mmtf_file._content = _unpack_fields(raw_bytes, set(fields))
         return mmtf_file
     
     def write(self, file):
@@ -105,6 +133,8 @@ class MMTFFile(File, MutableMapping):
     def __copy_fill__(self, clone):
         super().__copy_fill__(clone)
         clone._content = copy.deepcopy(self._content)
+        # The cache is not copied,
+        # to prevent sharing the decoded arrays between both objects
     
     def get_codec(self, key):
         """
@@ -179,8 +209,12 @@ class MMTFFile(File, MutableMapping):
              + struct.pack(">i", param) \
              + raw_bytes
         self._content[key] = data
+        self._decoded.pop(key, None)
     
     def __getitem__(self, key):
+        decoded = self._decoded.get(key)
+        if decoded is not None:
+            return decoded.copy()
         data = self._content[key]
         if isinstance(data, bytes) and data[0] == 0:
             # MMTF specific format -> requires decoding
@@ -188,7 +222,11 @@ class MMTFFile(File, MutableMapping):
             length    = struct.unpack(">i", data[4:8 ])[0]
             param     = struct.unpack(">i", data[8:12])[0]
             raw_bytes = data[12:]
-            return decode_array(codec, raw_bytes, param)
+            decoded = decode_array(codec, raw_bytes, param)
+            self._decoded[key] = decoded
+            # Return a copy,
+            # so that modifications do not affect the cache
+            return decoded.copy()
         else:
             return data
     
@@ -197,9 +235,11 @@ class MMTFFile(File, MutableMapping):
             raise TypeError("Arrays that need to be encoded must be addeed "
                             "via 'set_array()'")
         self._content[key] = item
+        self._decoded.pop(key, None)
     
     def __delitem__(self, key):
         del self._content[key]
+        self._decoded.pop(key, None)
     
     def __iter__(self):
         return self._content.__iter__()
@@ -211,6 +251,24 @@ class MMTFFile(File, MutableMapping):
         return item in self._content
 
 
+def _unpack_fields(raw_bytes, fields):
+    """
+    Unpack only the given fields from the top-level *MessagePack* map.
+    """
+    unpacker = msgpack.Unpacker(
+        use_list=True, raw=False, max_buffer_size=max(len(raw_bytes), 1)
+    )
+    unpacker.feed(raw_bytes)
+    content = {}
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        if key in fields:
+            content[key] = unpacker.unpack()
+        else:
+            unpacker.skip()
+    return content
+
+
 def _encode_numpy(item):
     """
     Convert NumPy scalar types to native Python types,
@@ -6,6 +6,8 @@ __name__ = "biotite.structure.io.npz"
 __author__ = "Patrick Kunzmann"
 __all__ = ["NpzFile"]
 
+import struct
+import zipfile
 import numpy as np
 from ...atoms import Atom, AtomArray, AtomArrayStack
 from ...bonds import BondList
@@ -22,6 +24,12 @@ class NpzFile(File):
     :func:`save()`/:func:`load()`
     method. This format offers the fastest I/O operations and completely
     preserves the content all atom annotation arrays.
+
+    As the arrays are stored uncompressed, they can also be
+    memory-mapped when reading the file.
+    In combination with the selection of models and annotations in
+    :func:`get_structure()`, only the required parts of the file are
+    read from disk.
     
     Examples
     --------
@@ -35,6 +43,16 @@ class NpzFile(File):
     >>> file = NpzFile()
     >>> file.set_structure(array_stack_mod)
     >>> file.write(os.path.join(path_to_directory, "1l2y_mod.npz"))
+
+    Read only the coordinates of a few models from a memory-mapped
+    file:
+
+    >>> file = NpzFile.read(
+    ...     os.path.join(path_to_directory, "1l2y_mod.npz"), mmap=True
+    ... )
+    >>> coord = file.get_coord(models=slice(0, 3))
+    >>> print(coord.shape)
+    (3, 304, 3)
     
     """
     
@@ -45,11 +63,12 @@ class NpzFile(File):
     def __copy_fill__(self, clone):
         super().__copy_fill__(clone)
         if self._data_dict is not None:
+            clone._data_dict = {}
             for key, value in self._data_dict.items():
                 clone._data_dict[key] = np.copy(value)
     
     @classmethod
-    def read(cls, file):
+    def read(cls, file, mmap=False):
         """
         Read a NPZ file.
         
@@ -58,6 +77,16 @@ class NpzFile(File):
         file : file-like object or str
             The file to be read.
             Alternatively a file path can be supplied.
+        mmap : bool, optional
+            If true, the arrays in the file are not read into memory,
+            but they are memory-mapped in copy-on-write mode instead.
+            Hence, only the parts of the arrays that are actually
+            accessed are read from disk.
+            Modifications of the returned structure are kept in memory
+            and do not affect the file.
+            Arrays that are stored compressed are read into memory
+            nevertheless.
+            This option requires a file path.
         
         Returns
         -------
@@ -65,8 +94,12 @@ class NpzFile(File):
             The parsed file.
         """
         npz_file = NpzFile()
+        if mmap:
+            if not isinstance(file, str):
+                raise TypeError("Memory-mapping requires a file path")
+            npz_file._data_dict = _map_arrays(file)
         # File name
-        if isinstance(file, str):
+        elif isinstance(file, str):
             with open(file, "rb") as f:
                 npz_file._data_dict = dict(np.load(f, allow_pickle=False))
         # File object
@@ -94,40 +127,97 @@ class NpzFile(File):
                 raise TypeError("A file opened in 'binary' mode is required")
             np.savez(file, **self._data_dict)
     
-    def get_structure(self):
+    def get_structure(self, models=None, annotations=None):
         """
         Get an :class:`AtomArray` or :class:`AtomArrayStack` from the
         file.
         
         If this method returns an array or stack depends on which type
         of object was used when the file was written.
+
+        Parameters
+        ----------
+        models : int or slice or ndarray, dtype=int or dtype=bool, optional
+            If the file contains an :class:`AtomArrayStack`, only the
+            models selected by this index are read, i.e. the result is
+            equal to indexing the :class:`AtomArrayStack`:
+            An integer gives an :class:`AtomArray`, a slice or index
+            array gives an :class:`AtomArrayStack`.
+            By default, all models are read.
+        annotations : iterable object of str, optional
+            If given, only these annotation categories are read from the
+            file.
+            Mandatory annotation categories that are not included,
+            contain default values.
+            By default, all annotation categories are read.
         
         Returns
         -------
         array : AtomArray or AtomArrayStack
             The array or stack contained in this file.
+        
+        See also
+        --------
+        get_coord
         """
         if self._data_dict is None:
             raise ValueError("The structure of this file "
                              "has not been loaded or set yet")
-        coord = self._data_dict["coord"]
+        coord = self.get_coord(models)
         # The type of the structure is determined by the dimensionality
         # of the 'coord' field
         if len(coord.shape) == 3:
             array = AtomArrayStack(coord.shape[0], coord.shape[1])
         else:
             array = AtomArray(coord.shape[0])
+        if annotations is not None:
+            annotations = set(annotations)
         
         for key, value in self._data_dict.items():
             if key == "coord":
-                array.coord = value
+                array.coord = coord
             elif key == "bonds":
-                array.bonds = BondList(array.array_length(), value)
+                array.bonds = BondList(array.array_length(), np.array(value))
             elif key == "box":
+                if models is not None and value.ndim == 3:
+                    value = value[models]
                 array.box = value
-            else:
+            elif annotations is None or key in annotations:
                 array.set_annotation(key, value)
         return array
+
+    def get_coord(self, models=None):
+        """
+        Get only the coordinates from the file.
+
+        Parameters
+        ----------
+        models : int or slice or ndarray, dtype=int or dtype=bool, optional
+            If the file contains an :class:`AtomArrayStack`, only the
+            coordinates of the models selected by this index are read.
+            By default, all models are read.
+
+        Returns
+        -------
+        coord : ndarray, shape=(m,n,3) or shape=(n,3), dtype=float
+            The coordinates.
+        
+        See also
+        --------
+        get_structure
+        """
+        if self._data_dict is None:
+            raise ValueError("The structure of this file "
+                             "has not been loaded or set yet")
+        coord = self._data_dict["coord"]
+        if models is not None:
+            if coord.ndim != 3:
+                raise TypeError(
+                    "The file contains an AtomArray, "
+                    "models can only be selected for an AtomArrayStack"
+                )
+            coord = coord[models]
+        return coord
         
     def set_structure(self, array):
         """
@@ -146,4 +236,49 @@ class NpzFile(File):
         if array.box is not None:
             self._data_dict["box"] = np.copy(array.box)
         for annot in array.get_annotation_categories():
-            self._data_dict[annot] = np.copy(array.get_annotation(annot))
\ No newline at end of file
+            self._data_dict[annot] = np.copy(array.get_annotation(annot))
+
+
+def _map_arrays(file_name):
+    """
+    Memory-map each array in an uncompressed NPZ file.
+    """
+    data_dict = {}
+    with zipfile.ZipFile(file_name) as archive, open(file_name, "rb") as f:
+        for info in archive.infolist():
+            key = info.filename
+            if key.endswith(".npy"):
+                key = key[:-4]
+            if info.compress_type != zipfile.ZIP_STORED:
+                # Compressed arrays cannot be mapped
+                with archive.open(info) as member:
+                    data_dict[key] = np.load(member, allow_pickle=False)
+                continue
+            # The array data starts after the local file header,
+            # which has a fixed size of 30 bytes
+            # plus the variable length file name and extra field
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_length, extra_length = struct.unpack(
+                "<HH", local_header[26:30]
+            )
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            # The array data starts after the NPY header
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype \
+                    = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype \
+                    = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError("Arrays of objects cannot be mapped")
+            if np.prod(shape) == 0:
+                # Empty arrays cannot be mapped
+                data_dict[key] = np.zeros(shape, dtype=dtype)
+            else:
+                data_dict[key] = np.memmap(
+                    file_name, dtype=dtype, mode="c", offset=f.tell(),
+                    shape=shape, order="F" if fortran_order else "C"
+                )
+    return data_dict
@@ -9,12 +9,12 @@ __all__ = ["PDBFile"]
 import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from ...box import vectors_from_unitcell, unitcell_from_vectors
-from ....file import TextFile, InvalidFileError
+from ....file import TextFile, InvalidFileError, is_text
 from ..general import _guess_element as guess_element
 from ...error import BadStructureError
 from ...filter import filter_first_altloc, filter_highest_occupancy_altloc
-from .hybrid36 import encode_hybrid36, decode_hybrid36, max_hybrid36_number
-import copy
+from .hybrid36 import encode_hybrid36_array, decode_hybrid36_array, \
+                      max_hybrid36_number
 from warnings import warn
 
 
@@ -152,18 +152,7 @@ class PDBFile(TextFile):
         >>> print(new_stack == atom_array_stack)
         True
         """
-        # Line indices where a new model starts
-        model_start_i = np.array([i for i in range(len(self.lines))
-                                  if self.lines[i].startswith("MODEL")],
-                                 dtype=int)
-        # Line indices with ATOM or HETATM records
-        atom_line_i = np.array([i for i in range(len(self.lines)) if
-                                self.lines[i].startswith(("ATOM", "HETATM"))],
-                                dtype=int)
-        # Structures containing only one model may omit MODEL record
-        # In these cases model starting index is set to 0
-        if len(model_start_i) == 0:
-            model_start_i = np.array([0])
+        model_start_i, atom_line_i = self._index_models_and_atoms()
         
         if model is None:
             depth = len(model_start_i)
@@ -171,48 +160,15 @@ class PDBFile(TextFile):
             coord_i = atom_line_i
         
         else:
-            last_model = len(model_start_i)
-            if model == 0:
-                raise ValueError("The model index must not be 0")
-            # Negative models mean index starting from last model
-            model = last_model + model + 1 if model < 0 else model
-
-            if model < last_model:
-                line_filter = ( ( atom_line_i >= model_start_i[model-1] ) &
-                                ( atom_line_i <  model_start_i[model  ] ) )
-            elif model == last_model:
-                line_filter = (atom_line_i >= model_start_i[model-1])
-            else:
-                raise ValueError(
-                    f"The file has {last_model} models, "
-                    f"the given model {model} does not exist"
-                )
-            coord_i = atom_line_i[line_filter]
-            length = len(coord_i)
+            coord_i = self._get_model_line_indices(
+                model, model_start_i, atom_line_i
+            )
         
         # Fill in coordinates
+        coord = _parse_coord(self._get_atom_records(coord_i))
         if model is None:
-            coord = np.zeros((depth, length, 3), dtype=np.float32)
-            m = 0
-            i = 0
-            for line_i in atom_line_i:
-                if m < len(model_start_i)-1 and line_i > model_start_i[m+1]:
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                coord[m,i,0] = float(line[30:38])
-                coord[m,i,1] = float(line[38:46])
-                coord[m,i,2] = float(line[46:54])
-                i += 1
-            return coord
-        
+            return coord.reshape(depth, length, 3)
         else:
-            coord = np.zeros((length, 3), dtype=np.float32)
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                coord[i,0] = float(line[30:38])
-                coord[i,1] = float(line[38:46])
-                coord[i,2] = float(line[46:54])
             return coord
 
 
@@ -256,18 +212,7 @@ class PDBFile(TextFile):
         array : AtomArray or AtomArrayStack
             The return type depends on the `model` parameter.
         """
-        # Line indices where a new model starts
-        model_start_i = np.array([i for i in range(len(self.lines))
-                                  if self.lines[i].startswith(("MODEL"))],
-                                 dtype=int)
-        # Line indices with ATOM or HETATM records
-        atom_line_i = np.array([i for i in range(len(self.lines)) if
-                                self.lines[i].startswith(("ATOM", "HETATM"))],
-                               dtype=int)
-        # Structures containing only one model may omit MODEL record
-        # In these cases model starting index is set to 0
-        if len(model_start_i) == 0:
-            model_start_i = np.array([0])
+        model_start_i, atom_line_i = self._index_models_and_atoms()
         
         if model is None:
             depth = len(model_start_i)
@@ -284,87 +229,56 @@ class PDBFile(TextFile):
             coord_i = atom_line_i
         
         else:
-            last_model = len(model_start_i)
-            if model == 0:
-                raise ValueError("The model index must not be 0")
-            # Negative models mean index starting from last model
-            model = last_model + model + 1 if model < 0 else model
-
-            if model < last_model:
-                line_filter = ( ( atom_line_i >= model_start_i[model-1] ) &
-                                ( atom_line_i <  model_start_i[model  ] ) )
-            elif model == last_model:
-                line_filter = (atom_line_i >= model_start_i[model-1])
-            else:
-                raise ValueError(
-                    f"The file has {last_model} models, "
-                    f"the given model {model} does not exist"
-                )
-            annot_i = coord_i = atom_line_i[line_filter]
+            annot_i = coord_i = self._get_model_line_indices(
+                model, model_start_i, atom_line_i
+            )
             array = AtomArray(len(coord_i))
         
-        # Create mandatory and optional annotation arrays
-        chain_id  = np.zeros(array.array_length(), array.chain_id.dtype)
-        res_id    = np.zeros(array.array_length(), array.res_id.dtype)
-        ins_code  = np.zeros(array.array_length(), array.ins_code.dtype)
-        res_name  = np.zeros(array.array_length(), array.res_name.dtype)
-        hetero    = np.zeros(array.array_length(), array.hetero.dtype)
-        atom_name = np.zeros(array.array_length(), array.atom_name.dtype)
-        element   = np.zeros(array.array_length(), array.element.dtype)
-
-        atom_id_raw = np.zeros(array.array_length(), "U5")
-        charge_raw  = np.zeros(array.array_length(), "U2")
-        occupancy = np.zeros(array.array_length(), float)
-        b_factor  = np.zeros(array.array_length(), float)
-
-        altloc_id = np.zeros(array.array_length(), dtype="U1")
-
-        # Fill annotation array
-        # i is index in array, line_i is line index
-        for i, line_i in enumerate(annot_i):
-            line = self.lines[line_i]
-            
-            chain_id[i] = line[21].upper().strip()
-            res_id[i] = decode_hybrid36(line[22:26])
-            ins_code[i] = line[26].strip()
-            res_name[i] = line[17:20].strip()
-            hetero[i] = (False if line[0:4] == "ATOM" else True)
-            atom_name[i] = line[12:16].strip()
-            element[i] = line[76:78].strip()
-
-            altloc_id[i] = line[16]
-
-            atom_id_raw[i] = line[6:11]
-            charge_raw[i] = line[78:80]
-            occupancy[i] = float(line[54:60].strip())
-            b_factor[i] = float(line[60:66].strip())
+        # Parse all annotation columns at once
+        records = self._get_atom_records(annot_i)
         
         # Add annotation arrays to atom array (stack)
-        array.chain_id = chain_id
-        array.res_id = res_id
-        array.ins_code = ins_code
-        array.res_name = res_name
-        array.hetero = hetero
-        array.atom_name = atom_name
-        array.element = element
+        array.chain_id = np.char.strip(np.char.upper(
+            _get_column(records, "chain_id").astype(array.chain_id.dtype)
+        ))
+        array.res_id = _decode_hybrid36_column(
+            _get_column(records, "res_id")
+        )
+        array.ins_code = np.char.strip(
+            _get_column(records, "ins_code").astype(array.ins_code.dtype)
+        )
+        array.res_name = np.char.strip(
+            _get_column(records, "res_name").astype(array.res_name.dtype)
+        )
+        array.hetero = ~np.char.startswith(
+            _get_column(records, "hetero"), b"ATOM"
+        )
+        array.atom_name = np.char.strip(
+            _get_column(records, "atom_name").astype(array.atom_name.dtype)
+        )
+        array.element = np.char.strip(
+            _get_column(records, "element").astype(array.element.dtype)
+        )
+
+        altloc_id = _get_column(records, "alt_loc").astype("U1")
+        occupancy = np.char.strip(_get_column(records, "occupancy")) \
+                    .astype(float)
 
         for field in (extra_fields if extra_fields is not None else []):
             if field == "atom_id":
-                array.set_annotation("atom_id", np.array(
-                    [decode_hybrid36(raw_id.item()) for raw_id in atom_id_raw],
-                    dtype=int
+                array.set_annotation("atom_id", _decode_hybrid36_column(
+                    _get_column(records, "atom_id")
                 ))
             elif field == "charge":
-                array.set_annotation("charge", np.array(
-                    [0 if raw_number == " " else
-                     (-float(raw_number) if sign == "-" else float(raw_number))
-                     for raw_number, sign in charge_raw],
-                    dtype=int
+                array.set_annotation("charge", _parse_charge(
+                    _get_column(records, "charge")
                 ))
             elif field == "occupancy":
                 array.set_annotation("occupancy", occupancy)
             elif field == "b_factor":
-                array.set_annotation("b_factor", b_factor)
+                array.set_annotation("b_factor", np.char.strip(
+                    _get_column(records, "temp_f")
+                ).astype(float))
             else:
                 raise ValueError(f"Unknown extra field: {field}")
 
@@ -380,25 +294,13 @@ class PDBFile(TextFile):
             warn("{} elements were guessed from atom_name.".format(rep_num))
         
         # Fill in coordinates
+        coord = _parse_coord(self._get_atom_records(coord_i))
         if isinstance(array, AtomArray):
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                array.coord[i,0] = float(line[30:38])
-                array.coord[i,1] = float(line[38:46])
-                array.coord[i,2] = float(line[46:54])
-                
+            array.coord = coord
         elif isinstance(array, AtomArrayStack):
-            m = 0
-            i = 0
-            for line_i in atom_line_i:
-                if m < len(model_start_i)-1 and line_i > model_start_i[m+1]:
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                array.coord[m,i,0] = float(line[30:38])
-                array.coord[m,i,1] = float(line[38:46])
-                array.coord[m,i,2] = float(line[46:54])
-                i += 1
+            array.coord = coord.reshape(
+                array.stack_depth(), array.array_length(), 3
+            )
 
         # Fill in box vectors
         # PDB does not support changing box dimensions. CRYST1 is a one-time
@@ -462,128 +364,32 @@ class PDBFile(TextFile):
         hybrid36: bool, optional
             Defines wether the file should be written in hybrid-36
             format.
+        
+        See also
+        --------
+        write_iter
         """
-        annot_categories = array.get_annotation_categories()
-        hetero = ["ATOM" if e == False else "HETATM" for e in array.hetero]
-        # Check for optional annotation categories
-        if "atom_id" in annot_categories:
-            atom_id = array.atom_id
-        else:
-            atom_id = np.arange(1, array.array_length()+1)
-        if "b_factor" in annot_categories:
-            b_factor = array.b_factor
-        else:
-            b_factor = np.zeros(array.array_length())
-        if "occupancy" in annot_categories:
-            occupancy = array.occupancy
-        else:
-            occupancy = np.ones(array.array_length())
-        if "charge" in annot_categories:
-            charge = [ "+"+str(np.abs(charge)) if charge > 0 else
-                      ("-"+str(np.abs(charge)) if charge < 0 else
-                       "")
-                      for charge in array.get_annotation("charge")]
-        else:
-            charge = [""] * array.array_length()
-
-        # Do checks on atom array (stack)
-        if hybrid36:
-            max_atoms, max_residues \
-                = max_hybrid36_number(5), max_hybrid36_number(4)
-        else:
-            max_atoms, max_residues = 99999, 9999
-        if array.array_length() > max_atoms:
-            warn(f"More then {max_atoms:,} atoms per model")
-        if (array.res_id > max_residues).any():
-            warn(f"Residue IDs exceed {max_residues:,}")
+        # The entire information, but the coordinates,
+        # is equal for each model
+        # Therefore template records are created
+        # which are afterwards applied for each model
+        template = _get_record_template(array, hybrid36)
         if np.isnan(array.coord).any():
             raise ValueError("Coordinates contain 'NaN' values")
 
-        if hybrid36:
-            pdb_atom_id = [encode_hybrid36(i, 5).rjust(5) for i in atom_id]
-            pdb_res_id = [encode_hybrid36(i, 4).rjust(4) for i in array.res_id]
-        else:
-            # Atom IDs are supported up to 99999,
-            # but negative IDs are also possible
-            pdb_atom_id = np.where(
-                atom_id > 0,
-                ((atom_id - 1) % 99999) + 1,
-                atom_id
-            )
-            pdb_atom_id = ["{:>5d}".format(i) for i in pdb_atom_id]
-            # Residue IDs are supported up to 9999,
-            # but negative IDs are also possible
-            pdb_res_id = np.where(
-                array.res_id > 0,
-                ((array.res_id - 1) % 9999) + 1,
-                array.res_id
-            )
-            pdb_res_id = ["{:>4d}".format(i) for i in pdb_res_id]
-
         if isinstance(array, AtomArray):
-            self.lines = [None] * array.array_length()
-            for i in range(array.array_length()):
-                self.lines[i] = ("{:6}".format(hetero[i]) + 
-                                  pdb_atom_id[i] +
-                                  " " +
-                                  "{:4}".format(array.atom_name[i]) +
-                                  " " +
-                                  "{:3}".format(array.res_name[i]) +
-                                  " " +
-                                  "{:1}".format(array.chain_id[i]) +
-                                  pdb_res_id[i] +
-                                  "{:1}".format(array.ins_code[i]) +
-                                  (" " * 3) +
-                                  "{:>8.3f}".format(array.coord[i,0]) +
-                                  "{:>8.3f}".format(array.coord[i,1]) +
-                                  "{:>8.3f}".format(array.coord[i,2]) +
-                                  "{:>6.2f}".format(occupancy[i]) +
-                                  "{:>6.3f}".format(b_factor[i]) +
-                                  (" " * 10) + 
-                                  "{:2}".format(array.element[i]) +
-                                  "{:2}".format(charge[i])
-                                 )
+            self.lines = _records_to_lines(
+                _set_record_coord(template, array.coord)
+            )
         
         elif isinstance(array, AtomArrayStack):
             self.lines = []
-
-            # The entire information, but the coordinates,
-            # is equal for each model
-            # Therefore template lines are created
-            # which are afterwards applied for each model
-            templines = [None] * array.array_length()
-            for i in range(array.array_length()):
-                templines[i] = ("{:6}".format(hetero[i]) + 
-                                 pdb_atom_id[i] +
-                                 " " +
-                                 "{:4}".format(array.atom_name[i]) +
-                                 " " +
-                                 "{:3}".format(array.res_name[i]) +
-                                 " " +
-                                 "{:1}".format(array.chain_id[i]) +
-                                 pdb_res_id[i] +
-                                 "{:1}".format(array.ins_code[i]) +
-                                 (" " * 27) +
-                                 "{:>6.2f}".format(occupancy[i]) +
-                                 "{:>6.3f}".format(b_factor[i]) +
-                                 (" " * 10) +
-                                 "{:2}".format(array.element[i]) +
-                                 "{:2}".format(charge[i])
-                                )
             for i in range(array.stack_depth()):
                 #Fill in coordinates for each model
                 self.lines.append("{:5}{:>9d}".format("MODEL", i+1))
-                modellines = copy.copy(templines)
-                for j, line in enumerate(modellines):
-                    # Insert coordinates
-                    line = (line[:30]
-                            + "{:>8.3f}{:>8.3f}{:>8.3f}".format(
-                                    array.coord[i,j,0],
-                                    array.coord[i,j,1],
-                                    array.coord[i,j,2])
-                            + line[54:] )
-                    modellines[j] = line
-                self.lines.extend(modellines)
+                self.lines.extend(_records_to_lines(
+                    _set_record_coord(template, array.coord[i])
+                ))
                 self.lines.append("ENDMDL")
 
         # prepend a single CRYST1 record if we have box information
@@ -591,35 +397,428 @@ class PDBFile(TextFile):
             box = array.box
             if len(box.shape) == 3:
                 box = box[0]
-            unitcell = unitcell_from_vectors(box)
-            self.lines.insert(0, "CRYST1" +
-                              "{:>9.3f}".format(unitcell[0]) +
-                              "{:>9.3f}".format(unitcell[1]) +
-                              "{:>9.3f}".format(unitcell[2]) +
-                              "{:>7.2f}".format(np.rad2deg(unitcell[3])) +
-                              "{:>7.2f}".format(np.rad2deg(unitcell[4])) +
-                              "{:>7.2f}".format(np.rad2deg(unitcell[5])) +
-                              " P 1           1")
+            self.lines.insert(0, _get_cryst1_line(box))
+    
+
+    @staticmethod
+    def write_iter(file, models, hybrid36=False):
+        """
+        Write multiple models into a PDB file, one after another.
+
+        In contrast to :func:`set_structure()` followed by
+        :func:`write()`, each model is written directly to the file,
+        so the models do not need to be held in memory at once.
+        Hence, the models can be given as generator, e.g. from
+        :func:`TrajectoryFile.read_iter_structure()`.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively a file path can be supplied.
+        models : iterable object of AtomArray
+            The models to be written.
+            The annotations are taken from the first model, all other
+            models must have the same number of atoms.
+            Likewise, the *CRYST1* record is taken from the box of the
+            first model.
+        hybrid36: bool, optional
+            Defines wether the file should be written in hybrid-36
+            format.
+        
+        See also
+        --------
+        set_structure
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "1l2y_mod.pdb")
+        >>> PDBFile.write_iter(file_name, atom_array_stack)
+        >>> print(PDBFile.read(file_name).get_model_count())
+        38
+        """
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                PDBFile._write_models(f, models, hybrid36)
+        else:
+            if not is_text(file):
+                raise TypeError("A file opened in 'text' mode is required")
+            PDBFile._write_models(file, models, hybrid36)
+    
+
+    @staticmethod
+    def _write_models(file, models, hybrid36):
+        template = None
+        for i, model in enumerate(models):
+            if template is None:
+                template = _get_record_template(model, hybrid36)
+                if model.box is not None:
+                    file.write(_get_cryst1_line(model.box) + "\n")
+            elif model.array_length() != len(template):
+                raise IndexError(
+                    f"Model {i+1} has {model.array_length()} atoms, "
+                    f"but model 1 has {len(template)} atoms, must be equal"
+                )
+            if np.isnan(model.coord).any():
+                raise ValueError("Coordinates contain 'NaN' values")
+            file.write("{:5}{:>9d}\n".format("MODEL", i+1))
+            file.write(
+                _set_record_coord(template, model.coord).tobytes()
+                .decode("ascii")
+            )
+            file.write("ENDMDL\n")
+    
+
+    def _index_models_and_atoms(self):
+        """
+        Get the line indices where a new model starts and the line
+        indices of *ATOM* and *HETATM* records.
+        """
+        # Only the record name is relevant,
+        # which is given by the first 6 characters
+        record_names = np.array([line[:6] for line in self.lines], dtype="U6")
+        # Compare the record names character-wise
+        record_chars = record_names.view("U1").reshape(-1, 6)
+        # Line indices where a new model starts
+        model_start_i = np.where(_starts_with(record_chars, "MODEL"))[0]
+        # Line indices with ATOM or HETATM records
+        atom_line_i = np.where(
+            _starts_with(record_chars, "ATOM") |
+            _starts_with(record_chars, "HETATM")
+        )[0]
+        # Structures containing only one model may omit MODEL record
+        # In these cases model starting index is set to 0
+        if len(model_start_i) == 0:
+            model_start_i = np.array([0])
+        return model_start_i, atom_line_i
+    
+
+    def _get_model_line_indices(self, model, model_start_i, atom_line_i):
+        """
+        Get the line indices of *ATOM* and *HETATM* records
+        of the given model.
+        """
+        last_model = len(model_start_i)
+        if model == 0:
+            raise ValueError("The model index must not be 0")
+        # Negative models mean index starting from last model
+        model = last_model + model + 1 if model < 0 else model
+
+        if model < last_model:
+            line_filter = ( ( atom_line_i >= model_start_i[model-1] ) &
+                            ( atom_line_i <  model_start_i[model  ] ) )
+        elif model == last_model:
+            line_filter = (atom_line_i >= model_start_i[model-1])
+        else:
+            raise ValueError(
+                f"The file has {last_model} models, "
+                f"the given model {model} does not exist"
+            )
+        return atom_line_i[line_filter]
+    
+
+    def _get_atom_records(self, line_i):
+        """
+        Get the given lines as 2D array of ASCII characters
+        with shape *(n,80)*, one row for each line.
+
+        Shorter lines are padded with spaces.
+        The columns of the fixed-width format can then be parsed for
+        all lines at once via :func:`_get_column()`.
+        """
+        lines = self.lines
+        text = "".join([lines[i][:80].ljust(80) for i in line_i])
+        # Non-ASCII characters are replaced by a single character
+        # to retain the fixed line width
+        buffer = text.encode("ascii", errors="replace")
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 80)
+    
 
     def _get_model_length(self, model_start_i, atom_line_i):
         """
         Determine length of models and check that all models
         have equal length.
         """
-        n_models = len(model_start_i)
-        length = None
-        for model_i in range(len(model_start_i)):
-            model_start = model_start_i[model_i]
-            model_stop = model_start_i[model_i+1] if model_i+1 < n_models \
-                            else len(self.lines)
-            model_length = np.count_nonzero(
-                (atom_line_i >= model_start) & (atom_line_i < model_stop)
+        model_stops = np.append(model_start_i[1:], len(self.lines))
+        model_lengths = np.searchsorted(atom_line_i, model_stops) \
+                      - np.searchsorted(atom_line_i, model_start_i)
+        length = model_lengths[0]
+        invalid_models = np.where(model_lengths != length)[0]
+        if len(invalid_models) > 0:
+            model_i = invalid_models[0]
+            raise InvalidFileError(
+                f"Model {model_i+1} has {model_lengths[model_i]} atoms, "
+                f"but model 1 has {length} atoms, must be equal"
             )
-            if length is None:
-                length = model_length
-            if model_length != length:
-                raise InvalidFileError(
-                    f"Model {model_i+1} has {model_length} atoms, "
-                    f"but model 1 has {length} atoms, must be equal"
+        return length
+
+
+def _get_record_template(array, hybrid36):
+    """
+    Create the *ATOM* and *HETATM* records for the given atom array
+    (stack) as 2D array of ASCII characters with shape *(n,81)*,
+    including the terminal line break.
+
+    The coordinate columns are left blank.
+    """
+    length = array.array_length()
+    annot_categories = array.get_annotation_categories()
+    # Check for optional annotation categories
+    if "atom_id" in annot_categories:
+        atom_id = array.atom_id
+    else:
+        atom_id = np.arange(1, length+1)
+    if "b_factor" in annot_categories:
+        b_factor = array.b_factor
+    else:
+        b_factor = np.zeros(length)
+    if "occupancy" in annot_categories:
+        occupancy = array.occupancy
+    else:
+        occupancy = np.ones(length)
+    if "charge" in annot_categories:
+        charge = array.charge
+    else:
+        charge = np.zeros(length, dtype=int)
+
+    # Do checks on atom array (stack)
+    if hybrid36:
+        max_atoms, max_residues \
+            = max_hybrid36_number(5), max_hybrid36_number(4)
+    else:
+        max_atoms, max_residues = 99999, 9999
+    if length > max_atoms:
+        warn(f"More then {max_atoms:,} atoms per model")
+    if (array.res_id > max_residues).any():
+        warn(f"Residue IDs exceed {max_residues:,}")
+
+    records = np.full((length, 81), ord(" "), dtype=np.uint8)
+    records[:, 80] = ord("\n")
+    records[:, 0:6] = np.where(
+        array.hetero[:, np.newaxis],
+        np.frombuffer(b"HETATM", dtype=np.uint8),
+        np.frombuffer(b"ATOM  ", dtype=np.uint8)
+    )
+    if hybrid36:
+        records[:, 6:11] = encode_hybrid36_array(atom_id, 5) \
+                           .view(np.uint8).reshape(-1, 5)
+        records[:, 22:26] = encode_hybrid36_array(array.res_id, 4) \
+                            .view(np.uint8).reshape(-1, 4)
+    else:
+        # Atom IDs are supported up to 99999,
+        # but negative IDs are also possible
+        records[:, 6:11] = _format_number_column(np.where(
+            atom_id > 0, ((atom_id - 1) % 99999) + 1, atom_id
+        ), 5)
+        # Residue IDs are supported up to 9999,
+        # but negative IDs are also possible
+        records[:, 22:26] = _format_number_column(np.where(
+            array.res_id > 0, ((array.res_id - 1) % 9999) + 1, array.res_id
+        ), 4)
+    records[:, 12:16] = _format_string_column(array.atom_name, 4)
+    records[:, 17:20] = _format_string_column(array.res_name, 3)
+    records[:, 21:22] = _format_string_column(array.chain_id, 1)
+    records[:, 26:27] = _format_string_column(array.ins_code, 1)
+    records[:, 54:60] = _format_number_column(occupancy, 6, 2)
+    records[:, 60:66] = _format_number_column(b_factor, 6, 3)
+    records[:, 76:78] = _format_string_column(array.element, 2)
+    # Charges are written as e.g. '2-', uncharged atoms are left blank
+    if (np.abs(charge) > 9).any():
+        raise ValueError("Only charges between -9 and 9 are supported")
+    has_charge = (charge != 0)
+    records[has_charge, 78] = np.abs(charge[has_charge]) + ord("0")
+    records[has_charge, 79] = np.where(
+        charge[has_charge] > 0, ord("+"), ord("-")
+    )
+    return records
+
+
+def _set_record_coord(template, coord):
+    """
+    Fill the coordinate columns of the record template.
+    """
+    records = template.copy()
+    start = _atom_records["coord_x"][0]
+    for dim in range(3):
+        records[:, start + 8*dim : start + 8*(dim+1)] \
+            = _format_number_column(coord[:, dim], 8, 3)
+    return records
+
+
+def _records_to_lines(records):
+    """
+    Convert the record array into a list of strings.
+    """
+    if len(records) == 0:
+        return []
+    # Remove the terminal line break of the last line
+    return records.tobytes()[:-1].decode("ascii").split("\n")
+
+
+def _get_cryst1_line(box):
+    """
+    Create the *CRYST1* record for the given box.
+    """
+    unitcell = unitcell_from_vectors(box)
+    return ("CRYST1" +
+            "{:>9.3f}".format(unitcell[0]) +
+            "{:>9.3f}".format(unitcell[1]) +
+            "{:>9.3f}".format(unitcell[2]) +
+            "{:>7.2f}".format(np.rad2deg(unitcell[3])) +
+            "{:>7.2f}".format(np.rad2deg(unitcell[4])) +
+            "{:>7.2f}".format(np.rad2deg(unitcell[5])) +
+            " P 1           1")
+
+
+def _format_string_column(values, width):
+    """
+    Convert an array of strings into a 2D array of left-justified ASCII
+    characters with the given width.
+
+    Longer strings are truncated and non-ASCII characters are replaced
+    by ``'?'``.
+    """
+    # Each unicode character is represented by a 32-bit code point
+    chars = np.ascontiguousarray(values, dtype=f"U{width}") \
+            .view(np.uint32).reshape(-1, width)
+    chars = np.where(chars == 0, ord(" "), chars)
+    chars[chars > 127] = ord("?")
+    return chars.astype(np.uint8)
+
+
+def _format_number_column(values, width, decimals=0):
+    """
+    Convert an array of numbers into a 2D array of right-justified ASCII
+    characters with the given width, equivalent to
+    ``'{:>{width}.{decimals}f}'``.
+
+    If a floating point value does not fit into the given width, its
+    number of decimals is reduced.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        # Scale in double precision, as 'str.format()' does
+        values = values.astype(np.float64, copy=False)
+    n = len(values)
+    chars = np.full((n, width), ord(" "), dtype=np.uint8)
+    if n == 0:
+        return chars
+    is_negative = np.signbit(values)
+    # Rows that have not been written yet
+    remaining = np.ones(n, dtype=bool)
+    for dec in range(decimals, -1, -1):
+        # Integer representation of the number
+        # Rounding to even corresponds to the behavior of 'str.format()'
+        abs_values = np.abs(values[remaining])
+        shifted = abs_values * 10**dec
+        scaled = np.rint(shifted).astype(np.int64)
+        if values.dtype.kind == "f":
+            # The multiplication is inexact, so values close to a tie
+            # may be rounded into the wrong direction
+            # -> round these values exactly via 'str.format()'
+            near_tie = np.where(
+                np.abs(shifted % 1 - 0.5) < 1e-9 * np.maximum(shifted, 1)
+            )[0]
+            for i in near_tie:
+                scaled[i] = int(
+                    "{:.{}f}".format(abs_values[i], dec).replace(".", "")
                 )
-        return length
\ No newline at end of file
+        negative = is_negative[remaining]
+        # The number of integer digits (at least one)
+        int_digits = np.ones(len(scaled), dtype=int)
+        int_part = scaled // 10**dec
+        for k in range(1, width):
+            int_digits[int_part >= 10**k] = k + 1
+        str_length = int_digits + dec + (1 if dec > 0 else 0) + negative
+        fits = (str_length <= width)
+        if not fits.all() and (dec == 0 or values.dtype.kind in "iu"):
+            raise ValueError(
+                f"Value {values[remaining][~fits][0]} cannot be "
+                f"represented within {width} characters"
+            )
+        rows = np.where(remaining)[0][fits]
+        scaled = scaled[fits]
+        int_digits = int_digits[fits]
+        str_length = str_length[fits]
+        negative = negative[fits]
+        
+        # Write the digits from right to left
+        col = width - 1
+        for _ in range(dec):
+            chars[rows, col] = ord("0") + scaled % 10
+            scaled //= 10
+            col -= 1
+        if dec > 0:
+            chars[rows, col] = ord(".")
+            col -= 1
+        for k in range(width - (width - 1 - col)):
+            is_digit = (k < int_digits)
+            chars[rows[is_digit], col] = ord("0") + scaled[is_digit] % 10
+            scaled //= 10
+            col -= 1
+        chars[rows[negative], (width - str_length)[negative]] = ord("-")
+        
+        remaining[rows] = False
+        if not remaining.any():
+            break
+    return chars
+
+
+def _starts_with(chars, prefix):
+    """
+    Check for each row in a 2D character array, whether it starts with
+    the given prefix.
+    """
+    return np.all(chars[:, :len(prefix)] == np.array(list(prefix)), axis=1)
+
+
+def _get_column(records, field):
+    """
+    Get the fixed-width column of the given field in *ATOM* and
+    *HETATM* records as array of byte strings.
+    """
+    columns = _atom_records[field]
+    start = columns[0]
+    stop = columns[1] if len(columns) > 1 else start + 1
+    # A contiguous copy of the column range can be interpreted as
+    # byte strings of the column width
+    return np.ascontiguousarray(records[:, start:stop]) \
+           .view(f"S{stop - start}")[:, 0]
+
+
+def _parse_coord(records):
+    """
+    Parse the coordinates of the given *ATOM* and *HETATM* records.
+    """
+    start = _atom_records["coord_x"][0]
+    stop = _atom_records["coord_z"][1]
+    # The x, y and z columns are adjacent and have the same width
+    width = (stop - start) // 3
+    return np.ascontiguousarray(records[:, start:stop]) \
+           .view(f"S{width}").astype(np.float32)
+
+
+def _decode_hybrid36_column(column):
+    """
+    Decode an array of decimal or hybrid-36 byte strings into integers.
+    """
+    try:
+        # Fast path for pure decimal values
+        return column.astype(int)
+    except ValueError:
+        return decode_hybrid36_array(column).astype(int, copy=False)
+
+
+def _parse_charge(column):
+    """
+    Parse an array of PDB charges (e.g. ``'2-'``) into integers.
+    """
+    number = column.view("S1").reshape(-1, 2)[:, 0]
+    sign = column.view("S1").reshape(-1, 2)[:, 1]
+    charge = np.zeros(len(column), dtype=int)
+    has_charge = (number != b" ")
+    charge[has_charge] = number[has_charge].astype(int)
+    charge[sign == b"-"] *= -1
+    return charge
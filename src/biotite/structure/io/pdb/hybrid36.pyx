@@ -4,9 +4,16 @@
 
 __name__ = "biotite.structure.io.pdb"
 __author__ = "Patrick Kunzmann"
-__all__ = ["encode_hybrid36", "decode_hybrid36", "max_hybrid36_number"]
+__all__ = ["encode_hybrid36", "decode_hybrid36", "max_hybrid36_number",
+           "encode_hybrid36_array", "decode_hybrid36_array"]
 
 cimport cython
+cimport numpy as np
+
+import numpy as np
+
+ctypedef np.int64_t int64
+ctypedef np.uint8_t uint8
 
 
 cdef int _ASCII_FIRST_NUMBER = 48
@@ -15,6 +22,9 @@ cdef int _ASCII_FIRST_LETTER_LOWER = 97
 cdef int _ASCII_LAST_NUMBER = 57
 cdef int _ASCII_LAST_LETTER_UPPER = 90
 cdef int _ASCII_LAST_LETTER_LOWER = 122
+cdef int _ASCII_SPACE = 32
+cdef int _ASCII_MINUS = 45
+cdef int _ASCII_PLUS = 43
 
 
 def encode_hybrid36(int number, int length):
@@ -235,4 +245,219 @@ def max_hybrid36_number(length):
         string of the given `length`.
     """
     #      |-- Decimal -|     |--- lo + up base-36 ---|
-    return 10**length - 1  +  2 * (26 * 36**(length-1))
\ No newline at end of file
+    return 10**length - 1  +  2 * (26 * 36**(length-1))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def encode_hybrid36_array(numbers, int length):
+    """
+    Encode an array of integer values into hyrbid-36 string
+    representations.
+
+    This is the vectorized variant of :func:`encode_hybrid36()`.
+
+    Parameters
+    ----------
+    numbers : ndarray, dtype=int
+        Positive integers to be converted into strings.
+    length : int
+        The desired length of the string representations.
+    
+    Returns
+    -------
+    hybrid36 : ndarray, dtype=bytes
+        The hybrid-36 string representations as byte strings with
+        fixed width `length`.
+        Decimal representations that are shorter than `length` are
+        right-justified.
+    """
+    if length < 1:
+        raise ValueError(
+            "String length must be at least 1"
+        )
+    numbers = np.asarray(numbers, dtype=np.int64)
+    shape = numbers.shape
+    numbers = numbers.flatten()
+    if len(numbers) > 0:
+        if numbers.min() < 0:
+            raise ValueError(
+                "Only positive integers can be converted into "
+                "hybrid-36 notation"
+            )
+        if numbers.max() > max_hybrid36_number(length):
+            raise ValueError(
+                f"Value {numbers.max()} is too large for hybrid-36 encoding "
+                f"at a string length of {length}"
+            )
+    
+    cdef int64 decimal_limit = 10**length
+    # The amount of values represented by each hybrid-36 letter case
+    cdef int64 base36_range = 26 * 36**(length-1)
+    # The base-36 value of e.g. 'A000' (For more information see
+    # 'encode_hybrid36()')
+    cdef int64 base36_offset = 10 * 36**(length-1)
+
+    cdef int64[:] numbers_v = numbers
+    chars = np.full((len(numbers), length), _ASCII_SPACE, dtype=np.uint8)
+    cdef uint8[:,:] chars_v = chars
+    cdef int64 i, num, last
+    cdef int j
+    cdef int ascii_letter_offset
+    for i in range(numbers_v.shape[0]):
+        num = numbers_v[i]
+        j = length - 1
+        if num < decimal_limit:
+            # Normal decimal representation
+            while True:
+                chars_v[i, j] = num % 10 + _ASCII_FIRST_NUMBER
+                num = num // 10
+                j -= 1
+                if num == 0:
+                    break
+        else:
+            num -= decimal_limit
+            if num < base36_range:
+                # Upper case hybrid-36 representation
+                ascii_letter_offset = _ASCII_FIRST_LETTER_UPPER
+            else:
+                # Lower case hybrid-36 representation
+                num -= base36_range
+                ascii_letter_offset = _ASCII_FIRST_LETTER_LOWER
+            num += base36_offset
+            while j >= 0:
+                last = num % 36
+                if last < 10:
+                    chars_v[i, j] = last + _ASCII_FIRST_NUMBER
+                else:
+                    chars_v[i, j] = last + ascii_letter_offset - 10
+                num = num // 36
+                j -= 1
+    return chars.view(f"S{length}").reshape(shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode_hybrid36_array(strings):
+    """
+    Convert an array of hybrid-36 strings into integer values.
+
+    This is the vectorized variant of :func:`decode_hybrid36()`.
+
+    Parameters
+    ----------
+    strings : ndarray, dtype=bytes or dtype=str
+        Hybrid-36 strings representing positive integers.
+        Leading and trailing whitespace is ignored.
+    
+    Returns
+    -------
+    numbers : ndarray, dtype=int
+        The integer values represented by the hybrid-36 strings.
+    """
+    strings = np.asarray(strings)
+    shape = strings.shape
+    if strings.dtype.kind == "U":
+        strings = strings.astype(f"S{strings.dtype.itemsize // 4}")
+    elif strings.dtype.kind != "S":
+        raise TypeError(
+            f"Expected an array of strings, not '{strings.dtype}'"
+        )
+    strings = np.ascontiguousarray(strings.flatten())
+    cdef int width = strings.dtype.itemsize
+    numbers = np.zeros(len(strings), dtype=np.int64)
+    if width == 0:
+        if len(strings) > 0:
+            raise ValueError("Cannot parse empty string into integer")
+        return numbers.reshape(shape)
+    
+    cdef const uint8[:,:] chars_v \
+        = strings.view(np.uint8).reshape(len(strings), width)
+    cdef int64[:] numbers_v = numbers
+    cdef int64 i, number
+    cdef int j, n_digits, sign
+    cdef bint is_finished
+    cdef uint8 c
+    # The letter offset of the hybrid-36 case of the current string
+    # 0, if the string is decimal
+    cdef int ascii_letter_offset
+    for i in range(chars_v.shape[0]):
+        number = 0
+        n_digits = 0
+        sign = 1
+        is_finished = False
+        ascii_letter_offset = 0
+        for j in range(width):
+            c = chars_v[i, j]
+            if c == _ASCII_SPACE or c == 0:
+                # Whitespace or padding
+                # -> the string has ended, if it has started yet
+                if n_digits > 0:
+                    is_finished = True
+                continue
+            if is_finished:
+                # Whitespace within the string
+                _raise_illegal_hybrid36(strings[i])
+            if n_digits == 0:
+                # First character determines the representation
+                if c == _ASCII_MINUS or c == _ASCII_PLUS:
+                    if sign == -1 or ascii_letter_offset != 0:
+                        _raise_illegal_hybrid36(strings[i])
+                    if c == _ASCII_MINUS:
+                        sign = -1
+                    # Mark that a sign was read
+                    # without treating the sign as digit
+                    ascii_letter_offset = -1
+                    continue
+                if ascii_letter_offset == 0:
+                    if c >= _ASCII_FIRST_LETTER_UPPER \
+                       and c <= _ASCII_LAST_LETTER_UPPER:
+                        ascii_letter_offset = _ASCII_FIRST_LETTER_UPPER
+                    elif c >= _ASCII_FIRST_LETTER_LOWER \
+                         and c <= _ASCII_LAST_LETTER_LOWER:
+                        ascii_letter_offset = _ASCII_FIRST_LETTER_LOWER
+                    elif c < _ASCII_FIRST_NUMBER or c > _ASCII_LAST_NUMBER:
+                        _raise_illegal_hybrid36(strings[i])
+                elif c < _ASCII_FIRST_NUMBER or c > _ASCII_LAST_NUMBER:
+                    # Only decimal digits are allowed after a sign
+                    _raise_illegal_hybrid36(strings[i])
+            
+            if c >= _ASCII_FIRST_NUMBER and c <= _ASCII_LAST_NUMBER:
+                if ascii_letter_offset > 0:
+                    number = number * 36 + (c - _ASCII_FIRST_NUMBER)
+                else:
+                    number = number * 10 + (c - _ASCII_FIRST_NUMBER)
+            elif ascii_letter_offset > 0 \
+                 and c >= ascii_letter_offset \
+                 and c < ascii_letter_offset + 26:
+                number = number * 36 + (c - ascii_letter_offset + 10)
+            else:
+                _raise_illegal_hybrid36(strings[i])
+            n_digits += 1
+        
+        if n_digits == 0:
+            raise ValueError("Cannot parse empty string into integer")
+        if ascii_letter_offset == _ASCII_FIRST_LETTER_UPPER:
+            # Transform e.g. base-36 'A000' into 10000
+            # (For more information see 'decode_hybrid36()')
+            number = number - 10 * _pow(36, n_digits-1) + _pow(10, n_digits)
+        elif ascii_letter_offset == _ASCII_FIRST_LETTER_LOWER:
+            number = number + (26-10) * _pow(36, n_digits-1) \
+                     + _pow(10, n_digits)
+        numbers_v[i] = sign * number
+    return numbers.reshape(shape)
+
+
+cdef inline int64 _pow(int64 base, int exponent):
+    cdef int64 result = 1
+    cdef int i
+    for i in range(exponent):
+        result *= base
+    return result
+
+
+def _raise_illegal_hybrid36(string):
+    raise ValueError(
+        f"Illegal hybrid-36 string '{string.decode('ascii').strip()}'"
+    )
@@ -6,6 +6,8 @@
 This subpackage provides support for the the modern PDBx/mmCIF file
 format. The :class:`PDBxFile` class provides dictionary-like access to
 every field in PDBx/mmCIF files.
+The :class:`BinaryCIFFile` class provides the same access to files in the
+compressed binary counterpart of this format, *BinaryCIF*.
 Additional utility functions allow conversion of these dictionaries to
 :class:`AtomArray` and :class:`AtomArrayStack` objects and vice versa.
 """
@@ -14,4 +16,5 @@ __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
 
 from .convert import *
-from .file import *
\ No newline at end of file
+from .file import *
+from .bcif import *
\ No newline at end of file
@@ -0,0 +1,543 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = ["BinaryCIFFile"]
+
+import copy
+from collections.abc import MutableMapping
+import numpy as np
+import msgpack
+from ....file import File, InvalidFileError, is_binary
+from ..mmtf.decode import _decode_run_length, _decode_delta, _decode_packed
+from ..mmtf.encode import _encode_run_length, _encode_delta, _encode_packed
+
+
+# The data type codes used in BinaryCIF
+_DATA_TYPES = {
+    1  : np.int8,
+    2  : np.int16,
+    3  : np.int32,
+    4  : np.uint8,
+    5  : np.uint16,
+    6  : np.uint32,
+    32 : np.float32,
+    33 : np.float64,
+}
+_DATA_TYPE_CODES = {
+    np.dtype(dtype) : code for code, dtype in _DATA_TYPES.items()
+}
+
+# The mask values for missing values
+_MASK_VALUES = {
+    1 : ".",
+    2 : "?",
+}
+
+
+class BinaryCIFFile(File, MutableMapping):
+    """
+    This class represents a BinaryCIF file.
+
+    BinaryCIF is the binary counterpart of the PDBx/mmCIF format:
+    The file content is stored column-wise via *MessagePack*, where
+    each column is compressed by a chain of encodings
+    (e.g. run-length, delta and integer packing).
+    Hence, files are smaller and can be decoded much faster than text
+    based PDBx/mmCIF files.
+
+    The interface mirrors :class:`PDBxFile`:
+    The categories of the file can be accessed using the
+    `get_category()`/`set_category()` methods or using dictionary-like
+    indexing.
+    Hence, :func:`get_structure()` and :func:`set_structure()` can be
+    used for both classes.
+
+    When reading a file, only the *MessagePack* structure is unpacked.
+    The columns of a category are decoded when the category is
+    accessed.
+
+    Notes
+    -----
+    In contrast to :class:`PDBxFile`, the decoded columns retain the
+    data type of the encoded values, i.e. numeric columns are returned
+    as integer or floating point arrays.
+    However, if a column contains missing values, it is converted into
+    a string array, where the missing values are represented by
+    ``'.'`` or ``'?'``.
+    Likewise, in string columns given to `set_category()` the values
+    ``'.'`` and ``'?'`` are stored as missing values.
+
+    Examples
+    --------
+    Convert a PDBx/mmCIF file into a BinaryCIF file:
+
+    >>> import os.path
+    >>> pdbx_file = PDBxFile.read(os.path.join(path_to_structures, "1l2y.cif"))
+    >>> atom_array = get_structure(pdbx_file, model=1)
+    >>> bcif_file = BinaryCIFFile()
+    >>> set_structure(bcif_file, atom_array, data_block="1L2Y")
+    >>> bcif_file.write(os.path.join(path_to_directory, "1l2y.bcif"))
+    >>> bcif_file = BinaryCIFFile.read(
+    ...     os.path.join(path_to_directory, "1l2y.bcif")
+    ... )
+    >>> print(bcif_file["atom_site"]["label_comp_id"][:6])
+    ['ASN' 'ASN' 'ASN' 'ASN' 'ASN' 'ASN']
+    >>> print(get_structure(bcif_file, model=1) == atom_array)
+    True
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._content = {
+            "version"    : "0.3.0",
+            "encoder"    : "biotite",
+            "dataBlocks" : []
+        }
+
+
+    @classmethod
+    def read(cls, file):
+        """
+        Read a BinaryCIF file.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+
+        Returns
+        -------
+        file_object : BinaryCIFFile
+            The parsed file.
+        """
+        bcif_file = cls()
+        # File name
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                content = f.read()
+        # File object
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            content = file.read()
+        bcif_file._content = msgpack.unpackb(content, use_list=True, raw=False)
+        if "dataBlocks" not in bcif_file._content:
+            raise InvalidFileError("The file contains no data blocks")
+        return bcif_file
+
+
+    def write(self, file):
+        """
+        Write contents into a BinaryCIF file.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively, a file path can be supplied.
+        """
+        packed_bytes = msgpack.packb(self._content, use_bin_type=True)
+        if isinstance(file, str):
+            with open(file, "wb") as f:
+                f.write(packed_bytes)
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            file.write(packed_bytes)
+
+
+    def get_block_names(self):
+        """
+        Get the names of all data blocks in the file.
+
+        Returns
+        -------
+        blocks : list
+            List of data block names.
+        """
+        return [block["header"] for block in self._content["dataBlocks"]]
+
+
+    def get_category(self, category, block=None, expect_looped=False,
+                     keys=None):
+        """
+        Get the dictionary for a given category.
+
+        Parameters
+        ----------
+        category : string
+            The name of the category. The leading underscore is omitted.
+        block : string, optional
+            The name of the data block. Default is the first
+            (and most times only) data block of the file.
+        expect_looped : bool, optional
+            If set to true, the returned dictionary will always contain
+            arrays (only if the category exists).
+            Otherwise, categories with only one row are returned as
+            single values, analogous to *non-looped* categories in
+            :class:`PDBxFile`.
+        keys : iterable object of str, optional
+            If given, only the columns for these keys are decoded and
+            returned.
+            Keys that are not contained in the category are ignored.
+            By default, all keys are decoded.
+
+        Returns
+        -------
+        category_dict : dict of (str or int or float or ndarray) or None
+            A entry keyed dictionary.
+            The corresponding values are single values or arrays for
+            categories with one or multiple rows, respectively.
+            Returns None, if the data block does not contain the given
+            category.
+        """
+        category_content = self._get_category_content(block, category)
+        if category_content is None:
+            return None
+        if keys is not None:
+            keys = set(keys)
+
+        category_dict = {}
+        for column in category_content["columns"]:
+            if keys is not None and column["name"] not in keys:
+                # Skip the decoding of unused columns
+                continue
+            array = _decode_column(column)
+            if len(array) != category_content["rowCount"]:
+                raise InvalidFileError(
+                    f"Column '{column['name']}' has {len(array)} values, "
+                    f"but the category has {category_content['rowCount']} "
+                    f"rows"
+                )
+            if category_content["rowCount"] == 1 and not expect_looped:
+                array = array[0].item()
+            category_dict[column["name"]] = array
+        return category_dict
+
+
+    def set_category(self, category, category_dict, block=None):
+        """
+        Set the content of a category.
+
+        If the category is already exisiting, it is replaced.
+        Otherwise a new category is appended to the data block.
+
+        The encodings of the columns are chosen automatically:
+        Integer columns are encoded with the combination of delta,
+        run-length and integer packing encoding, that gives the smallest
+        size, floating point values are stored without loss of
+        precision, and string columns are stored as indices into the
+        unique strings of the column.
+
+        Parameters
+        ----------
+        category : string
+            The name of the category. The leading underscore is omitted.
+        category_dict : dict
+            The category content. The dictionary must have strings
+            as keys and single values or :class:`ndarray` objects as
+            values.
+        block : string, optional
+            The name of the data block. Default is the first
+            (and most times only) data block of the file. If the
+            block is not contained in the file yet, a new block is
+            appended at the end of the file.
+        """
+        columns = {}
+        for key, value in category_dict.items():
+            if isinstance(value, (np.ndarray, list)):
+                columns[key] = np.asarray(value)
+            else:
+                columns[key] = np.array([value])
+        row_count = len(next(iter(columns.values())))
+        for key, array in columns.items():
+            if len(array) != row_count:
+                raise ValueError(
+                    f"Length of Subcategory '{key}' is {len(array)}, "
+                    f" but {row_count} was expected"
+                )
+
+        category_content = {
+            "name"     : "_" + category,
+            "columns"  : [
+                _encode_column(key, array) for key, array in columns.items()
+            ],
+            "rowCount" : row_count
+        }
+
+        if block is None:
+            block = self.get_block_names()[0]
+        block_content = self._get_block_content(block)
+        if block_content is None:
+            block_content = {"header" : block, "categories" : []}
+            self._content["dataBlocks"].append(block_content)
+        categories = block_content["categories"]
+        for i, old_category in enumerate(categories):
+            if old_category["name"] == "_" + category:
+                categories[i] = category_content
+                break
+        else:
+            categories.append(category_content)
+
+
+    def __copy_fill__(self, clone):
+        super().__copy_fill__(clone)
+        clone._content = copy.deepcopy(self._content)
+
+
+    def __setitem__(self, index, item):
+        block, category_name = self._full_index(index)
+        self.set_category(category_name, item, block=block)
+
+
+    def __getitem__(self, index):
+        block, category_name = self._full_index(index)
+        category_dict = self.get_category(category_name, block=block)
+        if category_dict is None:
+            raise KeyError(index)
+        return category_dict
+
+
+    def __delitem__(self, index):
+        block, category_name = self._full_index(index)
+        block_content = self._get_block_content(block)
+        if block_content is not None:
+            categories = block_content["categories"]
+            for i, category_content in enumerate(categories):
+                if category_content["name"] == "_" + category_name:
+                    del categories[i]
+                    return
+        raise KeyError(index)
+
+
+    def __contains__(self, index):
+        block, category_name = self._full_index(index)
+        return self._get_category_content(block, category_name) is not None
+
+
+    def __iter__(self):
+        for block_content in self._content["dataBlocks"]:
+            for category_content in block_content["categories"]:
+                # Omit the leading underscore
+                yield block_content["header"], category_content["name"][1:]
+
+
+    def __len__(self):
+        return sum(
+            len(block_content["categories"])
+            for block_content in self._content["dataBlocks"]
+        )
+
+
+    def _full_index(self, index):
+        """
+        Converts a an integer or tuple index into a block and a category
+        name.
+        """
+        if isinstance(index, tuple):
+            return index[0], index[1]
+        elif isinstance(index, str):
+            return self.get_block_names()[0], index
+        else:
+            raise TypeError(
+                f"'{type(index).__name__}' is an invalid index type"
+            )
+
+
+    def _get_block_content(self, block):
+        for block_content in self._content["dataBlocks"]:
+            if block_content["header"] == block:
+                return block_content
+        return None
+
+
+    def _get_category_content(self, block, category):
+        if block is None:
+            block = self.get_block_names()[0]
+        block_content = self._get_block_content(block)
+        if block_content is None:
+            return None
+        for category_content in block_content["categories"]:
+            if category_content["name"] == "_" + category:
+                return category_content
+        return None
+
+
+def _decode_column(column):
+    """
+    Decode the values of a column and replace masked values by
+    ``'.'`` or ``'?'``.
+    """
+    array = _decode(column["data"])
+    if column.get("mask") is not None:
+        mask = _decode(column["mask"])
+        if (mask != 0).any():
+            if array.dtype.kind != "U":
+                array = array.astype(str)
+            for mask_value, string in _MASK_VALUES.items():
+                array[mask == mask_value] = string
+    return array
+
+
+def _decode(encoded_data):
+    """
+    Decode the bytes of an encoded data object, by applying the
+    encodings in reverse order.
+    """
+    data = encoded_data["data"]
+    for encoding in reversed(encoded_data["encoding"]):
+        kind = encoding["kind"]
+        if kind == "ByteArray":
+            dtype = np.dtype(_DATA_TYPES[encoding["type"]])
+            # The copy makes the array writable,
+            # which is required by the Cython decoding functions
+            data = np.frombuffer(data, dtype=dtype.newbyteorder("<")) \
+                   .astype(dtype)
+        elif kind == "FixedPoint":
+            data = np.divide(
+                data, encoding["factor"],
+                dtype=_DATA_TYPES[encoding["srcType"]]
+            )
+        elif kind == "IntervalQuantization":
+            step = (encoding["max"] - encoding["min"]) \
+                 / (encoding["numSteps"] - 1)
+            data = (encoding["min"] + data * step) \
+                   .astype(_DATA_TYPES[encoding["srcType"]])
+        elif kind == "RunLength":
+            data = _decode_run_length(data.astype(np.int32, copy=False)) \
+                   .astype(_DATA_TYPES[encoding["srcType"]], copy=False)
+        elif kind == "Delta":
+            data = (_decode_delta(data) + encoding["origin"]) \
+                   .astype(_DATA_TYPES[encoding["srcType"]], copy=False)
+        elif kind == "IntegerPacking":
+            data = _decode_packed(data)
+        elif kind == "StringArray":
+            offsets = _decode({
+                "data"     : encoding["offsets"],
+                "encoding" : encoding["offsetEncoding"]
+            })
+            indices = _decode({
+                "data"     : data,
+                "encoding" : encoding["dataEncoding"]
+            })
+            string_data = encoding["stringData"]
+            # Append an empty string, that is selected by the index -1
+            # for missing values
+            strings = np.array(
+                [
+                    string_data[offsets[i] : offsets[i+1]]
+                    for i in range(len(offsets) - 1)
+                ] + [""],
+                dtype=str
+            )
+            data = strings[indices]
+        else:
+            raise InvalidFileError(f"Unknown encoding '{kind}'")
+    return data
+
+
+def _encode_column(key, array):
+    """
+    Create a column object for the given values.
+    """
+    mask = None
+    if array.dtype.kind in ("U", "S", "O"):
+        array = array.astype(str)
+        mask_values = np.zeros(len(array), dtype=np.int32)
+        for mask_value, string in _MASK_VALUES.items():
+            mask_values[array == string] = mask_value
+        if (mask_values != 0).any():
+            mask = _encode_integers(mask_values)
+        data = _encode_strings(array)
+    elif array.dtype.kind in ("i", "u", "b"):
+        data = _encode_integers(array)
+    elif array.dtype.kind == "f":
+        if array.dtype != np.float32:
+            array = array.astype(np.float64)
+        data = {
+            "data"     : array.astype(array.dtype.newbyteorder("<"))
+                         .tobytes(),
+            "encoding" : [{
+                "kind" : "ByteArray",
+                "type" : _DATA_TYPE_CODES[array.dtype]
+            }]
+        }
+    else:
+        raise TypeError(
+            f"Data type '{array.dtype}' of column '{key}' is not supported"
+        )
+    return {"name" : key, "data" : data, "mask" : mask}
+
+
+def _encode_strings(array):
+    """
+    Encode the strings as indices into the unique strings.
+    """
+    unique_strings, indices = np.unique(array, return_inverse=True)
+    lengths = np.array([len(string) for string in unique_strings])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    encoded_indices = _encode_integers(indices)
+    encoded_offsets = _encode_integers(offsets)
+    return {
+        "data"     : encoded_indices["data"],
+        "encoding" : [{
+            "kind"           : "StringArray",
+            "dataEncoding"   : encoded_indices["encoding"],
+            "stringData"     : "".join(unique_strings.tolist()),
+            "offsetEncoding" : encoded_offsets["encoding"],
+            "offsets"        : encoded_offsets["data"],
+        }]
+    }
+
+
+def _encode_integers(array):
+    """
+    Encode integers with the combination of delta, run-length and
+    integer packing encoding, that results in the smallest size.
+    """
+    if len(array) > 0 and (
+        array.min() < np.iinfo(np.int32).min or
+        array.max() > np.iinfo(np.int32).max
+    ):
+        raise ValueError("Values do not fit into a 32-bit integer")
+    array = array.astype(np.int32)
+    length = len(array)
+
+    # Pass-through
+    candidates = [(
+        array.astype("<i4").tobytes(),
+        [{"kind" : "ByteArray", "type" : 3}]
+    )]
+    if length == 0:
+        return {"data" : candidates[0][0], "encoding" : candidates[0][1]}
+
+    delta = {"kind" : "Delta", "origin" : 0, "srcType" : 3}
+    run_length = {"kind" : "RunLength", "srcType" : 3, "srcSize" : length}
+    for encodings in ([], [delta], [run_length], [delta, run_length]):
+        encoded = array
+        for encoding in encodings:
+            if encoding["kind"] == "Delta":
+                encoded = _encode_delta(encoded)
+            else:
+                encoded = _encode_run_length(encoded)
+        for byte_count in (1, 2):
+            packed = _encode_packed(byte_count == 2, encoded)
+            dtype = "<i1" if byte_count == 1 else "<i2"
+            candidates.append((
+                packed.astype(dtype).tobytes(),
+                encodings + [
+                    {
+                        "kind"       : "IntegerPacking",
+                        "byteCount"  : byte_count,
+                        "isUnsigned" : False,
+                        "srcSize"    : len(encoded)
+                    },
+                    {"kind" : "ByteArray", "type" : byte_count}
+                ]
+            ))
+    data, encodings = min(candidates, key=lambda candidate: len(candidate[0]))
+    return {"data" : data, "encoding" : encodings}
@@ -15,6 +15,7 @@ from ...atoms import Atom, AtomArray, AtomArrayStack, repeat
 from ...filter import filter_first_altloc, filter_highest_occupancy_altloc
 from ...box import unitcell_from_vectors, vectors_from_unitcell
 from ...util import matrix_rotate
+from .bcif import BinaryCIFFile
 from ....sequence.seqtypes import ProteinSequence, NucleotideSequence
 from collections import OrderedDict
 
@@ -25,6 +26,15 @@ _nucleotideseq_type_list = ["polydeoxyribonucleotide", "polyribonucleotide",
 _other_type_list = ["cyclic-pseudo-peptide", "other", "peptide nucleic acid",
                         "polysaccharide(D)", "polysaccharide(L)"]
 
+# The 'atom_site' keys, the special 'extra_fields' are read from
+_EXTRA_FIELD_KEYS = {
+    "atom_id"   : "id",
+    "b_factor"  : "B_iso_or_equiv",
+    "occupancy" : "occupancy",
+    "charge"    : "pdbx_formal_charge",
+}
+
+
 def get_sequence(pdbx_file, data_block=None):
     """
     Get the protein and nucleotide sequences from the
@@ -38,7 +48,7 @@ def get_sequence(pdbx_file, data_block=None):
     
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : string, optional
         The name of the data block. Default is the first
@@ -70,7 +80,7 @@ def get_model_count(file, data_block=None):
 
     Parameters
     ----------
-    file : PDBxFile
+    file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : str, optional
         The name of the data block. Default is the first
@@ -81,7 +91,9 @@ def get_model_count(file, data_block=None):
     model_count : int
         The number of models.
     """
-    atom_site_dict = file.get_category("atom_site", data_block)
+    atom_site_dict = _get_atom_site(
+        file, data_block, keys=["pdbx_PDB_model_num"]
+    )
     return int(atom_site_dict["pdbx_PDB_model_num"][-1])
 
 
@@ -93,7 +105,7 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
     
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     model : int, optional
         If this parameter is given, the function will return an
@@ -157,13 +169,17 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
     altloc = [] if altloc is None else altloc
     extra_fields = [] if extra_fields is None else extra_fields
     
-    atom_site_dict = pdbx_file.get_category("atom_site", data_block)
-    models = atom_site_dict["pdbx_PDB_model_num"]
+    # Parse only the columns that are actually used
+    atom_site_dict = _get_atom_site(
+        pdbx_file, data_block,
+        keys=_get_required_keys(altloc, extra_fields, use_author_fields)
+    )
+    models = atom_site_dict["pdbx_PDB_model_num"].astype(int)
     model_count = int(models[-1])
     
     if model is None:
         # For a stack, the annotation are derived from the first model
-        model_dict = _get_model_dict(atom_site_dict, 1)
+        model_dict = _get_model_dict(atom_site_dict, models, 1)
         model_length = len(model_dict["group_PDB"])
         stack = AtomArrayStack(model_count, model_length)
         
@@ -205,13 +221,13 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
                 f"the given model {model} does not exist"
             )
 
-        model_dict = _get_model_dict(atom_site_dict, model)
+        model_dict = _get_model_dict(atom_site_dict, models, model)
         model_length = len(model_dict["group_PDB"])
         array = AtomArray(model_length)
         
         _fill_annotations(array, model_dict, extra_fields, use_author_fields)
         
-        model_filter = (models == str(model))
+        model_filter = (models == model)
         array.coord = np.zeros((model_length, 3), dtype=np.float32)
         array.coord[:,0] = atom_site_dict["Cartn_x"][model_filter] \
                            .astype(np.float32)
@@ -227,22 +243,53 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
         return array
         
 
+def _get_atom_site(pdbx_file, data_block, keys):
+    """
+    Get the given columns of the *atom_site* category.
+
+    For text based files the fixed-width string arrays are used
+    directly instead of the object arrays from
+    :func:`PDBxFile.get_category()`, as the conversion is slow for
+    large structures.
+    """
+    if isinstance(pdbx_file, BinaryCIFFile):
+        get_category = pdbx_file.get_category
+    else:
+        get_category = pdbx_file._get_category
+    return get_category("atom_site", data_block, expect_looped=True, keys=keys)
+
+
+def _get_required_keys(altloc, extra_fields, use_author_fields):
+    """
+    Get the keys of the ``atom_site`` category, that are required for
+    :func:`get_structure()` with the given parameters.
+    """
+    prefix = "auth" if use_author_fields else "label"
+    keys = [
+        "pdbx_PDB_model_num", "group_PDB", "type_symbol",
+        "pdbx_PDB_ins_code", "label_alt_id",
+        "Cartn_x", "Cartn_y", "Cartn_z",
+        f"{prefix}_asym_id", f"{prefix}_seq_id",
+        f"{prefix}_comp_id", f"{prefix}_atom_id",
+    ]
+    if altloc == "occupancy":
+        keys.append("occupancy")
+    for field in extra_fields:
+        keys.append(_EXTRA_FIELD_KEYS.get(field, field))
+    return keys
+
+
 def _fill_annotations(array, model_dict, extra_fields, use_author_fields):
     prefix = "auth" if use_author_fields else "label"
     array.set_annotation(
         "chain_id", model_dict[f"{prefix}_asym_id"].astype("U3")
     )
     array.set_annotation(
-        "res_id", np.array(
-            [-1 if e in [".","?"] else int(e)
-             for e in model_dict[f"{prefix}_seq_id"]]
-        )
+        "res_id", _parse_int_column(model_dict[f"{prefix}_seq_id"], -1)
     )
+    ins_code = model_dict["pdbx_PDB_ins_code"].astype("U1")
     array.set_annotation(
-        "ins_code", np.array(
-            ["" if e in [".","?"] else e
-             for e in model_dict["pdbx_PDB_ins_code"].astype("U1")]
-        )
+        "ins_code", np.where(np.isin(ins_code, [".","?"]), "", ins_code)
     )
     array.set_annotation(
         "res_name", model_dict[f"{prefix}_comp_id"].astype("U3")
@@ -270,16 +317,26 @@ def _fill_annotations(array, model_dict, extra_fields, use_author_fields):
             )
         elif field == "charge":
             array.set_annotation(
-                "charge", np.array(
-                    [0 if charge in ["?","."] else int(charge)
-                     for charge in model_dict["pdbx_formal_charge"]],
-                    dtype=int
-                )
+                "charge", _parse_int_column(model_dict["pdbx_formal_charge"], 0)
             )
         else:
             array.set_annotation(field, model_dict[field].astype(str))
 
 
+def _parse_int_column(column, default):
+    """
+    Convert a column of strings into integers, where missing values
+    (``'.'`` and ``'?'``) are replaced by the given default value.
+    """
+    if column.dtype.kind in ("i", "u"):
+        # Already parsed, e.g. in a BinaryCIF file
+        return column.astype(int)
+    column = np.asarray(column, dtype=str)
+    return np.where(
+        np.isin(column, [".","?"]), str(default), column
+    ).astype(int)
+
+
 def _filter_altloc(array, model_dict, altloc):
     altloc_ids = model_dict.get("label_alt_id")
     occupancy =  model_dict.get("occupancy")
@@ -303,11 +360,10 @@ def _filter_altloc(array, model_dict, altloc):
     else:
         raise ValueError(f"'{altloc}' is not a valid 'altloc' option")
 
-def _get_model_dict(atom_site_dict, model):
+def _get_model_dict(atom_site_dict, models, model):
     model_dict = {}
-    models = atom_site_dict["pdbx_PDB_model_num"]
     for key in atom_site_dict.keys():
-        model_dict[key] = atom_site_dict[key][models == str(model)]
+        model_dict[key] = atom_site_dict[key][models == model]
     return model_dict
 
 
@@ -344,7 +400,7 @@ def set_structure(pdbx_file, array, data_block=None):
     
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     array : AtomArray or AtomArrayStack
         The structure to be written. If a stack is given, each array in
@@ -362,6 +418,10 @@ def set_structure(pdbx_file, array, data_block=None):
     >>> file.write(os.path.join(path_to_directory, "structure.cif"))
     
     """
+    # BinaryCIF files can store numeric values directly,
+    # while text based files require the string representation
+    binary = isinstance(pdbx_file, BinaryCIFFile)
+
     # Fill PDBx columns from information
     # in structures' attribute arrays as good as possible
     # Use OrderedDict in order to ensure the usually used column order.
@@ -371,37 +431,44 @@ def set_structure(pdbx_file, array, data_block=None):
     annot_categories = array.get_annotation_categories()
     atom_site_dict["group_PDB"] = np.array(["ATOM" if e == False else "HETATM"
                                             for e in array.hetero])
-    atom_site_dict["type_symbol"] = np.copy(array.element)
-    atom_site_dict["label_atom_id"] = np.copy(array.atom_name)
+    # 'np.array()' instead of 'np.copy()' decodes categorical annotations
+    atom_site_dict["type_symbol"] = np.array(array.element)
+    atom_site_dict["label_atom_id"] = np.array(array.atom_name)
     atom_site_dict["label_alt_id"] = np.full(array.array_length(), ".")
-    atom_site_dict["label_comp_id"] = np.copy(array.res_name)
-    atom_site_dict["label_asym_id"] = np.copy(array.chain_id)
+    atom_site_dict["label_comp_id"] = np.array(array.res_name)
+    atom_site_dict["label_asym_id"] = np.array(array.chain_id)
     atom_site_dict["label_entity_id"] = _determine_entity_id(array.chain_id)
-    atom_site_dict["label_seq_id"] = np.array(
-        ["." if e == -1 else str(e) for e in array.res_id]
-    )
-    atom_site_dict["pdbx_PDB_ins_code"] = array.ins_code
+    if binary and (array.res_id != -1).all():
+        atom_site_dict["label_seq_id"] = np.copy(array.res_id)
+    else:
+        atom_site_dict["label_seq_id"] = np.array(
+            ["." if e == -1 else str(e) for e in array.res_id]
+        )
+    atom_site_dict["pdbx_PDB_ins_code"] = np.array(array.ins_code)
     atom_site_dict["auth_seq_id"] = atom_site_dict["label_seq_id"]
     atom_site_dict["auth_comp_id"] = atom_site_dict["label_comp_id"]
     atom_site_dict["auth_asym_id"] = atom_site_dict["label_asym_id"]
     atom_site_dict["auth_atom_id"] = atom_site_dict["label_atom_id"]
     
     if "atom_id" in annot_categories:
-        atom_site_dict["id"] = array.atom_id.astype("U6")
+        atom_site_dict["id"] = _int_column(array.atom_id, binary)
     else:
         atom_site_dict["id"] = None
     if "b_factor" in annot_categories:
-        atom_site_dict["B_iso_or_equiv"] = np.array(
-            [f"{b:.2f}" for b in array.b_factor]
+        atom_site_dict["B_iso_or_equiv"] = _float_column(
+            array.b_factor, 2, binary
         )
     if "occupancy" in annot_categories:
-        atom_site_dict["occupancy"] = np.array(
-            [f"{occ:.2f}" for occ in array.occupancy]
+        atom_site_dict["occupancy"] = _float_column(
+            array.occupancy, 2, binary
         )
     if "charge" in annot_categories:
-        atom_site_dict["pdbx_formal_charge"] = np.array(
-            [f"{c:+d}" if c != 0 else "?" for c in array.charge]
-        )
+        if binary:
+            atom_site_dict["pdbx_formal_charge"] = np.copy(array.charge)
+        else:
+            atom_site_dict["pdbx_formal_charge"] = np.array(
+                [f"{c:+d}" if c != 0 else "?" for c in array.charge]
+            )
     
     # In case of a single model handle each coordinate
     # simply like a flattened array
@@ -409,17 +476,17 @@ def set_structure(pdbx_file, array, data_block=None):
          (type(array) == AtomArrayStack and array.stack_depth() == 1)  ):
         # 'ravel' flattens coord without copy
         # in case of stack with stack_depth = 1
-        atom_site_dict["Cartn_x"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[...,0])]
+        atom_site_dict["Cartn_x"] = _float_column(
+            np.ravel(array.coord[...,0]), 3, binary
         )
-        atom_site_dict["Cartn_y"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[...,1])]
+        atom_site_dict["Cartn_y"] = _float_column(
+            np.ravel(array.coord[...,1]), 3, binary
         )
-        atom_site_dict["Cartn_z"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[...,2])]
+        atom_site_dict["Cartn_z"] = _float_column(
+            np.ravel(array.coord[...,2]), 3, binary
         )
-        atom_site_dict["pdbx_PDB_model_num"] = np.full(
-            array.array_length(), "1"
+        atom_site_dict["pdbx_PDB_model_num"] = _int_column(
+            np.ones(array.array_length(), dtype=int), binary
         )
     # In case of multiple models repeat annotations
     # and use model specific coordinates
@@ -428,26 +495,21 @@ def set_structure(pdbx_file, array, data_block=None):
             atom_site_dict[key] = np.tile(value, reps=array.stack_depth())
         coord = np.reshape(array.coord,
                            (array.stack_depth()*array.array_length(), 3))
-        atom_site_dict["Cartn_x"] = np.array(
-            [f"{c:.3f}" for c in coord[:,0]]
-        )
-        atom_site_dict["Cartn_y"] = np.array(
-            [f"{c:.3f}" for c in coord[:,1]]
-        )
-        atom_site_dict["Cartn_z"] = np.array(
-            [f"{c:.3f}" for c in coord[:,2]]
-        )
+        atom_site_dict["Cartn_x"] = _float_column(coord[:,0], 3, binary)
+        atom_site_dict["Cartn_y"] = _float_column(coord[:,1], 3, binary)
+        atom_site_dict["Cartn_z"] = _float_column(coord[:,2], 3, binary)
         models = np.repeat(
-            np.arange(1, array.stack_depth()+1).astype(str),
+            np.arange(1, array.stack_depth()+1),
             repeats=array.array_length()
         )
-        atom_site_dict["pdbx_PDB_model_num"] = models
+        atom_site_dict["pdbx_PDB_model_num"] = _int_column(models, binary)
     else:
         raise ValueError("Structure must be AtomArray or AtomArrayStack")
     if not "atom_id" in annot_categories:
         # Count from 1
-        atom_site_dict["id"] = (np.arange(1,len(atom_site_dict["group_PDB"])+1)
-                               .astype("U6"))
+        atom_site_dict["id"] = _int_column(
+            np.arange(1,len(atom_site_dict["group_PDB"])+1), binary
+        )
     if data_block is None:
         data_blocks = pdbx_file.get_block_names()
         if len(data_blocks) == 0:
@@ -467,15 +529,45 @@ def set_structure(pdbx_file, array, data_block=None):
             box = array.box
         len_a, len_b, len_c, alpha, beta, gamma = unitcell_from_vectors(box)
         cell_dict = OrderedDict()
-        cell_dict["length_a"] = "{:6.3f}".format(len_a)
-        cell_dict["length_b"] = "{:6.3f}".format(len_b)
-        cell_dict["length_c"] = "{:6.3f}".format(len_c)
-        cell_dict["angle_alpha"] = "{:5.3f}".format(np.rad2deg(alpha))
-        cell_dict["angle_beta"]  = "{:5.3f}".format(np.rad2deg(beta ))
-        cell_dict["angle_gamma"] = "{:5.3f}".format(np.rad2deg(gamma))
+        if binary:
+            cell_dict["length_a"] = float(len_a)
+            cell_dict["length_b"] = float(len_b)
+            cell_dict["length_c"] = float(len_c)
+            cell_dict["angle_alpha"] = float(np.rad2deg(alpha))
+            cell_dict["angle_beta"]  = float(np.rad2deg(beta ))
+            cell_dict["angle_gamma"] = float(np.rad2deg(gamma))
+        else:
+            cell_dict["length_a"] = "{:6.3f}".format(len_a)
+            cell_dict["length_b"] = "{:6.3f}".format(len_b)
+            cell_dict["length_c"] = "{:6.3f}".format(len_c)
+            cell_dict["angle_alpha"] = "{:5.3f}".format(np.rad2deg(alpha))
+            cell_dict["angle_beta"]  = "{:5.3f}".format(np.rad2deg(beta ))
+            cell_dict["angle_gamma"] = "{:5.3f}".format(np.rad2deg(gamma))
         pdbx_file.set_category("cell", cell_dict, data_block)
 
 
+def _int_column(values, binary):
+    """
+    Create a column of integers for the given file type.
+    """
+    if binary:
+        return np.asarray(values)
+    else:
+        return np.asarray(values).astype(str)
+
+
+def _float_column(values, decimals, binary):
+    """
+    Create a column of floating point values for the given file type.
+    For text files the values are written with the given number of
+    decimals.
+    """
+    if binary:
+        return np.asarray(values)
+    else:
+        return np.array([f"{v:.{decimals}f}" for v in values])
+
+
 def _determine_entity_id(chain_id):
     entity_id = np.zeros(len(chain_id), dtype=int)
     # Dictionary that translates chain_id to entity_id
@@ -504,7 +596,7 @@ def list_assemblies(pdbx_file, data_block=None):
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : str, optional
         The name of the data block.
@@ -538,7 +630,7 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     assembly_id : str
         The assembly to build
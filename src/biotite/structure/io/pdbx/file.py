@@ -6,11 +6,12 @@ __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
 __all__ = ["PDBxFile"]
 
-import shlex
 import copy
 from collections.abc import MutableMapping
 import numpy as np
-from ....file import TextFile
+from ....file import TextFile, InvalidFileError
+from .tokenizer import _tokenize, _extract_column, \
+                       TOKEN_VALUE, TOKEN_MULTILINE, TOKEN_KEY
 
 
 class PDBxFile(TextFile, MutableMapping):
@@ -22,8 +23,7 @@ class PDBxFile(TextFile, MutableMapping):
     category is represented by a dictionary. The dictionary contains
     the entry (e.g. *label_entity_id* in *atom_site*) as key. The
     corresponding values are either strings in *non-looped* categories,
-    or 1-D numpy arrays of string objects in case of *looped*
-    categories.
+    or 1-D numpy arrays of strings in case of *looped* categories.
     
     A category can be changed or added using `set_category()`:
     If a string-valued dictionary is provided, a *non-looped* category
@@ -46,6 +46,8 @@ class PDBxFile(TextFile, MutableMapping):
     the file only the line positions of all categories are checked. The
     time consuming task of dictionary creation is done when
     `get_category()` is called.
+    The content of the category is then split into values by a compiled
+    tokenizer, that handles quoted and multiline values.
     
     Examples
     --------
@@ -112,7 +114,6 @@ class PDBxFile(TextFile, MutableMapping):
         start = -1
         stop = -1
         is_loop = False
-        has_multiline_values = False
         for i, line in enumerate(file.lines):
             # Ignore empty and comment lines
             if not _is_empty(line):
@@ -124,7 +125,6 @@ class PDBxFile(TextFile, MutableMapping):
                     start = -1
                     stop = -1
                     is_loop = False
-                    has_multiline_values = False
                 
                 is_loop_in_line = _is_loop_start(line)
                 category_in_line = _get_category_name(line)
@@ -134,7 +134,7 @@ class PDBxFile(TextFile, MutableMapping):
                     # Add an entry into the dictionary with the old category
                     stop = i
                     file._add_category(data_block, current_category, start,
-                                       stop, is_loop, has_multiline_values)
+                                       stop, is_loop)
                     # Track the new category
                     if is_loop_in_line:
                         # In case of lines with "loop_" the category is in the
@@ -143,18 +143,13 @@ class PDBxFile(TextFile, MutableMapping):
                     is_loop = is_loop_in_line
                     current_category = category_in_line
                     start = i
-                    has_multiline_values = False
-                
-                multiline = _is_multi(line, is_loop)
-                if multiline:
-                    has_multiline_values = True
         # Add the entry for the final category
         # Since at the end of the file the end of the category
         # is not determined by the start of a new one,
         # this needs to be handled separately
         stop = len(file.lines)
         file._add_category(data_block, current_category, start,
-                           stop, is_loop, has_multiline_values)
+                           stop, is_loop)
         return file
     
     
@@ -174,7 +169,8 @@ class PDBxFile(TextFile, MutableMapping):
         return sorted(blocks)
     
     
-    def get_category(self, category, block=None, expect_looped=False):
+    def get_category(self, category, block=None, expect_looped=False,
+                     keys=None):
         """
         Get the dictionary for a given category.
         
@@ -190,16 +186,42 @@ class PDBxFile(TextFile, MutableMapping):
             arrays (only if the category exists):
             If the category is *non-looped*, each array will contain
             only one element.
+        keys : iterable object of str, optional
+            If given, only the values for these keys are parsed and
+            returned.
+            Keys that are not contained in the category are ignored.
+            For large looped categories, parsing only the required keys
+            saves time and memory.
+            By default, all keys are parsed.
             
         Returns
         -------
-        category_dict : dict of (str or ndarray, dtype=str) or None
+        category_dict : dict of (str or ndarray, dtype=object) or None
             A entry keyed dictionary. The corresponding values are
             strings or array of strings for *non-looped* and
             *looped* categories, respectively.
             Returns None, if the data block does not contain the given
             category.
         """
+        category_dict = self._get_category(
+            category, block, expect_looped, keys
+        )
+        if category_dict is None:
+            return None
+        # Object arrays allow assigning strings of any length
+        return {
+            key: val.astype(object) if isinstance(val, np.ndarray) else val
+            for key, val in category_dict.items()
+        }
+    
+    
+    def _get_category(self, category, block=None, expect_looped=False,
+                      keys=None):
+        """
+        Same as :func:`get_category()`, but arrays have a fixed-width
+        string *dtype* instead of being object arrays, which is faster
+        for large categories.
+        """
         if block is None:
             block = self.get_block_names()[0]
         category_info = self._categories.get((block, category))
@@ -208,60 +230,19 @@ class PDBxFile(TextFile, MutableMapping):
         start = category_info["start"]
         stop = category_info["stop"]
         is_loop = category_info["loop"]
-        is_multilined = category_info["multiline"]
-        
-        if is_multilined:
-            # Convert multiline values into singleline values
-            prelines = [line.strip() for line in self.lines[start:stop]
-                         if not _is_empty(line) and not _is_loop_start(line)]
-            lines = (len(prelines)) * [None]
-            # lines index
-            k = 0
-            # prelines index
-            i = 0
-            while i < len(prelines):
-                if prelines[i][0] == ";":
-                    # multiline values
-                    multi_line_str = prelines[i][1:]
-                    j = i+1
-                    while prelines[j] != ";":
-                        multi_line_str += prelines[j]
-                        j += 1
-                    lines[k-1] += " " + shlex.quote(multi_line_str)
-                    i = j+1
-                elif not is_loop and prelines[i][0] in ["'",'"']:
-                    # Singleline values where value is in the line
-                    # after the corresponding key
-                    lines[k-1] += " " + prelines[i]
-                    i += 1
-                else:    
-                    # Normal singleline value in the same row as the key
-                    lines[k] = prelines[i]
-                    i += 1
-                    k += 1
-            lines = [line for line in lines if line is not None]
-            
-        else:
-            lines = [line.strip() for line in self.lines[start:stop]
-                     if not _is_empty(line) and not _is_loop_start(line)]
         
+        text = "\n".join(self.lines[start:stop])
+        if keys is not None:
+            keys = set(keys)
         if is_loop:
-            # Special optimization for "atom_site":
-            # Even if the values are quote protected,
-            # no whitespace is expected in escaped values
-            # Therefore slow shlex.split() call is not necessary
-            if category == "atom_site":
-                whitespace_values = False
-            else:
-                whitespace_values = True
-            category_dict = _process_looped(lines, whitespace_values)
+            category_dict = _process_looped(text, keys)
         else:
-            category_dict = _process_singlevalued(lines)
+            category_dict = _process_singlevalued(text, keys)
         
         if expect_looped:
             if not is_loop:
-                for key, val in category_dict:
-                    category_dict[key] = np.array([val], dtype=object)
+                for key, val in category_dict.items():
+                    category_dict[key] = np.array([val])
 
         return category_dict
             
@@ -397,8 +378,6 @@ class PDBxFile(TextFile, MutableMapping):
             # Update category info
             category_info["start"] = category_start
             category_info["stop"] = category_start + len(newlines)
-            # When writing a category no multiline values are used
-            category_info["multiline"] = False
             category_info["loop"] = is_looped
         elif block in self.get_block_names():
             # Data block exists but not the category
@@ -414,7 +393,7 @@ class PDBxFile(TextFile, MutableMapping):
             len_diff = len(newlines)
             self.lines[category_start:category_start] = newlines
             self._add_category(block, category, category_start, category_stop,
-                               is_looped, is_multilined=False)
+                               is_looped)
         else:
             # The data block does not exist
             # Put the begin of data block in front of newlines
@@ -431,7 +410,7 @@ class PDBxFile(TextFile, MutableMapping):
             len_diff = len(newlines)-2
             self.lines[last_stop:last_stop] = newlines
             self._add_category(block, category, category_start, category_stop,
-                               is_looped, is_multilined=False)
+                               is_looped)
         # Update start and stop of all categories appearing after the
         # changed/added category
         for category_info in self._categories.values():
@@ -499,72 +478,94 @@ class PDBxFile(TextFile, MutableMapping):
             )
 
 
-    def _add_category(self, block, category_name,
-                      start, stop, is_loop, is_multilined):
+    def _add_category(self, block, category_name, start, stop, is_loop):
         # Before the first category starts,
         # the current_category is None
         # This is checked before adding an entry
         if category_name is not None:
             self._categories[
-                (block, category_name)] = {"start"     : start,
-                                           "stop"      : stop,
-                                           "loop"      : is_loop,
-                                           "multiline" : is_multilined}
+                (block, category_name)] = {"start" : start,
+                                           "stop"  : stop,
+                                           "loop"  : is_loop}
     
     
-def _process_singlevalued(lines):
+def _process_singlevalued(text, selected_keys):
+    text, is_ascii = _encode(text)
+    types, starts, stops = _tokenize(text)
     category_dict = {}
-    for line in lines:
-        parts = shlex.split(line)
-        key = parts[0].split(".")[1]
-        value = parts[1]
-        category_dict[key] = value
+    key = None
+    for token_type, start, stop in zip(types, starts, stops):
+        token = text[start:stop].decode("utf-8")
+        if token_type == TOKEN_KEY:
+            key = token.split(".")[1]
+        elif token_type == TOKEN_VALUE or token_type == TOKEN_MULTILINE:
+            if key is None:
+                raise InvalidFileError(f"Value '{token}' has no key")
+            if selected_keys is None or key in selected_keys:
+                if token_type == TOKEN_MULTILINE:
+                    token = _join_multiline(token)
+                category_dict[key] = token
+            key = None
     return category_dict
 
 
-def _process_looped(lines, whitepace_values):
+def _process_looped(text, selected_keys):
+    text, is_ascii = _encode(text)
+    types, starts, stops = _tokenize(text)
+    
+    is_key = (types == TOKEN_KEY)
+    keys = [
+        text[start:stop].decode("utf-8").split(".")[1]
+        for start, stop in zip(starts[is_key], stops[is_key])
+    ]
+    is_value = (types == TOKEN_VALUE) | (types == TOKEN_MULTILINE)
+    is_multiline = (types[is_value] == TOKEN_MULTILINE)
+    starts = starts[is_value]
+    stops = stops[is_value]
+    if len(keys) == 0:
+        raise InvalidFileError("Looped category has no keys")
+    if len(starts) % len(keys) != 0:
+        raise InvalidFileError(
+            f"Looped category has {len(keys)} keys, "
+            f"but {len(starts)} values, which is not a multiple"
+        )
+    
     category_dict = {}
-    keys = []
-    # Array index
-    i = 0
-    # Dictionary key index
-    j = 0
-    for line in lines:
-        if line[0] == "_":
-            # Key line
-            key = line.split(".")[1]
-            keys.append(key)
-            # Pessimistic array allocation
-            # numpy array filled with strings
-            category_dict[key] = np.zeros(len(lines), dtype=object)
-            keys_length = len(keys)
-        else:
-            # If whitespace is expected in quote protected values,
-            # use standard shlex split
-            # Otherwise use much more faster whitespace split
-            # and quote removal if applicable,
-            # bypassing the slow shlex module 
-            if whitepace_values:
-                values = shlex.split(line)
-            else:
-                values = line.split()
-                for k in range(len(values)):
-                    # Remove quotes
-                    if ((values[k][0] == '"' and values[k][-1] == '"') or
-                        (values[k][0] == "'" and values[k][-1] == "'")):
-                            values[k] = values[k][1:-1]
-            for value in values:
-                category_dict[keys[j]][i] = value
-                j += 1
-                if j == keys_length:
-                    # If all keys have been filled with a value,
-                    # restart with first key with incremented index
-                    j = 0
-                    i += 1
-    for key in category_dict.keys():
-        # Trim to correct size
-        category_dict[key] = category_dict[key][:i]
+    # The values are given row-wise
+    # -> every n-th value belongs to the same key
+    for i, key in enumerate(keys):
+        if selected_keys is not None and key not in selected_keys:
+            # Skip the conversion of unused columns
+            continue
+        column = _extract_column(
+            text, starts[i::len(keys)], stops[i::len(keys)], is_ascii
+        )
+        multiline_indices = np.where(is_multiline[i::len(keys)])[0]
+        if len(multiline_indices) > 0:
+            column = column.tolist()
+            for j in multiline_indices:
+                column[j] = _join_multiline(column[j])
+            column = np.array(column, dtype=str)
+        category_dict[key] = column
     return category_dict
+
+
+def _encode(text):
+    """
+    Encode the text for the tokenizer and check, whether it contains
+    only ASCII characters.
+    """
+    return text.encode("utf-8"), text.isascii()
+
+
+def _join_multiline(value):
+    """
+    Convert the raw content of a multiline value into a single line,
+    by removing the line breaks and the surrounding whitespace of the
+    subsequent lines.
+    """
+    lines = value.split("\n")
+    return lines[0].rstrip() + "".join([line.strip() for line in lines[1:]])
     
 
 def _is_empty(line):
@@ -582,13 +583,6 @@ def _is_loop_start(line):
     return line.startswith("loop_")
 
 
-def _is_multi(line, is_loop):
-    if is_loop:
-        return line[0] == ";"
-    else:
-        return line[0] in [";","'",'"']
-
-
 def _get_category_name(line):
     if line[0] != "_":
         return None
@@ -0,0 +1,228 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module contains the compiled tokenizer for the content of
+PDBx/mmCIF categories.
+"""
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = []
+
+cimport cython
+cimport numpy as np
+from libc.string cimport memcpy
+
+import numpy as np
+from ....file import InvalidFileError
+
+ctypedef np.uint8_t uint8
+ctypedef np.uint32_t uint32
+ctypedef np.int64_t int64
+
+
+# The token types
+cdef enum:
+    # A simple or quoted value
+    _VALUE = 0
+    # A multiline value, enclosed by semicolons at the start of the lines
+    _MULTILINE = 1
+    # A key, i.e. '_category.field'
+    _KEY = 2
+    # The 'loop_' keyword
+    _LOOP = 3
+
+TOKEN_VALUE = _VALUE
+TOKEN_MULTILINE = _MULTILINE
+TOKEN_KEY = _KEY
+TOKEN_LOOP = _LOOP
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _tokenize(bytes text not None):
+    """
+    Split the text of a PDBx/mmCIF category into tokens.
+
+    Parameters
+    ----------
+    text : bytes
+        The UTF-8 encoded text.
+
+    Returns
+    -------
+    types : ndarray, dtype=uint8
+        The type of each token.
+    starts, stops : ndarray, dtype=int64
+        The start and exclusive stop position of each token in `text`.
+        For quoted values, the quotes are not part of the token.
+        For multiline values, the enclosing semicolons are not part of
+        the token.
+
+    Notes
+    -----
+    Comments are omitted.
+    """
+    cdef const char* chars = text
+    cdef int64 length = len(text)
+    # Rough estimate of the number of tokens
+    cdef int64 capacity = length // 4 + 16
+    cdef np.ndarray types_array = np.zeros(capacity, dtype=np.uint8)
+    cdef np.ndarray starts_array = np.zeros(capacity, dtype=np.int64)
+    cdef np.ndarray stops_array = np.zeros(capacity, dtype=np.int64)
+    cdef uint8[:] types = types_array
+    cdef int64[:] starts = starts_array
+    cdef int64[:] stops = stops_array
+
+    cdef int64 count = 0
+    cdef int64 i = 0
+    cdef int64 j
+    cdef int64 start, stop
+    cdef uint8 token_type
+    cdef char c, quote
+
+    while i < length:
+        c = chars[i]
+        if _is_whitespace(c):
+            i += 1
+            continue
+
+        if c == b"#":
+            # Comment -> skip until end of line
+            while i < length and chars[i] != b"\n":
+                i += 1
+            continue
+
+        elif c == b";" and (i == 0 or chars[i-1] == b"\n"):
+            # Multiline value: ends at the next line starting with ';'
+            start = i + 1
+            j = start
+            while True:
+                if j >= length:
+                    raise InvalidFileError(
+                        "Multiline value is not terminated"
+                    )
+                if chars[j] == b";" and chars[j-1] == b"\n":
+                    break
+                j += 1
+            # Exclude the line break before the terminal ';'
+            stop = j - 1
+            token_type = _MULTILINE
+            i = j + 1
+
+        elif c == b"'" or c == b'"':
+            # Quoted value: the closing quote must be followed by
+            # whitespace, otherwise it is part of the value
+            quote = c
+            start = i + 1
+            j = start
+            while True:
+                if j >= length or chars[j] == b"\n":
+                    raise InvalidFileError(
+                        "Quoted value is not terminated"
+                    )
+                if chars[j] == quote and (
+                    j + 1 == length or _is_whitespace(chars[j+1])
+                ):
+                    break
+                j += 1
+            stop = j
+            token_type = _VALUE
+            i = j + 1
+
+        else:
+            # Unquoted value, key or keyword
+            start = i
+            while i < length and not _is_whitespace(chars[i]):
+                i += 1
+            stop = i
+            if c == b"_":
+                token_type = _KEY
+            elif stop - start == 5 and _starts_with_loop(chars + start):
+                token_type = _LOOP
+            else:
+                token_type = _VALUE
+
+        if count == capacity:
+            # Enlarge arrays
+            capacity *= 2
+            types_array = np.resize(types_array, capacity)
+            starts_array = np.resize(starts_array, capacity)
+            stops_array = np.resize(stops_array, capacity)
+            types = types_array
+            starts = starts_array
+            stops = stops_array
+        types[count] = token_type
+        starts[count] = start
+        stops[count] = stop
+        count += 1
+
+    return types_array[:count], starts_array[:count], stops_array[:count]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _extract_column(bytes text not None,
+                    int64[:] starts not None, int64[:] stops not None,
+                    bint is_ascii):
+    """
+    Copy the given tokens into a fixed-width string array.
+
+    Parameters
+    ----------
+    text : bytes
+        The UTF-8 encoded text, the tokens refer to.
+    starts, stops : ndarray, dtype=int64
+        The start and exclusive stop position of each token in `text`.
+    is_ascii : bool
+        Whether `text` contains only ASCII characters.
+        In this case the characters are written directly into the
+        unicode string array.
+        Otherwise, the tokens are decoded via *NumPy*.
+
+    Returns
+    -------
+    column : ndarray, dtype=str
+        The tokens.
+        The array width is the length of the longest token.
+    """
+    cdef const uint8* chars = <const uint8*> (<const char*> text)
+    cdef int64 i, j
+    cdef int64 width = 1
+    cdef uint32[:,:] code_points
+    cdef uint8[:,:] column_bytes
+
+    for i in range(starts.shape[0]):
+        if stops[i] - starts[i] > width:
+            width = stops[i] - starts[i]
+
+    if is_ascii:
+        # An unicode string array stores each character
+        # as 32-bit code point
+        column = np.zeros(starts.shape[0], dtype=f"U{width}")
+        code_points = column.view(np.uint32).reshape(-1, width)
+        for i in range(starts.shape[0]):
+            for j in range(stops[i] - starts[i]):
+                code_points[i,j] = chars[starts[i] + j]
+        return column
+    else:
+        column = np.zeros(starts.shape[0], dtype=f"S{width}")
+        column_bytes = column.view(np.uint8).reshape(-1, width)
+        for i in range(starts.shape[0]):
+            if stops[i] > starts[i]:
+                memcpy(
+                    &column_bytes[i,0], chars + starts[i],
+                    stops[i] - starts[i]
+                )
+        return np.char.decode(column, "utf-8")
+
+
+cdef inline bint _is_whitespace(char c):
+    return c == b" " or c == b"\t" or c == b"\n" or c == b"\r"
+
+
+cdef inline bint _starts_with_loop(const char* chars):
+    return chars[0] == b"l" and chars[1] == b"o" and chars[2] == b"o" \
+        and chars[3] == b"p" and chars[4] == b"_"
@@ -4,9 +4,14 @@
 
 __name__ = "biotite.structure.io"
 __author__ = "Patrick Kunzmann"
-__all__ = ["TrajectoryFile"]
+__all__ = ["TrajectoryFile", "TrajectoryWriter"]
 
 import abc
+import os
+import queue
+import shutil
+import tempfile
+import threading
 import numpy as np
 from ..atoms import AtomArray, AtomArrayStack, stack, from_template
 from ...file import File
@@ -32,6 +37,15 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
     The same is true, when setting data in the file.
     Therefore, it is strongly recommended to make a copy of the
     respective array, if the array is modified.
+
+    For formats that support it (*XTC* and *TRR*), a frame offset index
+    can be created via :func:`build_index()`.
+    It is stored next to the trajectory file and allows jumping to
+    arbitrary frames without decoding the preceding ones.
+    This enables reading arbitrary frames with :func:`read_frames()`
+    and reading disjoint frame ranges in parallel, e.g. by giving
+    different `start` and `stop` values to :func:`read()` in multiple
+    worker processes.
     """
     
     def __init__(self):
@@ -102,41 +116,51 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             if step is not None and chunk_size % step != 0:
                 chunk_size = ((chunk_size // step) + 1) * step
 
-        traj_type = cls.traj_type()
-        with traj_type(file_name, "r") as f:
+        offsets = cls._load_index(file_name)
+        with cls._open(file_name, offsets) as f:
+            if offsets is not None:
+                # The index allows jumping directly to each frame
+                frames = np.arange(len(offsets))[start:stop:step]
+                result = TrajectoryFile._read_frames(
+                    f, frames, atom_i, chunk_size
+                )
+            else:
+                if start is None:
+                    start = 0
+                # Discard atoms before start
+                if start != 0:
+                    if chunk_size is None or chunk_size > start:
+                        f.read(
+                            n_frames=start, stride=None, atom_indices=atom_i
+                        )
+                    else:
+                        TrajectoryFile._read_chunk_wise(
+                            f, start, None, atom_i, chunk_size, discard=True
+                        )
             
-            if start is None:
-                start = 0
-            # Discard atoms before start
-            if start != 0:
-                if chunk_size is None or chunk_size > start:
-                    f.read(n_frames=start, stride=None, atom_indices=atom_i)
+                # The upcoming frames are saved
+                # Calculate the amount of frames to be read
+                if stop is None:
+                    n_frames = None
                 else:
-                    TrajectoryFile._read_chunk_wise(
-                        f, start, None, atom_i, chunk_size, discard=True
-                    )
+                    n_frames = stop-start
+                if step is not None and n_frames is not None:
+                    # Divide number of frames by 'step' in order to
+                    # convert 'step' into 'stride'
+                    # Since the 0th frame is always included,
+                    # the number of frames is decremented before
+                    # division and incremented afterwards again
+                    n_frames = ((n_frames - 1) // step) + 1
             
-            # The upcoming frames are saved
-            # Calculate the amount of frames to be read
-            if stop is None:
-                n_frames = None
-            else:
-                n_frames = stop-start
-            if step is not None and n_frames is not None:
-                # Divide number of frames by 'step' in order to convert
-                # 'step' into 'stride'
-                # Since the 0th frame is always included,
-                # the number of frames is decremented before division
-                # and incremented afterwards again
-                n_frames = ((n_frames - 1) // step) + 1
-            
-            # Read frames
-            if chunk_size is None:
-                result = f.read(n_frames, stride=step, atom_indices=atom_i)
-            else:
-                result = TrajectoryFile._read_chunk_wise(
-                    f, n_frames, step, atom_i, chunk_size, discard=False
-                )
+                # Read frames
+                if chunk_size is None:
+                    result = f.read(
+                        n_frames, stride=step, atom_indices=atom_i
+                    )
+                else:
+                    result = TrajectoryFile._read_chunk_wise(
+                        f, n_frames, step, atom_i, chunk_size, discard=False
+                    )
         
         # nm to Angstrom
         coord, box, time = cls.process_read_values(result)
@@ -149,7 +173,7 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
 
     @classmethod
     def read_iter(cls, file_name, start=None, stop=None, step=None,
-                  atom_i=None):
+                  atom_i=None, prefetch=0):
         """
         Create an iterator over each frame of the given trajectory file
         in the selected range.
@@ -173,6 +197,13 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
         atom_i : ndarray, dtype=int, optional
             If this parameter is set, only the atoms at the given
             indices are read from each frame.
+        prefetch : int, optional
+            If this value is greater than 0, the frames are read in a
+            background thread, while the consumer processes the current
+            frame.
+            At most `prefetch` decoded frames are kept in memory ahead
+            of the consumer.
+            By default, frames are read only when they are requested.
         
         Yields
         ------
@@ -191,55 +222,133 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
         -----
         The `step` parameter does currently not work for *DCD* files.
         """
-        traj_type = cls.traj_type()
-        with traj_type(file_name, "r") as f:
-            
-            if start is None:
-                start = 0
-            # Discard atoms before start
-            if start != 0:
-                f.read(n_frames=start, stride=None, atom_indices=atom_i)
-            
-            # The upcoming frames are read
-            # Calculate the amount of frames to be read
-            if stop is None:
-                n_frames = None
-            else:
-                n_frames = stop-start
-            if step is not None and n_frames is not None:
-                # Divide number of frames by 'step' in order to convert
-                # 'step' into 'stride'
-                # Since the 0th frame is always included,
-                # the number of frames is decremented before division
-                # and incremented afterwards again
-                n_frames = ((n_frames - 1) // step) + 1
-            
-            # Read frames
-            frame_i = 0
-            while True:
-                if n_frames is not None and frame_i >= n_frames:
-                    # Stop frame reached -> stop interation
-                    break
-                # Read one frame per 'yield'
-                result = f.read(1, stride=step, atom_indices=atom_i)
-                if len(result[0]) == 0:
-                    # Empty array was read
-                    # -> no frames left -> stop interation
-                    break
-                coord, box, time = cls.process_read_values(result)
-                # Only one frame
-                # -> only one element in first dimension
-                # -> remove first dimension
-                coord = coord[0]
-                box = box[0] if box is not None else None
-                time = float(time[0]) if time is not None else None
-                yield coord, box, time
-                frame_i += 1
+        frames = cls._read_iter_frames(file_name, start, stop, step, atom_i)
+        if prefetch > 0:
+            frames = TrajectoryFile._prefetch(frames, prefetch)
+        yield from frames
+    
+
+    @classmethod
+    def read_frames(cls, file_name, frames, atom_i=None):
+        """
+        Read the frames at the given indices from a trajectory file.
+
+        In contrast to :func:`read()`, the frames may be an arbitrary
+        selection of frames.
+        If a frame offset index was created via :func:`build_index()`,
+        it is used to jump directly to the selected frames.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the file to be read.
+            A file-like-object cannot be used.
+        frames : iterable object of int
+            The indices of the frames to be read.
+            The frames appear in the returned file in the given order.
+            The index starts at 0.
+        atom_i : ndarray, dtype=int, optional
+            If this parameter is set, only the atoms at the given
+            indices are read from each frame.
+
+        Returns
+        -------
+        file_object : TrajectoryFile
+            The trajectory file containing the selected frames.
+
+        Notes
+        -----
+        This method is only supported by formats that support a frame
+        offset index, i.e. *XTC* and *TRR*.
+        """
+        if not cls.supports_index():
+            raise NotImplementedError(
+                f"'{cls.__name__}' does not support random frame access"
+            )
+        frames = np.asarray(frames, dtype=np.int64)
+        if frames.ndim != 1:
+            raise IndexError("Frame indices must be one-dimensional")
+
+        offsets = cls._load_index(file_name)
+        with cls._open(file_name, offsets) as f:
+            n_frames = len(f.offsets)
+            if len(frames) > 0 and (
+                frames.min() < -n_frames or frames.max() >= n_frames
+            ):
+                raise IndexError(
+                    f"The file contains only {n_frames} frames"
+                )
+            frames = np.where(frames < 0, frames + n_frames, frames)
+            result = TrajectoryFile._read_frames(f, frames, atom_i)
+
+        file = cls()
+        coord, box, time = cls.process_read_values(result)
+        file.set_coord(coord)
+        file.set_box(box)
+        file.set_time(time)
+        return file
+    
+
+    @classmethod
+    def build_index(cls, file_name):
+        """
+        Create a frame offset index for the given trajectory file.
+
+        The index contains the byte offset of each frame in the file.
+        It is stored in a file next to the trajectory, whose name is
+        the trajectory file name with an appended ``.idx.npz``.
+        The index is used automatically by :func:`read()`,
+        :func:`read_iter()` and :func:`read_frames()`, to jump directly
+        to the requested frames.
+        If the trajectory file is changed afterwards, the index becomes
+        outdated and is ignored, until it is built again.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the trajectory file.
+
+        Returns
+        -------
+        offsets : ndarray, dtype=int64
+            The byte offset of each frame in the trajectory file.
+
+        Notes
+        -----
+        This method is only supported by formats that support a frame
+        offset index, i.e. *XTC* and *TRR*.
+        """
+        if not cls.supports_index():
+            raise NotImplementedError(
+                f"'{cls.__name__}' does not support a frame offset index"
+            )
+        with cls.traj_type()(file_name, "r") as f:
+            offsets = np.asarray(f.offsets, dtype=np.int64)
+        np.savez(
+            TrajectoryFile._index_file_name(file_name),
+            offsets=offsets, file_size=os.path.getsize(file_name)
+        )
+        return offsets
+    
+
+    @classmethod
+    def supports_index(cls):
+        """
+        Whether this trajectory file format supports a frame offset
+        index.
+
+        Returns
+        -------
+        supported : bool
+            True, if :func:`build_index()` and :func:`read_frames()`
+            are supported for this format.
+        """
+        return False
     
 
     @classmethod
     def read_iter_structure(cls, file_name, template, start=None, stop=None,
-                            step=None, atom_i=None):
+                            step=None, atom_i=None, prefetch=0):
         """
         Create an iterator over each frame of the given trajectory file
         in the selected range.
@@ -274,6 +383,13 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
         atom_i : ndarray, dtype=int, optional
             If this parameter is set, only the atoms at the given
             indices are read from each frame.
+        prefetch : int, optional
+            If this value is greater than 0, the frames are read in a
+            background thread, while the consumer processes the current
+            frame.
+            At most `prefetch` decoded frames are kept in memory ahead
+            of the consumer.
+            By default, frames are read only when they are requested.
         
         Yields
         ------
@@ -301,7 +417,7 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
                 f"not '{type(template).__name__}'"
             )
         for coord, box, _ in cls.read_iter(
-            file_name, start, stop, step, atom_i
+            file_name, start, stop, step, atom_i, prefetch
         ):
             frame = template.copy()
             frame.coord = coord
@@ -325,6 +441,39 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             f.write(**param)
     
 
+    @classmethod
+    def open_writer(cls, file_name, append=False):
+        """
+        Open a writer, that writes frames successively into a
+        trajectory file.
+
+        In contrast to :func:`write()`, the frames do not need to be
+        in memory at the same time:
+        Each chunk of frames given to
+        :func:`TrajectoryWriter.write_frames()` or
+        :func:`TrajectoryWriter.write_structure()` is written directly
+        into the file.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the file to be written to.
+            A file-like-object cannot be used.
+        append : bool, optional
+            If true, the frames are appended to an existing trajectory
+            file.
+            Otherwise, the file is overwritten.
+
+        Returns
+        -------
+        writer : TrajectoryWriter
+            The writer for the trajectory file.
+            It should be used as context manager or closed via
+            :func:`TrajectoryWriter.close()` after writing.
+        """
+        return TrajectoryWriter(cls, file_name, append)
+    
+
     def get_coord(self):
         """
         Extract only the atom coordinates from the trajectory file.
@@ -539,7 +688,45 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             respective :func:`mdtraj.TrajectoryFile.write()` method.
         """
         pass
+    
 
+    @classmethod
+    def _open(cls, file_name, offsets=None):
+        """
+        Open the MDTraj trajectory file in read mode.
+        If frame offsets are given, MDTraj does not need to scan the
+        file for them.
+        """
+        f = cls.traj_type()(file_name, "r")
+        if offsets is not None:
+            f.offsets = offsets
+        return f
+    
+
+    @classmethod
+    def _load_index(cls, file_name):
+        """
+        Load the frame offsets from the index file of the given
+        trajectory file.
+        Return None, if no index exists or if the index is outdated.
+        """
+        if not cls.supports_index():
+            return None
+        index_file_name = TrajectoryFile._index_file_name(file_name)
+        if not os.path.isfile(index_file_name):
+            return None
+        with np.load(index_file_name, allow_pickle=False) as index:
+            if index["file_size"] != os.path.getsize(file_name) or \
+               os.path.getmtime(index_file_name) \
+               < os.path.getmtime(file_name):
+                return None
+            return index["offsets"]
+    
+
+    @staticmethod
+    def _index_file_name(file_name):
+        return file_name + ".idx.npz"
+    
 
     def _check_model_count(self, array):
         """
@@ -616,4 +803,329 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
                     result[i] = None
             return tuple(result)
         else:
-            return None
\ No newline at end of file
+            return None
+    
+
+    @staticmethod
+    def _read_frames(file, frames, atom_i, chunk_size=None):
+        """
+        Read the frames at the given indices from an opened MDTraj
+        trajectory file, that supports seeking.
+
+        Each run of consecutive frames is read at once, or in chunks of
+        at most `chunk_size` frames.
+        The frames are returned in the given order.
+        """
+        if len(frames) == 0:
+            # Return empty arrays, like reading beyond the end of file
+            return file.read(0, atom_indices=atom_i)
+        unique_frames, order = np.unique(frames, return_inverse=True)
+        run_starts = np.where(np.diff(unique_frames, prepend=-2) != 1)[0]
+        run_stops = np.append(run_starts[1:], len(unique_frames))
+        chunks = []
+        for run_start, run_stop in zip(run_starts, run_stops):
+            file.seek(unique_frames[run_start])
+            remaining_frames = run_stop - run_start
+            while remaining_frames > 0:
+                if chunk_size is None:
+                    n = remaining_frames
+                else:
+                    n = min(remaining_frames, chunk_size)
+                chunks.append(file.read(n, atom_indices=atom_i))
+                remaining_frames -= n
+        
+        result = [None] * len(chunks[0])
+        for i in range(len(chunks[0])):
+            if chunks[0][i] is not None:
+                # Bring the frames into the requested order
+                result[i] = np.concatenate(
+                    [chunk[i] for chunk in chunks]
+                )[order]
+        return tuple(result)
+    
+
+    @classmethod
+    def _read_iter_frames(cls, file_name, start, stop, step, atom_i):
+        """
+        Yield the coordinates, box and time of each frame in the
+        selected range from the given trajectory file.
+        """
+        offsets = cls._load_index(file_name)
+        with cls._open(file_name, offsets) as f:
+            for result in cls._read_iter_values(
+                f, offsets, start, stop, step, atom_i
+            ):
+                coord, box, time = cls.process_read_values(result)
+                # Only one frame
+                # -> only one element in first dimension
+                # -> remove first dimension
+                coord = coord[0]
+                box = box[0] if box is not None else None
+                time = float(time[0]) if time is not None else None
+                yield coord, box, time
+    
+
+    @staticmethod
+    def _prefetch(iterator, n_prefetch):
+        """
+        Yield the items of the given iterator, while the upcoming items
+        are already obtained in a background thread.
+
+        At most `n_prefetch` items are buffered.
+        Exceptions raised in the background thread are reraised in the
+        consumer.
+        If the consumer stops the iteration early, the background
+        thread stops as well and the iterator is closed.
+        """
+        buffer = queue.Queue(maxsize=n_prefetch)
+        stop_event = threading.Event()
+        # Marks the end of the iterator
+        sentinel = object()
+
+        def put(item):
+            # Use a timeout to be able to react to a stopped consumer
+            while not stop_event.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for item in iterator:
+                    if not put((item, None)):
+                        return
+                put((sentinel, None))
+            except Exception as e:
+                put((sentinel, e))
+            finally:
+                iterator.close()
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, exception = buffer.get()
+                if exception is not None:
+                    raise exception
+                if item is sentinel:
+                    break
+                yield item
+        finally:
+            stop_event.set()
+            thread.join()
+    
+
+    @classmethod
+    def _read_iter_values(cls, file, offsets, start, stop, step, atom_i):
+        """
+        Yield the raw values of each frame in the selected range from
+        the opened MDTraj trajectory file.
+        """
+        if offsets is not None:
+            # The index allows jumping directly to each frame
+            for frame in np.arange(len(offsets))[start:stop:step]:
+                file.seek(frame)
+                yield file.read(1, atom_indices=atom_i)
+            return
+
+        if start is None:
+            start = 0
+        # Discard atoms before start
+        if start != 0:
+            file.read(n_frames=start, stride=None, atom_indices=atom_i)
+        
+        # The upcoming frames are read
+        # Calculate the amount of frames to be read
+        if stop is None:
+            n_frames = None
+        else:
+            n_frames = stop-start
+        if step is not None and n_frames is not None:
+            # Divide number of frames by 'step' in order to convert
+            # 'step' into 'stride'
+            # Since the 0th frame is always included,
+            # the number of frames is decremented before division
+            # and incremented afterwards again
+            n_frames = ((n_frames - 1) // step) + 1
+        
+        # Read frames
+        frame_i = 0
+        while True:
+            if n_frames is not None and frame_i >= n_frames:
+                # Stop frame reached -> stop interation
+                break
+            # Read one frame per 'yield'
+            result = file.read(1, stride=step, atom_indices=atom_i)
+            if len(result[0]) == 0:
+                # Empty array was read
+                # -> no frames left -> stop interation
+                break
+            yield result
+            frame_i += 1
+
+
+class TrajectoryWriter:
+    """
+    A writer that successively writes chunks of frames into a
+    trajectory file.
+
+    This class should not be instantiated directly, but it is created
+    via :func:`TrajectoryFile.open_writer()`.
+    The file is closed, when the writer is used as context manager and
+    the context is left, or when :func:`close()` is called.
+
+    Parameters
+    ----------
+    file_class : type
+        The :class:`TrajectoryFile` subclass representing the format of
+        the written file.
+    file_name : str
+        The path of the file to be written to.
+    append : bool, optional
+        If true, the frames are appended to an existing trajectory
+        file.
+        Otherwise, the file is overwritten.
+        Appending is only supported by formats that consist of
+        independent frame records, i.e. *XTC* and *TRR*.
+
+    Attributes
+    ----------
+    n_frames : int
+        The number of frames written by this writer so far.
+    """
+
+    def __init__(self, file_class, file_name, append=False):
+        self._file_class = file_class
+        self._file_name = file_name
+        self._atom_count = None
+        self._closed = False
+        self.n_frames = 0
+        traj_type = file_class.traj_type()
+        if append:
+            # MDTraj cannot open trajectory files in append mode
+            # -> For formats without a header, where each frame is
+            # an independent record, the chunks are written into
+            # temporary files, whose content is appended to the file
+            # (these are the formats that support a frame offset index)
+            if not file_class.supports_index():
+                raise NotImplementedError(
+                    f"'{file_class.__name__}' does not support appending "
+                    f"frames"
+                )
+            with traj_type(file_name, "r") as f:
+                self._frame_offset = len(f)
+                if self._frame_offset > 0:
+                    # Appended frames must match the existing atom count
+                    f.seek(0)
+                    self._atom_count = f.read(1)[0].shape[1]
+            self._file = None
+        else:
+            self._frame_offset = 0
+            self._file = traj_type(file_name, "w")
+        # Formats that cannot store the simulation time reject it
+        try:
+            file_class().set_time(np.zeros(0))
+            self._has_time = True
+        except NotImplementedError:
+            self._has_time = False
+
+    def write_frames(self, coord, box=None, time=None):
+        """
+        Write a chunk of frames into the trajectory file.
+
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(m,n,3) or shape=(n,3)
+            The atom coordinates for each frame in the chunk.
+        box : ndarray, dtype=float, shape=(m,3,3) or shape=(3,3), optional
+            The box vectors for each frame in the chunk.
+        time : ndarray, dtype=float, shape=(m,), optional
+            The simulation time in *ps* for each frame in the chunk.
+            By default, the time of each frame is its index in the
+            trajectory file, if the format supports storing the
+            simulation time.
+        """
+        if self._closed:
+            raise ValueError("The trajectory writer is already closed")
+        coord = np.asarray(coord)
+        if coord.ndim == 2:
+            coord = coord[np.newaxis, :, :]
+        if box is not None:
+            box = np.asarray(box)
+            if box.ndim == 2:
+                box = box[np.newaxis, :, :]
+        if time is not None:
+            time = np.atleast_1d(time)
+        elif self._has_time:
+            # Continue the frame numbering of the previous chunks,
+            # as MDTraj would start each chunk at time 0
+            first_frame = self._frame_offset + self.n_frames
+            time = np.arange(
+                first_frame, first_frame + len(coord), dtype=np.float32
+            )
+        if self._atom_count is None:
+            self._atom_count = coord.shape[1]
+        elif coord.shape[1] != self._atom_count:
+            raise IndexError(
+                f"{coord.shape[1]} atoms were given, "
+                f"but the previous frames contain {self._atom_count} atoms"
+            )
+
+        # Use a temporary file object to validate the chunk
+        chunk = self._file_class()
+        chunk.set_coord(coord)
+        chunk.set_box(box)
+        chunk.set_time(time)
+        param = self._file_class.prepare_write_values(
+            chunk.get_coord(), chunk.get_box(), chunk.get_time()
+        )
+        if self._file is not None:
+            self._file.write(**param)
+        else:
+            self._append_chunk(param)
+        self.n_frames += len(coord)
+
+    def write_structure(self, structure, time=None):
+        """
+        Write the coordinates and boxes of an atom array (stack) as
+        chunk of frames into the trajectory file.
+
+        The topology information (chain, residue, etc.) is not saved in
+        the file.
+
+        Parameters
+        ----------
+        structure : AtomArray or AtomArrayStack
+            The structure to be written into the trajectory file.
+        time : ndarray, dtype=float, shape=(m,), optional
+            The simulation time for each frame in `structure`.
+        """
+        self.write_frames(structure.coord, structure.box, time)
+
+    def close(self):
+        """
+        Close the trajectory file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._closed = True
+
+    def _append_chunk(self, param):
+        _, suffix = os.path.splitext(self._file_name)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file_name = os.path.join(temp_dir, "chunk" + suffix)
+            with self._file_class.traj_type()(temp_file_name, "w") as f:
+                f.write(**param)
+            with open(temp_file_name, "rb") as src, \
+                 open(self._file_name, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
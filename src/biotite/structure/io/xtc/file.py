@@ -20,6 +20,10 @@ class XTCFile(TrajectoryFile):
         import mdtraj.formats as traj
         return traj.XTCTrajectoryFile
 
+    @classmethod
+    def supports_index(cls):
+        return True
+
     @classmethod
     def process_read_values(cls, read_values):
         # nm to Angstrom
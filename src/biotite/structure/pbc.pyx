@@ -0,0 +1,210 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module contains the compiled kernels for the calculation of
+displacements under periodic boundary conditions.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = []
+
+cimport cython
+cimport numpy as np
+from libc.math cimport round
+
+import numpy as np
+
+ctypedef np.uint8_t uint8
+ctypedef np.float64_t float64
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _minimum_image_displacement(const float64[:,:,:] diff not None,
+                                const float64[:,:,:] box not None,
+                                const uint8[:] orthogonal not None,
+                                float64[:,:,:] disp not None):
+    """
+    Fill in the minimum-image displacement vectors for the given
+    non-PBC-aware displacement vectors.
+
+    Parameters
+    ----------
+    diff : ndarray, dtype=float64, shape=(m,n,3)
+        The non-PBC-aware displacement vectors for *m* models.
+    box : ndarray, dtype=float64, shape=(m,3,3) or shape=(1,3,3)
+        The box vectors for each model.
+        If only one box is given, it is used for all models.
+    orthogonal : ndarray, dtype=bool, shape=(m,) or shape=(1,)
+        Whether the respective box is orthogonal.
+    disp : ndarray, dtype=float64, shape=(m,n,3)
+        The PBC-aware displacement vectors are written into this array.
+
+    Notes
+    -----
+    The displacement is first transformed into fractions of box
+    vectors and each fraction is moved into the interval *[-0.5, 0.5]*.
+    For an orthogonal box this already gives the minimum-image
+    displacement.
+    For a triclinic box, the box vectors are reduced beforehand to
+    short, nearly orthogonal vectors spanning the same lattice.
+    Then all 27 periodic copies with adjacent shifts are tested and the
+    one with the lowest distance is taken.
+    """
+    cdef int model_i, atom_i, box_i, prev_box_i
+    cdef int i, j, k
+    cdef float64 fx, fy, fz
+    cdef float64 x, y, z
+    cdef float64 sx, sy, sz
+    cdef float64 sq_dist, min_sq_dist
+    cdef float64 min_x, min_y, min_z
+    # The (reduced) box of the current model and its inverse
+    cdef float64[3][3] b
+    cdef float64[3][3] inv_b
+    cdef bint is_orthogonal
+
+    if diff.shape[2] != 3 or disp.shape[2] != 3:
+        raise IndexError("Vectors must have 3 dimensions")
+    if disp.shape[0] != diff.shape[0] or disp.shape[1] != diff.shape[1]:
+        raise IndexError("Input and output arrays have different shapes")
+    if box.shape[0] != 1 and box.shape[0] != diff.shape[0]:
+        raise IndexError(
+            f"{box.shape[0]} boxes were given for {diff.shape[0]} models"
+        )
+    if orthogonal.shape[0] != box.shape[0]:
+        raise IndexError("Each box requires an orthogonality flag")
+
+    with nogil:
+        prev_box_i = -1
+        for model_i in range(diff.shape[0]):
+            box_i = model_i if box.shape[0] > 1 else 0
+            if box_i != prev_box_i:
+                is_orthogonal = orthogonal[box_i]
+                for i in range(3):
+                    for j in range(3):
+                        b[i][j] = box[box_i, i, j]
+                if not is_orthogonal:
+                    _reduce_box(b)
+                if not _invert_box(b, inv_b):
+                    with gil:
+                        raise ValueError("The box vectors are linear dependent")
+                prev_box_i = box_i
+            
+            for atom_i in range(diff.shape[1]):
+                x = diff[model_i, atom_i, 0]
+                y = diff[model_i, atom_i, 1]
+                z = diff[model_i, atom_i, 2]
+                # Transform into fractions of box vectors
+                fx = x*inv_b[0][0] + y*inv_b[1][0] + z*inv_b[2][0]
+                fy = x*inv_b[0][1] + y*inv_b[1][1] + z*inv_b[2][1]
+                fz = x*inv_b[0][2] + y*inv_b[1][2] + z*inv_b[2][2]
+                # Move fractions into the central box, i.e. [-0.5, 0.5]
+                fx = fx - round(fx)
+                fy = fy - round(fy)
+                fz = fz - round(fz)
+                # Transform back into coordinates
+                x = fx*b[0][0] + fy*b[1][0] + fz*b[2][0]
+                y = fx*b[0][1] + fy*b[1][1] + fz*b[2][1]
+                z = fx*b[0][2] + fy*b[1][2] + fz*b[2][2]
+
+                if not is_orthogonal:
+                    # In a triclinic box the vector in the central box
+                    # is not necessarily the shortest one
+                    # -> test the adjacent periodic copies
+                    min_x, min_y, min_z = x, y, z
+                    min_sq_dist = x*x + y*y + z*z
+                    for i in range(-1, 2):
+                        for j in range(-1, 2):
+                            for k in range(-1, 2):
+                                sx = x + i*b[0][0] + j*b[1][0] + k*b[2][0]
+                                sy = y + i*b[0][1] + j*b[1][1] + k*b[2][1]
+                                sz = z + i*b[0][2] + j*b[1][2] + k*b[2][2]
+                                sq_dist = sx*sx + sy*sy + sz*sz
+                                if sq_dist < min_sq_dist:
+                                    min_sq_dist = sq_dist
+                                    min_x, min_y, min_z = sx, sy, sz
+                    x, y, z = min_x, min_y, min_z
+
+                disp[model_i, atom_i, 0] = x
+                disp[model_i, atom_i, 1] = y
+                disp[model_i, atom_i, 2] = z
+
+
+@cython.cdivision(True)
+cdef void _reduce_box(float64[3][3] b) nogil:
+    """
+    Replace the box vectors in-place by the shortest vectors spanning
+    the same lattice that can be found by greedy reduction.
+
+    Each vector is repeatedly shortened by subtracting integer
+    multiples of the other vectors (size reduction) or by adding/
+    subtracting both other vectors, until no vector can be shortened
+    anymore.
+    """
+    cdef int i, j, k, l, m, dim
+    cdef int iteration
+    cdef bint changed = True
+    cdef float64 mu, sq_len, new_sq_len
+    cdef float64[3] v
+    # Limit the iterations as safeguard,
+    # reduction of typical boxes requires only a few iterations
+    for iteration in range(100):
+        if not changed:
+            break
+        changed = False
+        for i in range(3):
+            for j in range(3):
+                if i == j:
+                    continue
+                # Size reduction of 'b[i]' with respect to 'b[j]'
+                sq_len = _dot(b[j], b[j])
+                mu = round(_dot(b[i], b[j]) / sq_len)
+                if mu != 0:
+                    for dim in range(3):
+                        b[i][dim] -= mu * b[j][dim]
+                    changed = True
+            # Combination with both other vectors
+            j = (i + 1) % 3
+            k = (i + 2) % 3
+            for l in range(-1, 2, 2):
+                for m in range(-1, 2, 2):
+                    for dim in range(3):
+                        v[dim] = b[i][dim] + l * b[j][dim] + m * b[k][dim]
+                    # Only accept significantly shorter vectors
+                    # to avoid oscillation due to rounding errors
+                    if _dot(v, v) < _dot(b[i], b[i]) * (1 - 1e-10):
+                        for dim in range(3):
+                            b[i][dim] = v[dim]
+                        changed = True
+
+
+cdef inline float64 _dot(float64* u, float64* v) nogil:
+    return u[0]*v[0] + u[1]*v[1] + u[2]*v[2]
+
+
+@cython.cdivision(True)
+cdef bint _invert_box(float64[3][3] b, float64[3][3] inv_b) nogil:
+    """
+    Calculate the inverse of the box matrix.
+    Return false, if the box is singular.
+    """
+    cdef int i, j
+    cdef float64 det = b[0][0] * (b[1][1]*b[2][2] - b[1][2]*b[2][1]) \
+                     - b[0][1] * (b[1][0]*b[2][2] - b[1][2]*b[2][0]) \
+                     + b[0][2] * (b[1][0]*b[2][1] - b[1][1]*b[2][0])
+    if det == 0:
+        return False
+    inv_b[0][0] =  (b[1][1]*b[2][2] - b[1][2]*b[2][1]) / det
+    inv_b[0][1] = -(b[0][1]*b[2][2] - b[0][2]*b[2][1]) / det
+    inv_b[0][2] =  (b[0][1]*b[1][2] - b[0][2]*b[1][1]) / det
+    inv_b[1][0] = -(b[1][0]*b[2][2] - b[1][2]*b[2][0]) / det
+    inv_b[1][1] =  (b[0][0]*b[2][2] - b[0][2]*b[2][0]) / det
+    inv_b[1][2] = -(b[0][0]*b[1][2] - b[0][2]*b[1][0]) / det
+    inv_b[2][0] =  (b[1][0]*b[2][1] - b[1][1]*b[2][0]) / det
+    inv_b[2][1] = -(b[0][0]*b[2][1] - b[0][1]*b[2][0]) / det
+    inv_b[2][2] =  (b[0][0]*b[1][1] - b[0][1]*b[1][0]) / det
+    return True
@@ -8,14 +8,12 @@ This module provides functions to calculate the radial distribution function.
 
 __name__ = "biotite.structure"
 __author__ = "Daniel Bauer, Patrick Kunzmann"
-__all__ = ["rdf"]
+__all__ = ["rdf", "RDFAccumulator"]
 
 from numbers import Integral
 import numpy as np
 from .atoms import Atom, AtomArray, stack, array, coord, AtomArrayStack
 from .box import box_volume
-from .geometry import displacement
-from .util import vector_dot
 from .celllist import CellList
 
 
@@ -184,50 +182,159 @@ def rdf(center, atoms, selection=None, interval=(0, 10), bins=100, box=None,
             "Center, box, and atoms must have the same model count"
         )
 
-    # Calculate distance histogram
-    edges = _calculate_edges(interval, bins)
-    # Make histogram of quared distances to save computation time
-    # of sqrt calculation
-    sq_edges = edges**2
-    threshold_dist = edges[-1]
-    cell_size = threshold_dist
-    disp = []
+    accumulator = RDFAccumulator(interval, bins, periodic)
     for i in range(atoms.stack_depth()):
-        # Use cell list to efficiently preselect atoms that are in range
-        # of the desired bin range
-        cell_list = CellList(atom_coord[i], cell_size, periodic, box[i])
-        # 'cell_radius=1' is used in 'get_atoms_in_cells()'
-        # This is enough to find all atoms that are in the given
-        # interval (and more), since the size of each cell is as large
-        # as the last edge of the bins
-        near_atom_mask = cell_list.get_atoms_in_cells(center[i], as_mask=True)
-        # Calculate distances of each center to preselected atoms
-        # for each center
-        for j in range(center.shape[1]):
-            dist_box = box[i] if periodic else None
-            # Calculate squared distances
-            disp.append(displacement(
-                center[i,j], atom_coord[i, near_atom_mask[j]], box=dist_box
-            ))
-    # Make one array from multiple arrays with different length
-    disp = np.concatenate(disp)
-    sq_distances = vector_dot(disp, disp)
-    hist, _ = np.histogram(sq_distances, bins=sq_edges)
-
-    # Normalize with average particle density (N/V) in each bin
-    bin_volume =   (4 / 3 * np.pi * np.power(edges[1: ], 3)) \
-                 - (4 / 3 * np.pi * np.power(edges[:-1], 3))
-    n_frames = len(atoms)
-    volume = box_volume(box).mean()
-    density = atoms.array_length() / volume
-    g_r = hist / (bin_volume * density * n_frames)
-
-    # Normalize with number of centers
-    g_r /= center.shape[1]
-
-    bin_centers = (edges[:-1] + edges[1:]) * 0.5
-
-    return bin_centers, g_r
+        accumulator.add_frame(center[i], atom_coord[i], box[i])
+    return accumulator.result()
+
+
+class RDFAccumulator:
+    r"""
+    Compute the radial distribution function *g(r)* (RDF)
+    incrementally, frame by frame.
+
+    In contrast to :func:`rdf()`, the frames do not need to be loaded
+    into memory at once:
+    Each frame given to :func:`add_frame()` is directly added to a
+    distance histogram, so the memory consumption is independent of
+    the number of frames.
+    Hence, this class can be fed directly from e.g.
+    :func:`TrajectoryFile.read_iter()`.
+
+    Parameters
+    ----------
+    interval : tuple, optional
+        The range in which the RDF is calculated.
+    bins : int or sequence of scalars, optional
+        Bins for the RDF.
+
+        - If `bins` is an `int`, it defines the number of bins for the
+          given `interval`.
+        - If `bins` is a sequence, it defines the bin edges, ignoring
+          the `interval` parameter.
+
+    periodic : bool, optional
+        Defines if periodic boundary conditions are taken into account.
+
+    See also
+    --------
+    rdf
+
+    Notes
+    -----
+    The histogram is normalized with the average particle density over
+    all added frames.
+    Hence, the result is equal to the output of :func:`rdf()` for the
+    same frames.
+
+    Examples
+    --------
+    Calculate the oxygen-oxygen radial distribution function of water,
+    by adding one model after another.
+
+    >>> from os.path import join
+    >>> waterbox = load_structure(join(path_to_structures, "waterbox.gro"))
+    >>> oxygens = waterbox[:, waterbox.atom_name == 'OW']
+    >>> accumulator = RDFAccumulator(interval=(0.2, 10), bins=49, periodic=True)
+    >>> for model in oxygens:
+    ...     accumulator.add_frame(model, model)
+    >>> bins, g_r = accumulator.result()
+    >>> peak_position = np.argmax(g_r)
+    >>> print(f"{bins[peak_position]/10:.2f} nm")
+    0.29 nm
+    """
+
+    def __init__(self, interval=(0, 10), bins=100, periodic=False):
+        self._edges = _calculate_edges(interval, bins)
+        self._periodic = periodic
+        self._hist = np.zeros(len(self._edges) - 1, dtype=np.int64)
+        self._n_frames = 0
+        # Sum of the box volumes of all frames
+        self._volume = 0.0
+        # Sum of the products of center count and atom count over all
+        # frames, used for normalization
+        self._pair_count = 0
+        self._cell_list = None
+        self._cell_atom_count = 0
+
+    def add_frame(self, center, atoms, box=None):
+        """
+        Add the distances of a single frame to the RDF histogram.
+
+        Parameters
+        ----------
+        center : Atom or AtomArray or ndarray, dtype=float
+            Coordinates or atoms(s) to use as origin(s) for RDF
+            calculation in this frame.
+        atoms : AtomArray or ndarray, dtype=float, shape=(n,3)
+            The distribution is calculated based on these atoms.
+            If an :class:`AtomArray` is given, it must have an
+            associated box, unless `box` is set.
+        box : ndarray, shape=(3,3), optional
+            If this parameter is set, the given box is used instead of
+            the `box` attribute of `atoms`.
+        """
+        if box is None:
+            if isinstance(atoms, AtomArray) and atoms.box is not None:
+                box = atoms.box
+            else:
+                raise ValueError("A box must be supplied")
+        box = np.asarray(box)
+        if box.shape != (3,3):
+            raise ValueError(
+                f"The box must have shape (3,3), but has shape {box.shape}"
+            )
+        center = coord(center)
+        if center.ndim == 1:
+            center = center[np.newaxis, :]
+        atom_coord = coord(atoms)
+
+        if self._cell_list is not None \
+            and self._cell_atom_count == len(atom_coord):
+                # Reuse the cell list from the previous frame
+                self._cell_list.update(atom_coord, box)
+        else:
+            # The size of each cell is as large as the last edge of the
+            # bins, since atoms outside this range are not relevant
+            self._cell_list = CellList(
+                atom_coord, self._edges[-1], self._periodic, box
+            )
+            self._cell_atom_count = len(atom_coord)
+        # Only the distances are required,
+        # the atom indices of the pairs are discarded
+        _, distances = self._cell_list.get_pairs(
+            self._edges[-1], center, return_distances=True
+        )
+        self._hist += np.histogram(distances, bins=self._edges)[0]
+
+        self._n_frames += 1
+        self._volume += box_volume(box)
+        self._pair_count += len(center) * len(atom_coord)
+
+    def result(self):
+        """
+        Get the RDF for all frames added so far.
+
+        Returns
+        -------
+        bins : ndarray, dtype=float, shape=n
+            The centers of the histogram bins.
+        rdf : ndarry, dtype=float, shape=n
+            RDF values for every bin.
+        """
+        if self._n_frames == 0:
+            raise ValueError("No frames have been added yet")
+        edges = self._edges
+        # Normalize with average particle density (N/V) in each bin
+        # and with the number of centers
+        bin_volume =   (4 / 3 * np.pi * np.power(edges[1: ], 3)) \
+                     - (4 / 3 * np.pi * np.power(edges[:-1], 3))
+        mean_volume = self._volume / self._n_frames
+        g_r = self._hist / (bin_volume * self._pair_count / mean_volume)
+
+        bin_centers = (edges[:-1] + edges[1:]) * 0.5
+
+        return bin_centers, g_r
 
 
 def _calculate_edges(interval, bins):
@@ -15,6 +15,7 @@ __all__ = ["get_residue_starts", "apply_residue_wise", "spread_residue_wise",
 
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
+from .segments import apply_segment_wise
 
 
 def get_residue_starts(array, add_exclusive_stop=False):
@@ -114,6 +115,19 @@ def apply_residue_wise(array, data, function, axis=None):
         Residue-wise evaluation of `data` by `function`. The size of the
         first dimension of this array is equal to the amount of
         residues.
+    
+    See also
+    --------
+    apply_chain_wise
+    
+    Notes
+    -----
+    If `function` is :func:`numpy.sum()`, :func:`numpy.nansum()`,
+    :func:`numpy.mean()`, :func:`numpy.min()`, :func:`numpy.max()` or
+    :func:`numpy.count_nonzero()` and `axis` is
+    either *None* or *0*, the residue-wise values are calculated in a
+    single vectorized operation instead of calling `function` for each
+    residue.
         
     Examples
     --------
@@ -162,31 +176,7 @@ def apply_residue_wise(array, data, function, axis=None):
      [ 1.194 10.416  1.130]]
     """
     starts = get_residue_starts(array, add_exclusive_stop=True)
-    # The result array
-    processed_data = None
-    for i in range(len(starts)-1):
-        interval = data[starts[i]:starts[i+1]]
-        if axis == None:
-            value = function(interval)
-        else:
-            value = function(interval, axis=axis)
-        value = function(interval, axis=axis)
-        # Identify the shape of the resulting array by evaluation
-        # of the function return value for the first interval
-        if processed_data is None:
-            if isinstance(value, np.ndarray):
-                # Maximum length of the processed data
-                # is length of interval of size 1 -> length of all IDs
-                # (equal to atom array length)
-                processed_data = np.zeros((len(starts)-1,) + value.shape,
-                                          dtype=value.dtype)
-            else:
-                # Scalar value -> one dimensional result array
-                processed_data = np.zeros(len(starts)-1,
-                                          dtype=type(value))
-        # Write values into result arrays
-        processed_data[i] = value
-    return processed_data
+    return apply_segment_wise(starts, data, function, axis)
 
 
 def spread_residue_wise(array, input_data):
@@ -13,9 +13,10 @@ __all__ = ["sasa"]
 
 cimport cython
 cimport numpy as np
-from libc.stdlib cimport malloc, free
+from cython.parallel cimport prange, threadid
 
 import numpy as np
+from .atoms import AtomArrayStack
 from .celllist import CellList
 from .filter import filter_solvent, filter_monoatomic_ions
 from .info.radii import vdw_radius_protor, vdw_radius_single
@@ -29,10 +30,11 @@ ctypedef np.float32_t float32
 @cython.wraparound(False)
 def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
          bint ignore_ions=True, int point_number=1000,
-         point_distr="Fibonacci", vdw_radii="ProtOr"):
+         point_distr="Fibonacci", vdw_radii="ProtOr", int num_threads=1):
     """
     sasa(array, probe_radius=1.4, atom_filter=None, ignore_ions=True,
-         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr")
+         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr",
+         num_threads=1)
 
     Calculate the Solvent Accessible Surface Area (SASA) of a protein.
     
@@ -44,8 +46,12 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     
     Parameters
     ----------
-    array : AtomArray
+    array : AtomArray or AtomArrayStack
         The protein model to calculate the SASA for.
+        If an :class:`AtomArrayStack` is given, the SASA is calculated
+        for each model.
+        The coordinate independent parts of the calculation, like the
+        assignment of radii, are only performed once in this case.
     probe_radius : float, optional
         The VdW-radius of the solvent molecules (default: 1.4).
     atom_filter : ndarray, dtype=bool, optional
@@ -84,14 +90,21 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
               in the model (e.g. NMR elucidated structures). [3]_
               
         By default *ProtOr* is used.
+    num_threads : int, optional
+        The number of threads the SASA calculation is distributed on.
+        Multithreading requires *Biotite* to be compiled with *OpenMP*
+        support, otherwise the calculation is always single-threaded.
+        By default, a single thread is used.
               
     
     Returns
     -------
-    sasa : ndarray, dtype=bool, shape=(n,)
+    sasa : ndarray, dtype=float, shape=(n,) or shape=(m,n)
         Atom-wise SASA. `NaN` for atoms where SASA has not been 
         calculated
         (solvent atoms, hydrogen atoms (ProtOr), atoms not in `filter`).
+        If `array` is an :class:`AtomArrayStack`, the SASA is given for
+        each model *m*.
         
     References
     ----------
@@ -110,7 +123,10 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
        J Phys Chem, 86, 441-451 (1964).
     
     """
-    cdef int i=0, j=0, k=0, adj_atom_i=0, rel_atom_i=0
+    cdef int i=0
+    
+    if num_threads < 1:
+        raise ValueError("At least one thread is required")
     
     cdef np.ndarray sasa_filter
     cdef np.ndarray occl_filter
@@ -118,10 +134,10 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         # Filter for all atoms to calculate SASA for
         sasa_filter = np.array(atom_filter, dtype=bool)
     else:
-        sasa_filter = np.ones(len(array), dtype=bool)
+        sasa_filter = np.ones(array.array_length(), dtype=bool)
     # Filter for all atoms that are considered for occlusion calculation
     # sasa_filter is subfilter of occlusion_filter
-    occl_filter = np.ones(len(array), dtype=bool)
+    occl_filter = np.ones(array.array_length(), dtype=bool)
     # Remove water residues, since it is the solvent
     filter = ~filter_solvent(array)
     sasa_filter = sasa_filter & filter
@@ -152,13 +168,13 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         filter = (array.element != "H")
         sasa_filter = sasa_filter & filter
         occl_filter = occl_filter & filter
-        radii = np.full(len(array), np.nan, dtype=np.float32)
+        radii = np.full(array.array_length(), np.nan, dtype=np.float32)
         for i in np.arange(len(radii))[occl_filter]:
             rad = vdw_radius_protor(array.res_name[i], array.atom_name[i])
             # 1.8 is default radius
             radii[i] = rad if rad is not None else 1.8
     elif vdw_radii == "Single":
-        radii = np.full(len(array), np.nan, dtype=np.float32)
+        radii = np.full(array.array_length(), np.nan, dtype=np.float32)
         for i in np.arange(len(radii))[occl_filter]:
             rad = vdw_radius_single(array.element[i])
             # 1.5 is default radius
@@ -175,20 +191,23 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
                                                      dtype=np.uint8)
     
     cdef np.ndarray occl_r = radii[occl_filter]
-    # Atom array containing occluding atoms
-    occl_array = array[occl_filter]
     
-    # Memoryviews for coordinates of entire (main) array
-    # and for coordinates of occluding atom array
-    cdef float32[:,:] main_coord = array.coord.astype(np.float32,
-                                                      copy=False)
-    cdef float32[:,:] occl_coord = occl_array.coord.astype(np.float32,
-                                                           copy=False)
+    # Coordinates of entire (main) array
+    # and coordinates of occluding atoms,
+    # both with an additional model dimension
+    cdef np.ndarray main_coord
+    if isinstance(array, AtomArrayStack):
+        main_coord = array.coord.astype(np.float32, copy=False)
+    else:
+        main_coord = array.coord[np.newaxis, ...].astype(
+            np.float32, copy=False
+        )
+    cdef np.ndarray occl_coord = main_coord[:, occl_filter]
     # Memoryviews for sphere points
     cdef float32[:,:] sphere_coord = sphere_points
     # Check if any of these arrays are empty to prevent segfault
-    if     main_coord.shape[0]   == 0 \
-        or occl_coord.shape[0]   == 0 \
+    if     main_coord.shape[1]   == 0 \
+        or occl_coord.shape[1]   == 0 \
         or sphere_coord.shape[0] == 0:
             raise ValueError("Coordinates are empty")
     # Memoryviews for radii of SASA and occluding atoms
@@ -197,119 +216,164 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     cdef float32[:] atom_radii_sq = radii * radii
     cdef float32[:] occl_radii = occl_r
     cdef float32[:] occl_radii_sq = occl_r * occl_r
-    # Memoryview for atomwise SASA
-    cdef float32[:] sasa = np.full(len(array), np.nan, dtype=np.float32)
+    # Atomwise SASA for each model
+    cdef np.ndarray sasa = np.full(
+        (main_coord.shape[0], main_coord.shape[1]), np.nan, dtype=np.float32
+    )
     
     # Area of a sphere point on a unit sphere
     cdef float32 area_per_point = 4.0 * np.pi / point_number
     
-    # Define further statically typed variables
-    # that are needed for SASA calculation
-    cdef int n_accesible = 0
-    cdef float32 radius = 0
-    cdef float32 radius_sq = 0
-    cdef float32 adj_radius = 0
-    cdef float32 adj_radius_sq = 0
-    cdef float32 dist_sq = 0
-    cdef float32 point_x = 0
-    cdef float32 point_y = 0
-    cdef float32 point_z = 0
-    cdef float32 atom_x = 0
-    cdef float32 atom_y = 0
-    cdef float32 atom_z = 0
-    cdef float32 occl_x = 0
-    cdef float32 occl_y = 0
-    cdef float32 occl_z = 0
-    cdef float32[:,:] relevant_occl_coord = None
-    
     # Cell size is as large as the maximum distance, 
     # where two atom can intersect.
     # Therefore intersecting atoms are always in the same or adjacent cell.
-    cell_list = CellList(occl_array, np.max(radii[occl_filter])*2)
+    # The same cell list is reused for all models
+    cell_list = CellList(occl_coord[0], np.max(occl_r)*2)
     cdef np.ndarray cell_indices
-    cdef int[:,:] cell_indices_view
-    cdef int length
-    cdef int max_adj_list_length = 0
-    cdef int array_length = array.array_length()
-
-    cell_indices = cell_list.get_atoms_in_cells(array.coord)
-    cell_indices_view = cell_indices
-    max_adj_list_length = cell_indices.shape[0]
         
     # Later on, this array stores coordinates for actual
     # occluding atoms for a certain atom to calculate the
     # SASA for
-    # The first three indices of the second axis
+    # The first three indices of the last axis
     # are x, y and z, the last one is the squared radius
     # This list is as long as the maximal length of a list of
     # adjacent atoms
-    relevant_occl_coord = np.zeros((max_adj_list_length, 4),
-                                   dtype=np.float32)
+    # Each thread has its own list
+    cdef np.ndarray relevant_occl_coord = np.zeros(
+        (num_threads, 0, 4), dtype=np.float32
+    )
+    
+    # Only the coordinate dependent part is calculated for each model
+    for model_i in range(main_coord.shape[0]):
+        if model_i > 0:
+            cell_list.update(occl_coord[model_i])
+        cell_indices = cell_list.get_atoms_in_cells(main_coord[model_i])
+        if cell_indices.shape[1] > relevant_occl_coord.shape[1]:
+            relevant_occl_coord = np.zeros(
+                (num_threads, cell_indices.shape[1], 4), dtype=np.float32
+            )
+        _model_sasa(
+            main_coord[model_i], occl_coord[model_i], cell_indices,
+            sasa_filter_view, atom_radii, atom_radii_sq,
+            occl_radii, occl_radii_sq, sphere_coord, area_per_point,
+            relevant_occl_coord, sasa[model_i], num_threads
+        )
     
+    if isinstance(array, AtomArrayStack):
+        return sasa
+    else:
+        return sasa[0]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _model_sasa(float32[:,:] main_coord,
+                      float32[:,:] occl_coord,
+                      int[:,:] cell_indices,
+                      np_bool[:] sasa_filter,
+                      float32[:] atom_radii,
+                      float32[:] atom_radii_sq,
+                      float32[:] occl_radii,
+                      float32[:] occl_radii_sq,
+                      float32[:,:] sphere_coord,
+                      float32 area_per_point,
+                      float32[:,:,:] relevant_occl_coord,
+                      float32[:] sasa,
+                      int num_threads):
+    """
+    Calculate the SASA for all filtered atoms in a single model.
+    """
+    cdef int i
     # Actual SASA calculation
-    for i in range(array_length):
+    # The atoms are distributed among the threads
+    for i in prange(main_coord.shape[0], nogil=True,
+                    num_threads=num_threads, schedule="dynamic"):
         # First level: The atoms to calculate SASA for
-        if not sasa_filter_view[i]:
-            # SASA is not calculated for this atom
-            continue
-        n_accesible = point_number
-        atom_x = main_coord[i,0]
-        atom_y = main_coord[i,1]
-        atom_z = main_coord[i,2]
-        radius = atom_radii[i]
-        radius_sq = atom_radii_sq[i]
-        # Find occluding atoms from list of adjacent atoms
-        rel_atom_i = 0
-        for j in range(max_adj_list_length):
-            # Remove all atoms, where the distance to the relevant atom
-            # is larger than the sum of the radii,
-            # since those atoms do not touch
-            # If distance is 0, it is the same atom,
-            # and the atom is removed from the list as well
-            adj_atom_i = cell_indices_view[i,j]
-            if adj_atom_i == -1:
-                # -1 means end of list
+        if sasa_filter[i]:
+            sasa[i] = area_per_point * atom_radii_sq[i] * _accessible_points(
+                main_coord[i,0], main_coord[i,1], main_coord[i,2],
+                atom_radii[i], cell_indices[i],
+                occl_coord, occl_radii, occl_radii_sq, sphere_coord,
+                relevant_occl_coord[threadid()]
+            )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _accessible_points(float32 atom_x, float32 atom_y, float32 atom_z,
+                            float32 radius,
+                            int[:] adj_atom_indices,
+                            float32[:,:] occl_coord,
+                            float32[:] occl_radii,
+                            float32[:] occl_radii_sq,
+                            float32[:,:] sphere_coord,
+                            float32[:,:] relevant_occl_coord) nogil:
+    """
+    Count the sphere points of a single atom, that are not occluded by
+    any of the adjacent atoms.
+
+    `relevant_occl_coord` is a buffer, that is at least as long as
+    `adj_atom_indices`.
+    """
+    cdef int j, k
+    cdef int adj_atom_i
+    cdef int rel_atom_i = 0
+    cdef int n_accesible = sphere_coord.shape[0]
+    cdef float32 adj_radius, adj_radius_sq
+    cdef float32 dist_sq
+    cdef float32 point_x, point_y, point_z
+    cdef float32 occl_x, occl_y, occl_z
+
+    # Find occluding atoms from list of adjacent atoms
+    for j in range(adj_atom_indices.shape[0]):
+        # Remove all atoms, where the distance to the relevant atom
+        # is larger than the sum of the radii,
+        # since those atoms do not touch
+        # If distance is 0, it is the same atom,
+        # and the atom is removed from the list as well
+        adj_atom_i = adj_atom_indices[j]
+        if adj_atom_i == -1:
+            # -1 means end of list
+            break
+        occl_x = occl_coord[adj_atom_i,0]
+        occl_y = occl_coord[adj_atom_i,1]
+        occl_z = occl_coord[adj_atom_i,2]
+        adj_radius = occl_radii[adj_atom_i]
+        adj_radius_sq = occl_radii_sq[adj_atom_i]
+        dist_sq = distance_sq(atom_x, atom_y, atom_z,
+                              occl_x, occl_y, occl_z)
+        if dist_sq != 0 \
+            and dist_sq < (adj_radius+radius) * (adj_radius+radius):
+                relevant_occl_coord[rel_atom_i,0] = occl_x
+                relevant_occl_coord[rel_atom_i,1] = occl_y
+                relevant_occl_coord[rel_atom_i,2] = occl_z
+                relevant_occl_coord[rel_atom_i,3] = adj_radius_sq
+                rel_atom_i += 1
+    for j in range(sphere_coord.shape[0]):
+        # Second level: The sphere points for that atom
+        # Transform sphere point to sphere of current atom
+        point_x = sphere_coord[j,0] * radius + atom_x
+        point_y = sphere_coord[j,1] * radius + atom_y
+        point_z = sphere_coord[j,2] * radius + atom_z
+        for k in range(rel_atom_i):
+            # Third level: Compare point to occluding atoms
+            dist_sq = distance_sq(point_x, point_y, point_z,
+                                  relevant_occl_coord[k, 0],
+                                  relevant_occl_coord[k, 1],
+                                  relevant_occl_coord[k, 2])
+            # Compare squared distance
+            # to squared radius of occluding atom
+            # (Radius is relevant_occl_coord[3])
+            if dist_sq < relevant_occl_coord[k, 3]:
+                # Point is occluded
+                # -> Continue with next point
+                n_accesible -= 1
                 break
-            occl_x = occl_coord[adj_atom_i,0]
-            occl_y = occl_coord[adj_atom_i,1]
-            occl_z = occl_coord[adj_atom_i,2]
-            adj_radius = occl_radii[adj_atom_i]
-            adj_radius_sq = occl_radii_sq[adj_atom_i]
-            dist_sq = distance_sq(atom_x, atom_y, atom_z,
-                                      occl_x, occl_y, occl_z)
-            if dist_sq != 0 \
-                and dist_sq < (adj_radius+radius) * (adj_radius+radius):
-                    relevant_occl_coord[rel_atom_i,0] = occl_x
-                    relevant_occl_coord[rel_atom_i,1] = occl_y
-                    relevant_occl_coord[rel_atom_i,2] = occl_z
-                    relevant_occl_coord[rel_atom_i,3] = adj_radius_sq
-                    rel_atom_i += 1
-        for j in range(sphere_coord.shape[0]):
-            # Second level: The sphere points for that atom
-            # Transform sphere point to sphere of current atom
-            point_x = sphere_coord[j,0] * radius + atom_x
-            point_y = sphere_coord[j,1] * radius + atom_y
-            point_z = sphere_coord[j,2] * radius + atom_z
-            for k in range(rel_atom_i):
-                # Third level: Compare point to occluding atoms
-                dist_sq = distance_sq(point_x, point_y, point_z,
-                                      relevant_occl_coord[k, 0],
-                                      relevant_occl_coord[k, 1],
-                                      relevant_occl_coord[k, 2])
-                # Compare squared distance
-                # to squared radius of occluding atom
-                # (Radius is relevant_occl_coord[3])
-                if dist_sq < relevant_occl_coord[k, 3]:
-                    # Point is occluded
-                    # -> Continue with next point
-                    n_accesible -= 1
-                    break
-        sasa[i] = area_per_point * n_accesible * radius_sq
-    return np.asarray(sasa)
+    return n_accesible
 
 
 cdef inline float32 distance_sq(float32 x1, float32 y1, float32 z1,
-                        float32 x2, float32 y2, float32 z2):
+                                float32 x2, float32 y2, float32 z2) nogil:
     cdef float32 dx = x2 - x1
     cdef float32 dy = y2 - y1
     cdef float32 dz = z2 - z1
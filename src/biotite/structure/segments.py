@@ -0,0 +1,141 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+Utility functions for in internal use in `Bio.Structure` package,
+that handle data for segments of an atom array, such as residues or
+chains.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["apply_segment_wise"]
+
+import numpy as np
+
+
+# NumPy reductions that can be calculated via 'ufunc.reduceat()'
+# for all segments at once, mapped to the respective ufunc
+_REDUCTIONS = {
+    np.sum           : np.add,
+    np.nansum        : np.add,
+    np.mean          : np.add,
+    np.min           : np.minimum,
+    np.max           : np.maximum,
+    np.count_nonzero : np.add,
+}
+
+
+def apply_segment_wise(starts, data, function, axis):
+    """
+    Apply a function to intervals of data, where each interval
+    corresponds to one segment.
+
+    Parameters
+    ----------
+    starts : ndarray, dtype=int
+        The start indices of segments, including the exclusive stop.
+    data : ndarray
+        The data, whose intervals are the parameter for `function`.
+    function : function
+        The `function` must have either the form *f(data)* or
+        *f(data, axis)* in case `axis` is given.
+    axis : int or None
+        This value is given to the `axis` parameter of `function`.
+
+    Returns
+    -------
+    processed_data : ndarray
+        Segment-wise evaluation of `data` by `function`.
+
+    Notes
+    -----
+    If `function` is one of the supported *NumPy* reductions and
+    reduces over the first axis (or over all axes), the result is
+    computed via :func:`numpy.ufunc.reduceat()` for all segments at
+    once.
+    Otherwise `function` is called for each segment.
+    """
+    if _REDUCTIONS.get(function) is not None \
+        and isinstance(data, np.ndarray) \
+        and len(data) > 0 \
+        and (axis is None or axis in (0, -data.ndim)):
+            return _reduce_segment_wise(starts, data, function, axis)
+
+    # The result array
+    processed_data = None
+    for i in range(len(starts)-1):
+        interval = data[starts[i]:starts[i+1]]
+        if axis == None:
+            value = function(interval)
+        else:
+            value = function(interval, axis=axis)
+        # Identify the shape of the resulting array by evaluation
+        # of the function return value for the first interval
+        if processed_data is None:
+            if isinstance(value, np.ndarray):
+                # Maximum length of the processed data
+                # is length of interval of size 1 -> length of all IDs
+                # (equal to atom array length)
+                processed_data = np.zeros((len(starts)-1,) + value.shape,
+                                          dtype=value.dtype)
+            else:
+                # Scalar value -> one dimensional result array
+                processed_data = np.zeros(len(starts)-1,
+                                          dtype=type(value))
+        # Write values into result arrays
+        processed_data[i] = value
+    return processed_data
+
+
+def _reduce_segment_wise(starts, data, function, axis):
+    """
+    Vectorized variant of :func:`apply_segment_wise()` for the
+    reductions in :attr:`_REDUCTIONS`.
+    """
+    ufunc = _REDUCTIONS[function]
+    # Evaluate the function for the first segment
+    # to obtain the same data type as the non-vectorized variant
+    first_interval = data[starts[0]:starts[1]]
+    if axis is None:
+        first_value = function(first_interval)
+    else:
+        first_value = function(first_interval, axis=axis)
+    dtype = np.asarray(first_value).dtype
+
+    if function is np.count_nonzero:
+        values = (data != 0)
+    elif function is np.nansum and data.dtype.kind in ("f", "c"):
+        values = np.where(np.isnan(data), 0, data)
+    else:
+        values = data
+    if axis is None:
+        # Reduce over all axes
+        # -> flatten all axes except the segmented one
+        values = values.reshape(len(values), -1)
+
+    if ufunc is np.add:
+        # Accumulate floating point values in double precision to keep
+        # the rounding error of the sequential summation below the
+        # precision of the result and accumulate integers in the output
+        # data type to avoid overflows
+        if dtype.kind in ("f", "c"):
+            acc_dtype = np.promote_types(dtype, np.float64)
+        else:
+            acc_dtype = dtype
+        reduced = ufunc.reduceat(
+            values, starts[:-1], axis=0, dtype=acc_dtype
+        )
+    else:
+        reduced = ufunc.reduceat(values, starts[:-1], axis=0)
+    if axis is None:
+        reduced = ufunc.reduce(reduced, axis=1)
+
+    if function is np.mean:
+        counts = np.diff(starts)
+        if axis is None:
+            counts *= values.shape[1]
+        reduced /= counts.reshape((-1,) + (1,) * (reduced.ndim - 1))
+
+    return reduced.astype(dtype, copy=False)
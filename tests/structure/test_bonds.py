@@ -195,4 +195,54 @@ def test_connect_via_distances():
 def test_find_connected(bond_list):
     for index in (0,1,2,3,4,6):
         assert struc.find_connected(bond_list, index).tolist() == [0,1,2,3,4,6]
-    assert struc.find_connected(bond_list, 5).tolist() == [5]
\ No newline at end of file
+    assert struc.find_connected(bond_list, 5).tolist() == [5]
+
+
+def test_get_all_bonds(bond_list):
+    """
+    Test whether the bonds obtained in CSR format are equal to the
+    bonds obtained via :func:`get_bonds()` for each atom.
+    """
+    offsets, bonds, bond_types = bond_list.get_all_bonds()
+    assert offsets.shape == (bond_list.get_atom_count() + 1,)
+    assert offsets[-1] == 2 * bond_list.get_bond_count()
+    for i in range(bond_list.get_atom_count()):
+        ref_bonds, ref_types = bond_list.get_bonds(i)
+        assert bonds[offsets[i] : offsets[i+1]].tolist() == ref_bonds.tolist()
+        assert bond_types[offsets[i] : offsets[i+1]].tolist() \
+            == ref_types.tolist()
+
+
+def test_adjacency_invalidation(bond_list):
+    """
+    Test whether modifications of the :class:`BondList` are reflected
+    by :func:`get_bonds()`, after the adjacency index has been
+    created.
+    """
+    assert bond_list.get_bonds(5)[0].tolist() == []
+    bond_list.add_bond(5, 2, struc.BondType.DOUBLE)
+    bonds, bond_types = bond_list.get_bonds(5)
+    assert bonds.tolist() == [2]
+    assert bond_types.tolist() == [struc.BondType.DOUBLE]
+    assert (2, 5) in bond_list
+    bond_list.remove_bond(2, 5)
+    assert bond_list.get_bonds(5)[0].tolist() == []
+    assert (2, 5) not in bond_list
+    bond_list.offset_indices(1)
+    assert bond_list.get_bonds(0)[0].tolist() == []
+    assert bond_list.get_bonds(1)[0].tolist() == [2, 5]
+
+
+def test_find_connected_long_chain():
+    """
+    Test :func:`find_connected()` on a chain of bonds, that is longer
+    than the Python recursion limit.
+    """
+    length = 100000
+    chain = np.stack([np.arange(length-1), np.arange(1, length)], axis=-1)
+    bond_list = struc.BondList(length + 1, chain)
+    connected = struc.find_connected(bond_list, length // 2)
+    assert connected.tolist() == list(range(length))
+    mask = struc.find_connected(bond_list, length, as_mask=True)
+    assert mask.dtype == bool
+    assert np.where(mask)[0].tolist() == [length]
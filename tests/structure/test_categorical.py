@@ -0,0 +1,213 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from os.path import join
+import numpy as np
+import pytest
+import biotite.structure as struc
+import biotite.structure.io as strucio
+import biotite.structure.io.mmtf as mmtf
+import biotite.structure.io.pdbx as pdbx
+from ..util import data_dir, cannot_import
+
+
+CATEGORIES = ["chain_id", "res_name", "atom_name", "element", "ins_code"]
+
+
+@pytest.fixture
+def atoms():
+    return strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+
+
+@pytest.fixture
+def categorical_atoms(atoms):
+    categorical_atoms = atoms.copy()
+    for category in CATEGORIES:
+        categorical_atoms.set_annotation(
+            category, struc.CategoricalArray(atoms.get_annotation(category))
+        )
+    return categorical_atoms
+
+
+def test_conversion():
+    """
+    Encoding and decoding a string array must give the original array.
+    """
+    ref_array = np.array(["CA", "N", "", "CA", "OXT", "N"])
+    categorical = struc.CategoricalArray(ref_array)
+    assert len(categorical.vocabulary) == 4
+    assert categorical.dtype == ref_array.dtype
+    assert np.asarray(categorical).tolist() == ref_array.tolist()
+    assert categorical.astype("U1").tolist() \
+        == ref_array.astype("U1").tolist()
+    assert categorical[1] == "N"
+    assert categorical[1:4].tolist() == ref_array[1:4].tolist()
+
+
+def test_comparison():
+    """
+    Comparisons of a :class:`CategoricalArray` must give the same
+    results as comparisons of the decoded array.
+    """
+    array1 = np.array(["CA", "N", "C", "CA", "OXT", "N"])
+    array2 = np.array(["CA", "C", "C", "CB", "OXT", "O"])
+    cat1 = struc.CategoricalArray(array1)
+    cat2 = struc.CategoricalArray(array2)
+
+    for value in ["CA", "N", "XYZ"]:
+        assert (cat1 == value).tolist() == (array1 == value).tolist()
+        assert (cat1 != value).tolist() == (array1 != value).tolist()
+    assert (cat1 == cat2).tolist() == (array1 == array2).tolist()
+    assert (cat1 == array2).tolist() == (array1 == array2).tolist()
+    assert (cat1[1:] == cat1[:-1]).tolist() \
+        == (array1[1:] == array1[:-1]).tolist()
+    assert np.isin(cat1, ["N", "OXT"]).tolist() \
+        == np.isin(array1, ["N", "OXT"]).tolist()
+    assert np.in1d(cat1, ["N", "OXT"], invert=True).tolist() \
+        == np.in1d(array1, ["N", "OXT"], invert=True).tolist()
+    assert np.array_equal(cat1, struc.CategoricalArray(array1))
+    assert not np.array_equal(cat1, cat2)
+
+
+def test_modification():
+    """
+    Assigning values that are not in the vocabulary must extend it,
+    without affecting other arrays sharing the vocabulary.
+    """
+    ref_array = np.array(["A", "B", "A", "C"])
+    categorical = struc.CategoricalArray(ref_array)
+    sliced = categorical[:2]
+    sliced[0] = "D"
+    ref_array[2:] = ["E", "FG"]
+    categorical[2:] = ["E", "FG"]
+
+    assert categorical.tolist() == ref_array.tolist()
+    assert categorical.tolist() == ["A", "B", "E", "F"]
+    assert sliced.tolist() == ["D", "B"]
+
+    # Large vocabularies require wider codes
+    values = np.array([str(i) for i in range(1000)])
+    categorical[:] = values[:4]
+    concat = np.concatenate([categorical, struc.CategoricalArray(values)])
+    assert concat.tolist() == values[:4].tolist() + values.tolist()
+    assert concat.codes.dtype == np.uint16
+
+
+def test_atom_array(atoms, categorical_atoms):
+    """
+    Operations on an :class:`AtomArray` must retain the categorical
+    annotations and give the same results as with string annotations.
+    """
+    assert categorical_atoms == atoms
+    for category in CATEGORIES:
+        assert isinstance(
+            categorical_atoms.get_annotation(category),
+            struc.CategoricalArray
+        )
+
+    assert struc.filter_amino_acids(categorical_atoms).tolist() \
+        == struc.filter_amino_acids(atoms).tolist()
+    assert struc.filter_backbone(categorical_atoms).tolist() \
+        == struc.filter_backbone(atoms).tolist()
+    assert struc.get_residue_starts(categorical_atoms).tolist() \
+        == struc.get_residue_starts(atoms).tolist()
+
+    mask = atoms.element == "C"
+    subarray = categorical_atoms[:, mask]
+    assert isinstance(subarray.element, struc.CategoricalArray)
+    assert subarray == atoms[:, mask]
+
+    concat = categorical_atoms[0] + categorical_atoms[1]
+    assert isinstance(concat.res_name, struc.CategoricalArray)
+    assert concat == atoms[0] + atoms[1]
+
+    copy = categorical_atoms.copy()
+    assert isinstance(copy.res_name, struc.CategoricalArray)
+    copy.res_name[0] = "ABC"
+    assert categorical_atoms.res_name[0] != "ABC"
+
+    array = categorical_atoms[0]
+    del array[0]
+    assert isinstance(array.atom_name, struc.CategoricalArray)
+    assert array == atoms[0][1:]
+
+
+def test_assignment_truncation():
+    """
+    Assigned strings that are longer than the *dtype* of the array must
+    be truncated, independent of whether they are given as
+    :class:`CategoricalArray` or not.
+    """
+    ref_array = np.array(["A", "B", "C"])
+    ref_array[:2] = ["XY", "Z"]
+    cat1 = struc.CategoricalArray(np.array(["A", "B", "C"]))
+    cat1[:2] = ["XY", "Z"]
+    cat2 = struc.CategoricalArray(np.array(["A", "B", "C"]))
+    cat2[:2] = struc.CategoricalArray(np.array(["XY", "Z"]))
+
+    assert cat1.tolist() == ref_array.tolist()
+    assert cat2.tolist() == ref_array.tolist()
+    assert cat2.dtype == ref_array.dtype
+
+
+def test_bond_detection(atoms, categorical_atoms):
+    """
+    Bond detection must work on structures with categorical
+    annotations.
+    """
+    atoms = atoms[0]
+    categorical_atoms = categorical_atoms[0]
+    assert struc.connect_via_distances(categorical_atoms) \
+        == struc.connect_via_distances(atoms)
+
+
+def test_mmtf_writing(atoms, categorical_atoms):
+    """
+    Writing a structure with categorical annotations to an MMTF file
+    must give the same file content as writing the string annotations.
+    """
+    ref_file = mmtf.MMTFFile()
+    mmtf.set_structure(ref_file, atoms)
+    test_file = mmtf.MMTFFile()
+    mmtf.set_structure(test_file, categorical_atoms)
+    assert mmtf.get_structure(test_file) == mmtf.get_structure(ref_file)
+
+
+def test_bcif_writing(atoms, categorical_atoms):
+    """
+    Writing a structure with categorical annotations to a BinaryCIF
+    file must give the same structure as writing the string
+    annotations.
+    """
+    ref_file = pdbx.BinaryCIFFile()
+    pdbx.set_structure(ref_file, atoms, data_block="test")
+    test_file = pdbx.BinaryCIFFile()
+    pdbx.set_structure(test_file, categorical_atoms, data_block="test")
+    assert pdbx.get_structure(test_file) == pdbx.get_structure(ref_file)
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_loading_multiple(categorical_atoms, workers):
+    """
+    Structures loaded via :func:`load_structures()` must retain the
+    categorical annotations of the template.
+    """
+    template = categorical_atoms[0]
+    paths = [
+        join(data_dir("structure"), f"1l2y.{suffix}")
+        for suffix in ["xtc", "trr"]
+    ]
+    for path, test_array in zip(paths, strucio.load_structures(
+        paths, template=template, workers=workers
+    )):
+        ref_array = strucio.load_structure(path, template=template)
+        assert test_array == ref_array
+        for category in CATEGORIES:
+            assert isinstance(
+                test_array.get_annotation(category), struc.CategoricalArray
+            )
@@ -134,4 +134,124 @@ def test_selection():
     cell_list = struc.CellList(array, cell_size=10, selection=selection)
     test_near_atoms = array[cell_list.get_atoms(array.coord[0], 20.0)]
 
-    assert test_near_atoms == ref_near_atoms
\ No newline at end of file
+    assert test_near_atoms == ref_near_atoms
+
+
+@pytest.mark.parametrize(
+    "cell_size, threshold, periodic, use_selection",
+    itertools.product(
+        [0.5, 1, 2, 5, 10],
+        [2, 5, 10],
+        [False, True],
+        [False, True],
+    )
+)
+def test_get_pairs(cell_size, threshold, periodic, use_selection):
+    """
+    Compare the atom pairs found with :func:`CellList.get_pairs()` with
+    the pairs in the adjacency matrix and check the pair distances.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.mmtf"))
+    
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+
+    if use_selection:
+        np.random.seed(0)
+        selection = np.random.choice((False, True), array.array_length())
+    else:
+        selection = None
+
+    cell_list = struc.CellList(
+        array, cell_size=cell_size, periodic=periodic, selection=selection
+    )
+    test_pairs, test_dist = cell_list.get_pairs(
+        threshold, return_distances=True
+    )
+    
+    matrix = cell_list.create_adjacency_matrix(threshold)
+    # Ignore the diagonal and the lower triangle,
+    # as each pair is only reported once
+    ref_pairs = np.stack(np.where(np.triu(matrix, k=1)), axis=-1)
+    assert test_pairs.tolist() == ref_pairs.tolist()
+    ref_dist = struc.index_distance(array, test_pairs, periodic)
+    assert test_dist == pytest.approx(ref_dist, abs=1e-4)
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_get_pairs_with_coord(periodic):
+    """
+    Compare the pairs found for external positions with the result of
+    :func:`CellList.get_atoms()`.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.mmtf"))
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+    np.random.seed(0)
+    coord = array.coord[np.random.choice(array.array_length(), 100)] \
+            + np.random.rand(100, 3)
+    cell_list = struc.CellList(array, cell_size=5, periodic=periodic)
+    
+    test_pairs = cell_list.get_pairs(5, coord)
+    
+    ref_indices = cell_list.get_atoms(coord, 5)
+    ref_pairs = [
+        (i, j) for i, row in enumerate(ref_indices)
+        for j in np.unique(row[row != -1])
+    ]
+    assert test_pairs.tolist() == [list(pair) for pair in ref_pairs]
+
+
+@pytest.mark.parametrize(
+    "periodic, skin", itertools.product([False, True], [0, 1, 5])
+)
+def test_update(periodic, skin):
+    """
+    Test whether a :class:`CellList` that is updated with the
+    coordinates of each model gives the same results as a
+    :class:`CellList` created for each model.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    if periodic:
+        stack.box = np.array([
+            np.diag(np.max(model.coord, axis=0) - np.min(model.coord, axis=0))
+            for model in stack
+        ])
+    np.random.seed(0)
+    coord = np.random.rand(10, 3) * 10
+    
+    cell_list = struc.CellList(
+        stack[0], cell_size=3, periodic=periodic, skin=skin
+    )
+    for model in stack:
+        cell_list.update(model)
+        ref_cell_list = struc.CellList(model, cell_size=3, periodic=periodic)
+        
+        test_indices = cell_list.get_atoms(coord, 5)
+        ref_indices = ref_cell_list.get_atoms(coord, 5)
+        for test_row, ref_row in zip(test_indices, ref_indices):
+            assert np.unique(test_row[test_row != -1]).tolist() \
+                == np.unique(ref_row[ref_row != -1]).tolist()
+        
+        assert cell_list.get_pairs(5).tolist() \
+            == ref_cell_list.get_pairs(5).tolist()
+        
+        # Atoms found with cell based search
+        # must be a superset of the reference atoms
+        test_mask = cell_list.get_atoms_in_cells(coord, as_mask=True)
+        ref_mask = ref_cell_list.get_atoms_in_cells(coord, as_mask=True)
+        assert (test_mask | ~ref_mask).all()
+
+
+def test_update_invalid_shape():
+    """
+    Expect an exception, if the amount of atoms changes in an update.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))[0]
+    cell_list = struc.CellList(array, cell_size=5)
+    with pytest.raises(IndexError):
+        cell_list.update(array[:-1])
@@ -20,6 +20,12 @@ def test_get_chain_starts(array):
     # All first occurences of a chain id are automatically chain starts
     assert set(ref_starts).issubset(set(test_starts))
 
+def test_apply_chain_wise(array):
+    data = struc.apply_chain_wise(array, np.ones(len(array)), np.sum)
+    assert data.tolist() == [
+        len(chain) for chain in struc.chain_iter(array)
+    ]
+
 def test_get_chains(array):
     assert struc.get_chains(array).tolist() == ["A", "B", "C", "D", "B", "D"]
 
@@ -124,4 +124,25 @@ def test_filter_highest_occupancy_altloc(all_atloc_structure):
     ]
     test_occupancy_sum = np.average(filtered_structure.occupancy)
     
-    assert test_occupancy_sum > ref_occupancy_sum
\ No newline at end of file
+    assert test_occupancy_sum > ref_occupancy_sum
+
+
+@pytest.mark.parametrize("filter_func", ["first", "occupancy"])
+def test_filter_altloc_residues(filter_func):
+    """
+    Check the altloc filters on a small example with multiple residues
+    against known solutions.
+    """
+    atoms = struc.AtomArray(8)
+    atoms.res_id = np.array([1, 1, 1, 1, 2, 2, 2, 3])
+    altloc_ids = np.array([".", "B", "A", "B", "A", "B", "A", " "])
+    occupancies = np.array([1.0, 0.4, 0.6, 0.4, 0.3, 0.7, 0.3, 1.0])
+    if filter_func == "first":
+        test_mask = struc.filter_first_altloc(atoms, altloc_ids)
+        ref_mask = [True, True, False, True, True, False, True, True]
+    elif filter_func == "occupancy":
+        test_mask = struc.filter_highest_occupancy_altloc(
+            atoms, altloc_ids, occupancies
+        )
+        ref_mask = [True, True, False, True, False, True, False, True]
+    assert test_mask.tolist() == ref_mask
@@ -3,6 +3,9 @@
 # information.
 
 from tempfile import NamedTemporaryFile
+import os
+import sys
+import subprocess
 import biotite.structure as struc
 import biotite.structure.io as strucio
 from biotite.structure.io.general import _guess_element
@@ -43,6 +46,75 @@ def test_loading_template_with_trj():
     assert len(stack) > 1
 
 
+@pytest.mark.parametrize("workers, ordered", itertools.product(
+    [1, 2],
+    [False, True]
+))
+def test_loading_multiple(workers, ordered):
+    """
+    Loading multiple files in parallel must give the same structures
+    as loading each file via :func:`load_structure()`.
+    """
+    paths = [
+        join(data_dir("structure"), f"{pdb_id}.{suffix}")
+        for pdb_id in ["1l2y", "1aki", "1gya"]
+        for suffix in ["mmtf", "pdb", "cif"]
+    ]
+    ref_arrays = [
+        strucio.load_structure(path, extra_fields=["b_factor"])
+        for path in paths
+    ]
+    
+    if ordered:
+        test_arrays = list(strucio.load_structures(
+            paths, workers=workers, ordered=True, extra_fields=["b_factor"]
+        ))
+    else:
+        test_arrays = [None] * len(paths)
+        for i, array in strucio.load_structures(
+            paths, workers=workers, ordered=False, extra_fields=["b_factor"]
+        ):
+            test_arrays[i] = array
+    
+    for ref_array, test_array in zip(ref_arrays, test_arrays):
+        assert test_array == ref_array
+        assert test_array.get_annotation_categories() \
+            == ref_array.get_annotation_categories()
+        if ref_array.bonds is not None:
+            assert test_array.bonds == ref_array.bonds
+    
+    # Stopping the iteration early must not fail
+    for array in strucio.load_structures(paths, workers=workers):
+        break
+
+
+def test_loading_multiple_resource_warnings():
+    """
+    The shared memory blocks used by :func:`load_structures()` must
+    not be reported as leaked by the resource trackers of the worker
+    processes.
+    As the warnings are emitted by the resource tracker processes,
+    the loading is run in a separate interpreter and its error output
+    is checked.
+    """
+    paths = [
+        join(data_dir("structure"), f"{pdb_id}.mmtf")
+        for pdb_id in ["1l2y", "1aki", "1gya"]
+    ]
+    code = (
+        "import biotite.structure.io as strucio\n"
+        f"for array in strucio.load_structures({paths!r}, workers=2):\n"
+        "    pass\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env, capture_output=True, text=True
+    )
+    assert process.returncode == 0, process.stderr
+    assert "resource_tracker" not in process.stderr
+
+
 @pytest.mark.skipif(
     cannot_import("mdtraj"),
     reason="MDTraj is not installed"
@@ -70,7 +142,7 @@ def test_loading_with_extra_args():
 )
 @pytest.mark.parametrize(
     "suffix",
-    ["pdb", "cif", "gro", "pdbx", "mmtf",
+    ["pdb", "cif", "bcif", "gro", "pdbx", "mmtf",
      "trr", "xtc", "tng", "dcd", "netcdf"]
 )
 def test_saving(suffix):
@@ -86,7 +158,7 @@ def test_saving(suffix):
 )
 @pytest.mark.parametrize(
     "suffix",
-    ["pdb", "cif", "gro", "pdbx", "mmtf",
+    ["pdb", "cif", "bcif", "gro", "pdbx", "mmtf",
      "trr", "xtc", "tng", "dcd", "netcdf"]
 )
 def test_saving_with_extra_args(suffix):
@@ -233,6 +233,52 @@ def test_index_distance_periodic_triclinic(shift, angles):
     assert np.allclose(test_dist, ref_dist, atol=1e-5)
 
 
+@pytest.mark.parametrize(
+    "angles", [
+        np.array([ 90,  90,  90]),
+        np.array([ 90,  90, 120]),
+        np.array([ 60,  60,  60]),
+        np.array([ 70,  80, 100]),
+        np.array([ 40,  50,  60])
+    ]
+)
+def test_displacement_minimum_image(angles):
+    """
+    The PBC aware displacement of multiple models with individual boxes
+    must be the shortest of all periodic copies, found by an exhaustive
+    search.
+    """
+    random.seed(0)
+    n_models = 3
+    n_vectors = 500
+    angles = np.deg2rad(angles)
+    box = np.stack([
+        struc.vectors_from_unitcell(*(random.rand(3) * 10 + 10), *angles)
+        for _ in range(n_models)
+    ])
+    coord1 = random.rand(n_models, n_vectors, 3) * 40 - 20
+    coord2 = random.rand(n_models, n_vectors, 3) * 40 - 20
+
+    test_disp = struc.displacement(coord1, coord2, box)
+
+    shifts = np.array(list(itertools.product(range(-8, 9), repeat=3)))
+    for model_i in range(n_models):
+        # Stackwise calculation must give the same result
+        # as modelwise calculation
+        assert np.allclose(
+            test_disp[model_i],
+            struc.displacement(coord1[model_i], coord2[model_i], box[model_i])
+        )
+        # Find shortest periodic copy
+        diff = coord2[model_i] - coord1[model_i]
+        shifted = diff[:, np.newaxis, :] \
+                + (shifts @ box[model_i])[np.newaxis, :, :]
+        ref_dist = np.min(np.linalg.norm(shifted, axis=-1), axis=-1)
+        assert np.allclose(
+            np.linalg.norm(test_disp[model_i], axis=-1), ref_dist
+        )
+
+
 def test_index_functions():
     """
     The `index_xxx()` functions should give the same result as the
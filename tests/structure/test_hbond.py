@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import sys
 from tempfile import NamedTemporaryFile
 from os.path import join
 import numpy as np
@@ -157,4 +158,41 @@ def test_hbond_periodicity(translation_vector):
     array.coord = struc.move_inside_box(array.coord, array.box)
     hbonds = struc.hbond(array, periodic=True)
     hbonds = set([tuple(triplet) for triplet in hbonds])
-    assert ref_hbonds == hbonds
\ No newline at end of file
+    assert ref_hbonds == hbonds
+
+
+def test_hbond_with_bonds():
+    """
+    The donor hydrogen atoms determined from the associated
+    :class:`BondList` should give the same hydrogen bonds as the
+    distance based detection.
+    """
+    import biotite.structure.io.mmtf as mmtf
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    stack = mmtf.get_structure(file, include_bonds=True)
+    # Remove termini, since the reference bonds do not contain proper
+    # bonds for the protonated/deprotonated termini
+    stack = stack[:, (stack.res_id > 1) & (stack.res_id < 20)]
+    assert stack.bonds is not None
+    test_triplets, test_mask = struc.hbond(stack)
+    
+    stack.bonds = None
+    ref_triplets, ref_mask = struc.hbond(stack)
+    
+    assert test_triplets.tolist() == ref_triplets.tolist()
+    assert test_mask.tolist() == ref_mask.tolist()
+
+
+def test_hbond_chunks(monkeypatch):
+    """
+    The result must not depend on the number of models, that are
+    processed at once.
+    """
+    # The module is shadowed by the function with the same name
+    hbond_module = sys.modules["biotite.structure.hbond"]
+    stack = load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    ref_triplets, ref_mask = struc.hbond(stack)
+    monkeypatch.setattr(hbond_module, "_MAX_CHUNK_COORD", 100)
+    test_triplets, test_mask = struc.hbond(stack)
+    assert test_triplets.tolist() == ref_triplets.tolist()
+    assert test_mask.tolist() == ref_mask.tolist()
@@ -40,4 +40,26 @@ def test_bond_continuity_check(gapped_sample_array):
 
 def test_duplicate_atoms_check(duplicate_sample_array):
     discon = struc.check_duplicate_atoms(duplicate_sample_array)
-    assert discon.tolist() == [42,234]
\ No newline at end of file
+    assert discon.tolist() == [42,234]
+
+
+def test_duplicate_atoms_check_random():
+    """
+    Compare the duplicate atoms with a brute force search on an array
+    with many randomly created duplicates.
+    """
+    np.random.seed(0)
+    array = struc.AtomArray(1000)
+    array.res_id = np.random.randint(5, size=1000)
+    array.atom_name = np.random.choice(["N", "CA", "C"], size=1000)
+    array.add_annotation("charge", dtype=float)
+    array.charge = np.random.choice([-1.0, 0.0, np.nan], size=1000)
+    test_duplicates = struc.check_duplicate_atoms(array)
+
+    annots = [array.get_annotation(category) for category
+              in array.get_annotation_categories()]
+    ref_duplicates = [
+        i for i in range(1, array.array_length())
+        if np.all([annot[:i] == annot[i] for annot in annots], axis=0).any()
+    ]
+    assert test_duplicates.tolist() == ref_duplicates
@@ -46,6 +46,45 @@ def test_codecs(path):
                 assert (array1 == array2).all()
 
 
+def test_selected_fields():
+    """
+    Reading only selected fields should give the same values as reading
+    the entire file.
+    """
+    path = join(data_dir("structure"), "1l2y.mmtf")
+    ref_file = mmtf.MMTFFile.read(path)
+    fields = ["xCoordList", "numAtoms", "groupList", "nonExistingField"]
+    test_file = mmtf.MMTFFile.read(path, fields=fields)
+
+    assert set(test_file.keys()) == set(fields[:-1])
+    assert test_file["xCoordList"].tolist() == ref_file["xCoordList"].tolist()
+    assert test_file["numAtoms"] == ref_file["numAtoms"]
+    assert test_file["groupList"] == ref_file["groupList"]
+
+
+def test_decoding_cache():
+    """
+    Decoded arrays should be cached until the field is changed.
+    Modifying a returned array must not affect the cache.
+    """
+    path = join(data_dir("structure"), "1l2y.mmtf")
+    mmtf_file = mmtf.MMTFFile.read(path)
+    ref_array = mmtf.get_structure(mmtf_file)
+    array = mmtf_file["xCoordList"]
+    assert "xCoordList" in mmtf_file._decoded
+    array[0] = 0
+    assert mmtf_file["xCoordList"][0] != 0
+    assert mmtf.get_structure(mmtf_file) == ref_array
+    array = mmtf_file["xCoordList"]
+
+    mmtf_file.set_array("xCoordList", array + 1, codec=10, param=1000)
+    assert mmtf_file["xCoordList"].tolist() \
+           == approx((array + 1).tolist(), abs=1e-2)
+    del mmtf_file["xCoordList"]
+    with pytest.raises(KeyError):
+        mmtf_file["xCoordList"]
+
+
 @pytest.mark.parametrize(
     "path, model",
     itertools.product(
@@ -39,4 +39,52 @@ def test_pdbx_consistency(path):
     for category in array1.get_annotation_categories():
         assert array1.get_annotation(category).tolist() == \
                array2.get_annotation(category).tolist()
-    assert array1.coord.tolist() == array2.coord.tolist()
\ No newline at end of file
+    assert array1.coord.tolist() == array2.coord.tolist()
+
+
+@pytest.mark.parametrize(
+    "path", glob.glob(join(data_dir("structure"), "*.npz"))
+)
+def test_mmap(path):
+    """
+    Check if a memory-mapped file gives the same structure as a file
+    that is read into memory.
+    """
+    ref_array = npz.NpzFile.read(path).get_structure()
+    test_array = npz.NpzFile.read(path, mmap=True).get_structure()
+    assert test_array == ref_array
+
+
+def test_mmap_modification():
+    """
+    A structure from a memory-mapped file must be modifiable without
+    changing the file.
+    """
+    path = join(data_dir("structure"), "1l2y.npz")
+    ref_array = npz.NpzFile.read(path).get_structure()
+    test_array = npz.NpzFile.read(path, mmap=True).get_structure()
+    test_array.coord += 1
+    test_array.res_id[:] = 0
+    assert test_array.coord.tolist() == (ref_array.coord + 1).tolist()
+    assert (test_array.res_id == 0).all()
+    assert npz.NpzFile.read(path, mmap=True).get_structure() == ref_array
+
+
+@pytest.mark.parametrize("models", [3, slice(1, 5), [0, 2, 7]])
+def test_partial_loading(models):
+    """
+    Check if selecting models and annotations gives the same result as
+    indexing the complete structure.
+    """
+    path = join(data_dir("structure"), "1l2y.npz")
+    npz_file = npz.NpzFile.read(path, mmap=True)
+    ref_array = npz_file.get_structure()[models]
+    test_array = npz_file.get_structure(
+        models=models, annotations=["res_id", "atom_name"]
+    )
+    assert test_array.coord.tolist() == ref_array.coord.tolist()
+    assert test_array.res_id.tolist() == ref_array.res_id.tolist()
+    assert test_array.atom_name.tolist() == ref_array.atom_name.tolist()
+    # Unselected annotations contain default values
+    assert (test_array.res_name == "").all()
+    assert npz_file.get_coord(models).tolist() == ref_array.coord.tolist()
@@ -163,6 +163,28 @@ def test_guess_elements():
     assert guessed_stack.element.tolist() == stack.element.tolist()
 
 
+def test_truncated_lines():
+    """
+    Atom records, that are truncated after the temperature factor
+    columns, must be parsed as if the missing columns were blank.
+    """
+    path = join(data_dir("structure"), "1l2y.pdb")
+    pdb_file = pdb.PDBFile.read(path)
+    ref_stack = pdb_file.get_structure(extra_fields=["b_factor", "charge"])
+
+    pdb_file.lines = [
+        line[:66] if line.startswith(("ATOM", "HETATM")) else line
+        for line in pdb_file.lines
+    ]
+    with pytest.warns(UserWarning):
+        # The elements are guessed
+        test_stack = pdb_file.get_structure(
+            extra_fields=["b_factor", "charge"]
+        )
+
+    assert test_stack == ref_stack
+
+
 @pytest.mark.parametrize(
     "path, model",
     itertools.product(
@@ -301,6 +323,144 @@ def test_hybrid36_codec(number, length):
     assert test_number == number
 
 
+@pytest.mark.parametrize("length", LENGTHS)
+def test_hybrid36_array_codec(length):
+    """
+    The vectorized hybrid-36 functions must give the same results as
+    the scalar ones.
+    """
+    np.random.seed(0)
+    numbers = np.random.randint(0, hybrid36.max_hybrid36_number(length), N)
+    # Include the boundaries of the different representations
+    numbers = np.concatenate([
+        numbers, [0, 10**length - 1, 10**length, 10**length + 1,
+        hybrid36.max_hybrid36_number(length)]
+    ])
+    ref_strings = [
+        hybrid36.encode_hybrid36(number, length).rjust(length)
+        for number in numbers
+    ]
+
+    test_strings = hybrid36.encode_hybrid36_array(numbers, length)
+    assert test_strings.dtype == np.dtype(f"S{length}")
+    assert test_strings.astype("U").tolist() == ref_strings
+
+    test_numbers = hybrid36.decode_hybrid36_array(test_strings)
+    assert test_numbers.tolist() == numbers.tolist()
+    # Unicode strings with surrounding whitespace are also accepted
+    test_numbers = hybrid36.decode_hybrid36_array(
+        np.char.ljust(np.char.strip(np.array(ref_strings)), length + 2)
+    )
+    assert test_numbers.tolist() == numbers.tolist()
+
+    with pytest.raises(ValueError):
+        hybrid36.encode_hybrid36_array(
+            [hybrid36.max_hybrid36_number(length) + 1], length
+        )
+    with pytest.raises(ValueError):
+        hybrid36.decode_hybrid36_array(np.array(["A0-0"]))
+
+
 def test_max_hybrid36_number():
     assert hybrid36.max_hybrid36_number(4) == 2436111
-    assert hybrid36.max_hybrid36_number(5) == 87440031
\ No newline at end of file
+    assert hybrid36.max_hybrid36_number(5) == 87440031
+
+
+@pytest.mark.parametrize("as_generator", [False, True])
+def test_write_iter(as_generator):
+    """
+    Writing models via :func:`PDBFile.write_iter()` must give the same
+    file as writing an :class:`AtomArrayStack` via
+    :func:`PDBFile.set_structure()`.
+    """
+    path = join(data_dir("structure"), "1l2y.pdb")
+    stack = pdb.PDBFile.read(path).get_structure(
+        extra_fields=["atom_id", "b_factor", "occupancy", "charge"]
+    )
+    stack.charge[:3] = [2, -1, 1]
+    
+    ref_file = pdb.PDBFile()
+    ref_file.set_structure(stack)
+    ref_temp = TemporaryFile("w+")
+    ref_file.write(ref_temp)
+    ref_temp.seek(0)
+    ref_lines = ref_temp.read().splitlines()
+    ref_temp.close()
+
+    test_temp = TemporaryFile("w+")
+    if as_generator:
+        pdb.PDBFile.write_iter(test_temp, (model for model in stack))
+    else:
+        pdb.PDBFile.write_iter(test_temp, stack)
+    test_temp.seek(0)
+    test_pdb_file = pdb.PDBFile.read(test_temp)
+    test_temp.close()
+
+    assert test_pdb_file.lines == ref_lines
+    assert test_pdb_file.get_structure(
+        extra_fields=["atom_id", "b_factor", "occupancy", "charge"]
+    ) == stack
+
+
+def test_coord_formatting():
+    """
+    Coordinates written by :func:`PDBFile.set_structure()` must be
+    rounded exactly like ``str.format()`` does, also for *float32*
+    coordinates.
+    """
+    np.random.seed(0)
+    atoms = struc.AtomArray(1000)
+    atoms.coord = np.random.uniform(-999, 999, (1000, 3)).astype(np.float32)
+    atoms.atom_name[:] = "CA"
+    atoms.res_name[:] = "ALA"
+    atoms.element[:] = "C"
+
+    pdb_file = pdb.PDBFile()
+    pdb_file.set_structure(atoms)
+    test_coord = [
+        [line[30:38], line[38:46], line[46:54]]
+        for line in pdb_file.lines if line.startswith("ATOM")
+    ]
+    ref_coord = [
+        ["{:>8.3f}".format(c) for c in coord] for coord in atoms.coord
+    ]
+    assert test_coord == ref_coord
+
+
+def test_annotation_formatting():
+    """
+    *float64* annotations written by :func:`PDBFile.set_structure()`
+    must be rounded exactly like ``str.format()`` does, also for values
+    at a decimal tie.
+    """
+    # Values at a tie in the last written decimal
+    b_factor = np.arange(-9999, 89999) / 1000 + 0.0005
+    occupancy = np.arange(-9999, 89999) / 100 + 0.005
+    atoms = struc.AtomArray(len(b_factor))
+    atoms.coord[:] = 0
+    atoms.atom_name[:] = "CA"
+    atoms.res_name[:] = "ALA"
+    atoms.element[:] = "C"
+    atoms.add_annotation("b_factor", float)
+    atoms.add_annotation("occupancy", float)
+    atoms.b_factor = b_factor
+    atoms.occupancy = occupancy
+
+    pdb_file = pdb.PDBFile()
+    pdb_file.set_structure(atoms)
+    lines = [line for line in pdb_file.lines if line.startswith("ATOM")]
+    assert [line[54:60] for line in lines] \
+        == ["{:>6.2f}".format(value) for value in occupancy]
+    assert [line[60:66] for line in lines] \
+        == ["{:>6.3f}".format(value) for value in b_factor]
+
+
+def test_charge_range():
+    """
+    Charges outside the supported range must raise an exception.
+    """
+    atoms = struc.AtomArray(1)
+    atoms.add_annotation("charge", int)
+    atoms.charge[0] = 10
+    with pytest.raises(ValueError):
+        pdb.PDBFile().set_structure(atoms)
@@ -2,7 +2,9 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+from tempfile import TemporaryFile
 import itertools
+import io
 import glob
 from os.path import join
 import numpy as np
@@ -267,3 +269,190 @@ def test_get_sequence():
     )
     assert (type(sequences[4]) is seq.NucleotideSequence)
         
+
+
+def test_tokenization():
+    """
+    Check parsing of quoted values, multiline values and comments in
+    looped and non-looped categories.
+    """
+    lines = [
+        "data_test",
+        "#",
+        "_single.unquoted      value",
+        "_single.quoted        'value with \"quote'",
+        "_single.next_line",
+        "\"it's a value\"",
+        "_single.multiline",
+        ";first line",
+        "   second line",
+        ";",
+        "#",
+        "loop_",
+        "_looped.a",
+        "_looped.b",
+        "_looped.c",
+        "1 'O5'' \"x y\"",
+        "2 . ?  # Comment",
+        "3",
+        ";multi",
+        "line",
+        ";",
+        "'3'",
+        "#",
+    ]
+    pdbx_file = pdbx.PDBxFile.read(io.StringIO("\n".join(lines)))
+
+    assert pdbx_file["single"] == {
+        "unquoted"  : "value",
+        "quoted"    : 'value with "quote',
+        "next_line" : "it's a value",
+        "multiline" : "first linesecond line",
+    }
+    looped = pdbx_file["looped"]
+    assert looped["a"].tolist() == ["1", "2", "3"]
+    assert looped["b"].tolist() == ["O5'", ".", "multiline"]
+    assert looped["c"].tolist() == ["x y", "?", "3"]
+
+
+def test_category_modification():
+    """
+    Longer strings assigned to a column returned by
+    :func:`PDBxFile.get_category()` must not be truncated.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1l2y.cif"))
+    atom_site = pdbx_file.get_category("atom_site")
+    assert atom_site["label_comp_id"].dtype == object
+    atom_site["label_comp_id"][0] = "LONGNAME"
+    pdbx_file.set_category("atom_site", atom_site)
+    assert pdbx_file.get_category("atom_site")["label_comp_id"][0] \
+        == "LONGNAME"
+def test_loop_without_keys():
+    """
+    A looped category without keys must raise an
+    :class:`InvalidFileError` instead of a division by zero.
+    """
+    with pytest.raises(biotite.InvalidFileError):
+        pdbx.file._process_looped("loop_\n1 2\n", None)
+
+
+@pytest.mark.parametrize("looped", [False, True])
+def test_selected_keys(looped):
+    """
+    Only the selected keys should be parsed, without changing their
+    values.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1l2y.cif"))
+    category = "atom_site" if looped else "struct_keywords"
+    ref_dict = pdbx_file.get_category(category)
+    keys = list(ref_dict.keys())[::2] + ["non_existing_key"]
+
+    test_dict = pdbx_file.get_category(category, keys=keys)
+
+    assert list(test_dict.keys()) == list(ref_dict.keys())[::2]
+    for key, value in test_dict.items():
+        if looped:
+            assert value.tolist() == ref_dict[key].tolist()
+        else:
+            assert value == ref_dict[key]
+
+
+@pytest.mark.parametrize(
+    "path, model",
+    itertools.product(
+        glob.glob(join(data_dir("structure"), "*.cif")),
+        [None, 1, -1]
+    )
+)
+def test_bcif_conversion(path, model):
+    """
+    Writing a structure into a :class:`BinaryCIFFile` and reading it
+    again should give the same structure.
+    """
+    extra_fields = ["atom_id", "b_factor", "occupancy", "charge"]
+    pdbx_file = pdbx.PDBxFile.read(path)
+    try:
+        ref_atoms = pdbx.get_structure(
+            pdbx_file, model=model, extra_fields=extra_fields
+        )
+    except biotite.InvalidFileError:
+        if model is None:
+            # The file cannot be parsed into an AtomArrayStack,
+            # as the models contain different numbers of atoms
+            # -> skip this test case
+            return
+        else:
+            raise
+
+    bcif_file = pdbx.BinaryCIFFile()
+    pdbx.set_structure(bcif_file, ref_atoms, data_block="test")
+    temp = TemporaryFile("w+b")
+    bcif_file.write(temp)
+    temp.seek(0)
+    bcif_file = pdbx.BinaryCIFFile.read(temp)
+    temp.close()
+    test_atoms = pdbx.get_structure(
+        bcif_file, model=model, extra_fields=extra_fields
+    )
+
+    if ref_atoms.box is not None:
+        assert np.allclose(test_atoms.box, ref_atoms.box)
+    for category in ref_atoms.get_annotation_categories():
+        assert test_atoms.get_annotation(category).tolist() == \
+               ref_atoms.get_annotation(category).tolist()
+    assert test_atoms.coord.tolist() == ref_atoms.coord.tolist()
+
+
+def test_bcif_decoding():
+    """
+    Check decoding of encodings that are not used for writing and of
+    missing values.
+    """
+    fixed_point = {
+        "data" : np.array([1, 3, -2], dtype="<i4").tobytes(),
+        "encoding" : [
+            {"kind" : "FixedPoint", "factor" : 10, "srcType" : 32},
+            {"kind" : "ByteArray", "type" : 3},
+        ]
+    }
+    interval = {
+        "data" : np.array([0, 2, 4], dtype="<u1").tobytes(),
+        "encoding" : [
+            {"kind" : "IntervalQuantization", "min" : 1, "max" : 2,
+             "numSteps" : 5, "srcType" : 33},
+            {"kind" : "ByteArray", "type" : 4},
+        ]
+    }
+    unsigned_packing = {
+        # 300 is packed as 255 + 45
+        "data" : np.array([0, 255, 45, 7], dtype="<u1").tobytes(),
+        "encoding" : [
+            {"kind" : "IntegerPacking", "byteCount" : 1, "isUnsigned" : True,
+             "srcSize" : 3},
+            {"kind" : "ByteArray", "type" : 4},
+        ]
+    }
+    mask = {
+        "data" : np.array([0, 1, 2], dtype="<u1").tobytes(),
+        "encoding" : [{"kind" : "ByteArray", "type" : 4}]
+    }
+    bcif_file = pdbx.BinaryCIFFile()
+    bcif_file._content["dataBlocks"].append({
+        "header" : "test",
+        "categories" : [{
+            "name" : "_test",
+            "rowCount" : 3,
+            "columns" : [
+                {"name" : "fixed_point", "data" : fixed_point, "mask" : None},
+                {"name" : "interval",    "data" : interval,    "mask" : None},
+                {"name" : "packing", "data" : unsigned_packing, "mask" : None},
+                {"name" : "masked",  "data" : unsigned_packing, "mask" : mask},
+            ]
+        }]
+    })
+
+    category = bcif_file["test"]
+    assert category["fixed_point"].tolist() == approx([0.1, 0.3, -0.2])
+    assert category["interval"].tolist() == approx([1.0, 1.5, 2.0])
+    assert category["packing"].tolist() == [0, 300, 7]
+    assert category["masked"].tolist() == ["0", ".", "?"]
@@ -3,7 +3,7 @@ from os.path import join
 import numpy as np
 import pytest
 from biotite.structure.io import load_structure
-from biotite.structure.rdf import rdf
+from biotite.structure.rdf import rdf, RDFAccumulator
 from biotite.structure.box import vectors_from_unitcell
 from ..util import data_dir, cannot_import
 
@@ -177,3 +177,28 @@ def test_rdf_normalized():
                     bins=n_bins, periodic=True)
     assert np.allclose(g_r[-10:], np.ones(10), atol=0.1)
 
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_rdf_accumulator(periodic):
+    """
+    Test if adding the models one after another to a
+    :class:`RDFAccumulator` gives the same result as :func:`rdf()`.
+    """
+    stack = load_structure(TEST_FILE)
+    oxygen = stack[:, stack.atom_name == 'OW']
+    interval = np.array([0, 10])
+    n_bins = 100
+
+    ref_bins, ref_g_r = rdf(oxygen[:, :10], oxygen, interval=interval,
+                            bins=n_bins, periodic=periodic)
+
+    accumulator = RDFAccumulator(interval, n_bins, periodic)
+    with pytest.raises(ValueError):
+        accumulator.result()
+    for model in oxygen:
+        # Use plain coordinates, as obtained from trajectory files
+        accumulator.add_frame(model.coord[:10], model.coord, model.box)
+    test_bins, test_g_r = accumulator.result()
+
+    assert np.allclose(test_bins, ref_bins)
+    assert np.allclose(test_g_r, ref_g_r)
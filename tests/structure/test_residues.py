@@ -20,6 +20,44 @@ def test_apply_residue_wise(array):
     assert data.tolist() == [len(array[array.res_id == i])
                              for i in range(1, 21)]
 
+
+@pytest.mark.parametrize(
+    "function, axis", [
+        (np.sum,           None),
+        (np.sum,           0),
+        (np.nansum,        None),
+        (np.mean,          0),
+        (np.mean,          None),
+        (np.min,           0),
+        (np.max,           None),
+        (np.count_nonzero, 0),
+    ]
+)
+def test_apply_residue_wise_reduction(array, function, axis):
+    """
+    The vectorized calculation of *NumPy* reductions must give the same
+    result as calling the function for each residue.
+    """
+    data = array.coord.copy()
+    data[::10, 0] = 0
+    if function is np.nansum:
+        data[::7, 1] = np.nan
+    test_data = struc.apply_residue_wise(array, data, function, axis)
+    # Wrapping the function prevents the vectorized calculation
+    if axis is None:
+        ref_data = struc.apply_residue_wise(
+            array, data, lambda x: function(x)
+        )
+    else:
+        ref_data = struc.apply_residue_wise(
+            array, data, lambda x, axis: function(x, axis=axis), axis
+        )
+    assert test_data.dtype == ref_data.dtype
+    assert test_data.shape == ref_data.shape
+    # Tolerance for different summation order of single precision values
+    assert np.allclose(test_data, ref_data, rtol=1e-5, atol=1e-3)
+
+
 def test_spread_residue_wise(array):
     input_data = np.arange(1,21)
     output_data = struc.spread_residue_wise(array, input_data)
@@ -73,4 +73,31 @@ def test_coarse_grained(pdb_id):
     # have less than 40% SASA difference
     assert np.count_nonzero(
         np.isclose(sasa, sasa_exp, rtol=4e-1, atol=1)
-    ) / len(sasa) > 0.98
\ No newline at end of file
+    ) / len(sasa) > 0.98
+
+
+@pytest.mark.parametrize("num_threads", [2, 4])
+def test_multithreading(num_threads):
+    """
+    Multithreaded SASA calculation must give the same result as the
+    single-threaded calculation.
+    """
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1gya.mmtf"))
+    array = mmtf.get_structure(file, model=1)
+    ref_sasa = struc.sasa(array, vdw_radii="Single")
+    test_sasa = struc.sasa(array, vdw_radii="Single", num_threads=num_threads)
+    assert np.array_equal(test_sasa, ref_sasa, equal_nan=True)
+
+
+def test_stack():
+    """
+    The SASA of an :class:`AtomArrayStack` must be equal to the SASA
+    of each model calculated separately.
+    """
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    stack = mmtf.get_structure(file)
+    test_sasa = struc.sasa(stack, vdw_radii="Single")
+    assert test_sasa.shape == (stack.stack_depth(), stack.array_length())
+    for model_i in range(stack.stack_depth()):
+        ref_sasa = struc.sasa(stack[model_i], vdw_radii="Single")
+        assert np.array_equal(test_sasa[model_i], ref_sasa, equal_nan=True)
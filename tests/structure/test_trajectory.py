@@ -4,6 +4,7 @@
 
 from tempfile import NamedTemporaryFile
 import itertools
+import os
 import glob
 from os.path import join, basename
 import numpy as np
@@ -240,4 +241,225 @@ def test_read_iter_structure(format, start, stop, step):
         )]
     )
     
-    assert test_traj == ref_traj
\ No newline at end of file
+    assert test_traj == ref_traj
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format", ["trr", "xtc"])
+def test_frame_index(format):
+    """
+    Check if reading frames with a frame offset index gives the same
+    results as reading the trajectory sequentially.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    temp = NamedTemporaryFile("w+b", suffix=f".{format}")
+    traj_file_cls.read(
+        join(data_dir("structure"), f"1l2y.{format}")
+    ).write(temp.name)
+    # Read the reference from the written file,
+    # as writing a compressed trajectory may change the coordinates
+    ref_file = traj_file_cls.read(temp.name)
+    ref_coord = ref_file.get_coord()
+    ref_time = ref_file.get_time()
+
+    offsets = traj_file_cls.build_index(temp.name)
+    assert len(offsets) == len(ref_coord)
+    assert traj_file_cls._load_index(temp.name).tolist() == offsets.tolist()
+
+    frames = [7, 3, 4, 5, 37, 7, -1]
+    test_file = traj_file_cls.read_frames(temp.name, frames)
+    assert test_file.get_coord().tolist() == ref_coord[frames].tolist()
+    assert test_file.get_time().tolist() == ref_time[frames].tolist()
+
+    test_coord = traj_file_cls.read(
+        temp.name, start=5, stop=30, step=3, chunk_size=2
+    ).get_coord()
+    assert test_coord.tolist() == ref_coord[5:30:3].tolist()
+
+    test_coord = np.stack([
+        coord for coord, _, _
+        in traj_file_cls.read_iter(temp.name, start=5, step=3)
+    ])
+    assert test_coord.tolist() == ref_coord[5::3].tolist()
+
+    # Selections beyond the end of the file give empty trajectories
+    assert len(traj_file_cls.read(temp.name, start=100).get_coord()) == 0
+    assert len(traj_file_cls.read_frames(temp.name, []).get_coord()) == 0
+
+    # Changing the trajectory file invalidates the index
+    traj_file_cls.read(temp.name, stop=10).write(temp.name)
+    assert traj_file_cls._load_index(temp.name) is None
+    assert traj_file_cls.read(temp.name).get_coord().tolist() \
+        == ref_coord[:10].tolist()
+    temp.close()
+    os.remove(temp.name + ".idx.npz")
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format", ["trr", "xtc"])
+def test_strided_read_without_index(format):
+    """
+    Reading with a start, step and chunk size from a file without frame
+    offset index must give the same frames as slicing the complete
+    trajectory.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    file_name = join(data_dir("structure"), f"1l2y.{format}")
+    ref_coord = traj_file_cls.read(file_name).get_coord()
+
+    test_coord = traj_file_cls.read(
+        file_name, start=2, step=2, chunk_size=3
+    ).get_coord()
+    assert test_coord.tolist() == ref_coord[2::2].tolist()
+
+    test_coord = np.stack([
+        coord for coord, _, _ in traj_file_cls.read_iter(file_name, 2, None, 2)
+    ])
+    assert test_coord.tolist() == ref_coord[2::2].tolist()
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format, prefetch", itertools.product(
+    ["trr", "xtc", "dcd"],
+    [1, 3]
+))
+def test_read_iter_prefetch(format, prefetch):
+    """
+    Check if reading frames in a background thread gives the same
+    results as reading them on demand, also if the iteration is stopped
+    early.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    if format == "dcd":
+        traj_file_cls = dcd.DCDFile
+    file_name = join(data_dir("structure"), f"1l2y.{format}")
+
+    ref_coord = np.stack([
+        coord for coord, _, _ in traj_file_cls.read_iter(file_name)
+    ])
+    test_coord = np.stack([
+        coord for coord, _, _
+        in traj_file_cls.read_iter(file_name, prefetch=prefetch)
+    ])
+    assert test_coord.tolist() == ref_coord.tolist()
+
+    for i, (coord, _, _) in enumerate(
+        traj_file_cls.read_iter(file_name, prefetch=prefetch)
+    ):
+        assert coord.tolist() == ref_coord[i].tolist()
+        if i == 5:
+            break
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format", ["trr", "xtc", "dcd", "netcdf"])
+def test_writer(format):
+    """
+    Check if writing a trajectory chunk-wise with a
+    :class:`TrajectoryWriter`, also in append mode, gives the same
+    results as writing it at once.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    if format == "dcd":
+        traj_file_cls = dcd.DCDFile
+    if format == "netcdf":
+        traj_file_cls = netcdf.NetCDFFile
+    ref_file = traj_file_cls.read(join(data_dir("structure"), f"1l2y.{format}"))
+    ref_coord = ref_file.get_coord()
+    ref_box = ref_file.get_box()
+    # DCD files do not support writing simulation time
+    ref_time = ref_file.get_time() if format != "dcd" else None
+
+    def get_chunk(values, start, stop):
+        return values[start:stop] if values is not None else None
+
+    temp = NamedTemporaryFile("w+b", suffix=f".{format}")
+    with traj_file_cls.open_writer(temp.name) as writer:
+        for start in range(0, 20, 7):
+            writer.write_frames(
+                ref_coord[start : min(start+7, 20)],
+                get_chunk(ref_box, start, min(start+7, 20)),
+                get_chunk(ref_time, start, min(start+7, 20))
+            )
+        assert writer.n_frames == 20
+        with pytest.raises(IndexError):
+            writer.write_frames(ref_coord[:1, :10])
+    
+    if traj_file_cls.supports_index():
+        with traj_file_cls.open_writer(temp.name, append=True) as writer:
+            # The atom count must match the frames in the file
+            with pytest.raises(IndexError):
+                writer.write_frames(ref_coord[:1, :10])
+            for i in range(20, len(ref_coord)):
+                # Write single frames
+                writer.write_frames(
+                    ref_coord[i],
+                    ref_box[i] if ref_box is not None else None,
+                    ref_time[i] if ref_time is not None else None
+                )
+    else:
+        with pytest.raises(NotImplementedError):
+            traj_file_cls.open_writer(temp.name, append=True)
+        ref_coord = ref_coord[:20]
+        ref_time = ref_time[:20] if ref_time is not None else None
+
+    test_file = traj_file_cls.read(temp.name)
+    temp.close()
+    assert test_file.get_coord() == pytest.approx(ref_coord, abs=1e-2)
+    if ref_time is not None:
+        assert test_file.get_time() == pytest.approx(ref_time, abs=1e-2)
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format", ["trr", "xtc"])
+def test_writer_default_time(format):
+    """
+    Without explicitly given simulation times, the frames written by a
+    :class:`TrajectoryWriter` must be numbered consecutively across
+    chunks, also in append mode.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    coord = traj_file_cls.read(
+        join(data_dir("structure"), f"1l2y.{format}")
+    ).get_coord()[:15]
+
+    temp = NamedTemporaryFile("w+b", suffix=f".{format}")
+    with traj_file_cls.open_writer(temp.name) as writer:
+        writer.write_frames(coord[:5])
+        writer.write_frames(coord[5:10])
+    with traj_file_cls.open_writer(temp.name, append=True) as writer:
+        writer.write_frames(coord[10:])
+    
+    test_time = traj_file_cls.read(temp.name).get_time()
+    temp.close()
+    assert test_time.tolist() == list(range(15))